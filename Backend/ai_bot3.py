@@ -15,6 +15,7 @@ from autogen import AssistantAgent
 import logging
 import mysql.connector
 from mysql.connector import Error
+from db_pool import get_mysql_pool
 from contextlib import contextmanager
 import secrets
 import uuid
@@ -102,7 +103,7 @@ class DatabaseManager:
         """Context manager for database connections"""
         conn = None
         try:
-            conn = mysql.connector.connect(**self.config)
+            conn = get_mysql_pool(self.config).connection()
             yield conn
         except Error as e:
             logger.error(f"Database error: {e}")
@@ -110,7 +111,8 @@ class DatabaseManager:
                 conn.rollback()
             raise
         finally:
-            if conn and conn.is_connected():
+            if conn:
+                # Back to the pool (dropped there if the connection died)
                 conn.close()
     
     def setup_database(self):
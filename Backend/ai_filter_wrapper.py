@@ -7,14 +7,19 @@ This script can be called by the server to run filtering for a specific ticket
 import sys
 import os
 import json
+import argparse
 from pathlib import Path
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python ai_filter_wrapper.py <ticket_folder_path>")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description='Run AI resume filtering for a ticket folder')
+    parser.add_argument('ticket_folder', help='Path to the ticket folder')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Number of worker processes for extraction and scoring (0 = all cores)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only score resumes that are new or changed since the last run')
+    args = parser.parse_args()
     
-    ticket_folder = sys.argv[1]
+    ticket_folder = args.ticket_folder
     
     try:
         # Add the directory containing the AI filtering module to Python path
@@ -30,8 +35,8 @@ def main():
         print(f"Running AI filtering for: {ticket_folder}")
         
         # Create and run the filtering system
-        filter_system = UpdatedResumeFilteringSystem(ticket_folder)
-        results = filter_system.filter_resumes()
+        filter_system = UpdatedResumeFilteringSystem(ticket_folder, workers=args.workers)
+        results = filter_system.filter_resumes(incremental=args.incremental)
         
         if "error" not in results:
             # Create API-friendly results
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+batch_filtering.py - Filter several tickets in one run on a shared worker pool
+Re-filtering every open job (e.g. after a scoring change) used to mean one
+filter-resumes call per ticket, each starting its own process pool and building
+its own scoring models. A batch run starts one pool whose workers keep their
+models for the whole batch, runs a few tickets at a time against it (so one
+ticket's duplicate detection and report writing overlap another's extraction)
+and reuses extracted text through the extraction cache shared by all tickets.
+
+Each ticket still gets its usual filtering_results/ and filtering_status.json;
+the consolidated report with batch throughput goes to
+<storage root>/batch_results/batch_<id>.json and is rewritten as tickets finish.
+
+Usage: python batch_filtering.py approved_tickets [TICKET_ID ...] [--workers 0] [--concurrency 2]
+                                 [--incremental] [--full-scoring] [--streaming]
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from resume_filter5 import UpdatedResumeFilteringSystem, _init_batch_worker, worker_process_context
+
+BATCH_RESULTS_FOLDER = 'batch_results'
+RESUME_EXTENSIONS = ('.pdf', '.doc', '.docx', '.txt', '.rtf')
+
+
+class BatchFilteringScheduler:
+    """Runs filter_resumes() for many tickets on one shared process pool"""
+
+    def __init__(self, storage_root: str, workers: int = 0, concurrency: int = 2, incremental: bool = False,
+                 profile: Optional[str] = None, full_scoring: Optional[bool] = None,
+                 streaming: bool = False):
+        self.storage_root = Path(storage_root)
+        # Worker processes shared by every ticket (0 = all cores)
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        # Tickets filtered at the same time; their extraction chunks share the pool
+        self.concurrency = max(1, concurrency)
+        self.incremental = incremental
+        self.profile = profile
+        # None = RESUME_FULL_SCORING decides whether the scoring cascade is used
+        self.full_scoring = full_scoring
+        # Memory-bounded streaming runs, for tickets with very many resumes
+        self.streaming = streaming
+        self.output_folder = self.storage_root / BATCH_RESULTS_FOLDER
+        self._lock = threading.Lock()
+
+    def ticket_folders(self, ticket_ids: Optional[List[str]] = None) -> Dict[str, Path]:
+        """Folder of each requested ticket (every ticket folder if ticket_ids is None)"""
+        wanted = set(ticket_ids) if ticket_ids is not None else None
+        folders = {}
+        for folder in sorted(self.storage_root.iterdir()):
+            if not folder.is_dir() or folder.name.startswith(('.', BATCH_RESULTS_FOLDER)):
+                continue
+            ticket_id = folder.name.split('_')[0]
+            if (wanted is None or ticket_id in wanted) and ticket_id not in folders:
+                folders[ticket_id] = folder
+        return folders
+
+    def run(self, ticket_ids: Optional[List[str]] = None, batch_id: Optional[str] = None) -> Dict:
+        """Filter the given tickets (all ticket folders if None) and return the consolidated report"""
+        batch_id = batch_id or datetime.now().strftime('%Y%m%d_%H%M%S')
+        folders = self.ticket_folders(ticket_ids)
+        report = {
+            'batch_id': batch_id,
+            'status': 'running',
+            'started_at': datetime.now().isoformat(),
+            'requested': ticket_ids if ticket_ids is not None else 'all',
+            'workers': self.workers,
+            'concurrency': self.concurrency,
+            'incremental': self.incremental,
+            'streaming': self.streaming,
+            'missing': sorted(set(ticket_ids or []) - set(folders)),
+            'tickets': {ticket_id: {'status': 'queued'} for ticket_id in folders},
+        }
+        self._write_report(report)
+
+        print(f"🚀 Batch {batch_id}: {len(folders)} ticket(s) on {self.workers} worker process(es), "
+              f"{self.concurrency} at a time")
+        start = time.perf_counter()
+        batch_status = 'failed'
+        try:
+            with ProcessPoolExecutor(max_workers=self.workers, mp_context=worker_process_context(),
+                                     initializer=_init_batch_worker) as pool, \
+                    ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='batch-ticket') as tickets:
+                futures = {ticket_id: tickets.submit(self._run_ticket, ticket_id, folder, pool, report)
+                           for ticket_id, folder in folders.items()}
+                for ticket_id, future in futures.items():
+                    try:
+                        future.result()
+                    except Exception as e:
+                        # Failed outside the filtering run (lock, folder listing or status file)
+                        print(f"❌ Ticket {ticket_id} failed: {type(e).__name__}: {e}")
+                        self._update_ticket(report, ticket_id,
+                                            {'status': 'failed', 'error': f"{type(e).__name__}: {e}"})
+            batch_status = 'completed'
+        finally:
+            # Always finalize the report, so it never stays "running" after the batch has stopped
+            with self._lock:
+                report['status'] = batch_status
+                report['completed_at'] = datetime.now().isoformat()
+                report['throughput'] = self._throughput(report['tickets'], time.perf_counter() - start)
+                self._write_report(report)
+
+        throughput = report['throughput']
+        print(f"\n✅ Batch {batch_id} complete: {throughput['tickets_completed']}/{len(folders)} ticket(s), "
+              f"{throughput['resumes']} resumes in {throughput['seconds']:.1f}s "
+              f"({throughput['resumes_per_second']:.1f} resumes/sec)")
+        print(f"📁 Report saved to: {self.report_path(batch_id)}")
+        return report
+
+    def _run_ticket(self, ticket_id: str, folder: Path, pool: ProcessPoolExecutor, report: Dict):
+        """Filter one ticket on the shared pool, with the same lock and status files as the API"""
+        lock_file = folder / '.filtering_in_progress'
+        if not any(path.suffix.lower() in RESUME_EXTENSIONS for path in folder.iterdir()):
+            self._update_ticket(report, ticket_id, {'status': 'skipped', 'reason': 'no resumes'})
+            return
+        try:
+            # Created exclusively, so the API and this batch never both take the ticket
+            lock_fd = os.open(lock_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            self._update_ticket(report, ticket_id, {'status': 'skipped', 'reason': 'filtering already in progress'})
+            return
+
+        start = time.perf_counter()
+        try:
+            with os.fdopen(lock_fd, 'w') as f:
+                f.write(json.dumps({'started_at': datetime.now().isoformat(), 'pid': os.getpid(),
+                                    'batch_id': report['batch_id']}))
+            self._update_ticket(report, ticket_id, {'status': 'running'})
+            system = UpdatedResumeFilteringSystem(str(folder), workers=self.workers, profile=self.profile,
+                                                  executor=pool, full_scoring=self.full_scoring)
+            results = system.filter_resumes(incremental=self.incremental, streaming=self.streaming)
+            seconds = time.perf_counter() - start
+            if 'error' in results:
+                status = {'status': 'failed', 'error': results['error'], 'seconds': round(seconds, 3)}
+            else:
+                stage1 = results.get('stage1_results', {})
+                status = {
+                    'status': 'completed',
+                    'seconds': round(seconds, 3),
+                    'position': results.get('position'),
+                    'total_resumes': results['summary']['total_resumes'],
+                    'unique_candidates': results['summary']['unique_candidates'],
+                    'incremental': stage1.get('incremental'),
+                    'files_extracted': stage1.get('extraction', {}).get('files_extracted', 0),
+                    'files_from_cache': stage1.get('extraction', {}).get('files_from_cache', 0),
+                    'top_candidates': [
+                        {'filename': candidate['filename'],
+                         'score': round(candidate.get('adjusted_score', candidate['final_score']), 4)}
+                        for candidate in results.get('final_top_5', [])
+                    ],
+                }
+            self._write_ticket_status(folder, results)
+        except Exception as e:
+            status = {'status': 'failed', 'error': f"{type(e).__name__}: {e}",
+                      'seconds': round(time.perf_counter() - start, 3)}
+            self._write_ticket_status(folder, {'error': status['error']}, traceback.format_exc())
+        finally:
+            if lock_file.exists():
+                lock_file.unlink()
+        self._update_ticket(report, ticket_id, status)
+
+    @staticmethod
+    def _write_ticket_status(folder: Path, results: Dict, full_traceback: Optional[str] = None):
+        """filtering_status.json in the format written by the filter-resumes endpoint"""
+        if 'error' in results:
+            status = {'status': 'failed', 'completed_at': datetime.now().isoformat(),
+                      'error': results['error'], 'success': False}
+            if full_traceback:
+                status['traceback'] = full_traceback
+        else:
+            status = {
+                'status': 'completed',
+                'completed_at': datetime.now().isoformat(),
+                'total_resumes': results.get('summary', {}).get('total_resumes', 0),
+                'top_candidates': len(results.get('final_top_5', [])),
+                'incremental': results.get('stage1_results', {}).get('incremental'),
+                'cascade': results.get('stage1_results', {}).get('cascade'),
+                'performance': results.get('performance'),
+                'success': True
+            }
+        with open(folder / 'filtering_status.json', 'w') as f:
+            json.dump(status, f)
+
+    def _update_ticket(self, report: Dict, ticket_id: str, status: Dict):
+        with self._lock:
+            report['tickets'][ticket_id] = status
+            self._write_report(report)
+
+    @staticmethod
+    def _throughput(tickets: Dict[str, Dict], seconds: float) -> Dict:
+        completed = [status for status in tickets.values() if status.get('status') == 'completed']
+        resumes = sum(status['total_resumes'] for status in completed)
+        return {
+            'seconds': round(seconds, 3),
+            'tickets_completed': len(completed),
+            'tickets_failed': sum(1 for status in tickets.values() if status.get('status') == 'failed'),
+            'tickets_skipped': sum(1 for status in tickets.values() if status.get('status') == 'skipped'),
+            'resumes': resumes,
+            'resumes_per_second': round(resumes / seconds, 2) if seconds else 0.0,
+            'files_extracted': sum(status['files_extracted'] for status in completed),
+            'files_from_cache': sum(status['files_from_cache'] for status in completed),
+        }
+
+    def report_path(self, batch_id: str) -> Path:
+        return self.output_folder / f"batch_{batch_id}.json"
+
+    def _write_report(self, report: Dict):
+        """Rewrite the batch report atomically so readers never see a partial file"""
+        self.output_folder.mkdir(parents=True, exist_ok=True)
+        path = self.report_path(report['batch_id'])
+        tmp_path = path.with_name(path.name + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(report, f, indent=2, default=str)
+        tmp_path.replace(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Filter several tickets on a shared worker pool')
+    parser.add_argument('storage_root', help='Folder holding the ticket folders (e.g. approved_tickets)')
+    parser.add_argument('ticket_ids', nargs='*', help='Tickets to filter (default: every ticket folder)')
+    parser.add_argument('--workers', type=int, default=0, help='Worker processes shared by all tickets (0 = all cores)')
+    parser.add_argument('--concurrency', type=int, default=2, help='Tickets filtered at the same time')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only score resumes that are new or changed since each ticket\'s last run')
+    parser.add_argument('--full-scoring', action='store_true',
+                        help='Run every scoring stage for every resume instead of the scoring cascade')
+    parser.add_argument('--streaming', action='store_true',
+                        help='Stream each ticket\'s results to disk and keep only its shortlist in memory')
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.storage_root):
+        print(f"❌ Error: Folder '{args.storage_root}' not found")
+        return
+
+    scheduler = BatchFilteringScheduler(args.storage_root, workers=args.workers, concurrency=args.concurrency,
+                                        incremental=args.incremental, full_scoring=args.full_scoring or None, streaming=args.streaming)
+    scheduler.run(args.ticket_ids or None)
+
+
+if __name__ == '__main__':
+    main()
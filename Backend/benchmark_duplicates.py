@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+benchmark_duplicates.py - Scaling of duplicate candidate detection
+Generates a synthetic resume corpus with exact and near duplicates, then times
+DuplicateCandidateDetector.add_identifiers with LSH blocking and, for smaller
+corpora, with the exhaustive all-pairs comparison it replaces.
+
+Usage: python benchmark_duplicates.py [--sizes 1000 2500 5000 10000]
+                                      [--exhaustive-limit 1000] [--threshold 0.85]
+"""
+
+import argparse
+import random
+import time
+from typing import Dict, List, Set, Tuple
+
+from resume_filter5 import DuplicateCandidateDetector
+
+FIRST_NAMES = ['Asha', 'Ravi', 'John', 'Maria', 'Wei', 'Omar', 'Lena', 'Kiran', 'Tom', 'Priya', 'Sam', 'Noor']
+LAST_NAMES = ['Patel', 'Smith', 'Khan', 'Garcia', 'Chen', 'Ali', 'Novak', 'Rao', 'Brown', 'Iyer']
+
+
+def generate_corpus(size: int, duplicate_rate: float = 0.1, seed: int = 42) -> List[Tuple[str, str]]:
+    """(filename, text) pairs; a share of them are lightly edited copies submitted without contact details"""
+    rng = random.Random(seed)
+    vocabulary = [f"{rng.choice('bcdfghjklmnprstvz')}{rng.choice('aeiou')}{rng.choice('bcdfghjklmnprstvz')}{i}"
+                  for i in range(5000)]
+    syllables = [a + b for a in 'bcdfghklmnprstvz' for b in 'aeiou']
+    companies = [''.join(rng.choice(syllables) for _ in range(3)).capitalize() for _ in range(2000)]
+    corpus = []
+    for i in range(size):
+        if corpus and rng.random() < duplicate_rate:
+            _, original = rng.choice(corpus)
+            lines = original.split('\n')
+            body = lines[-1].split()
+            for _ in range(max(1, len(body) // 50)):
+                body[rng.randrange(len(body))] = rng.choice(vocabulary)
+            text = '\n'.join([lines[0], '', ''] + lines[3:-1] + [' '.join(body)])
+        else:
+            name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+            start_year = rng.randint(2000, 2020)
+            jobs = [f"Engineer at {rng.choice(companies)} {start_year + 3 * j} - {start_year + 3 * j + 3}"
+                    for j in range(rng.randint(1, 3))]
+            degree = rng.choice(['Bachelor of Technology', 'Master of Science', 'PhD'])
+            text = '\n'.join([name, f"user{i}@mail.org", f"+91 98{rng.randint(10000000, 99999999)}",
+                              'Experience', *jobs,
+                              'Education', f"{degree}, {rng.choice(companies)} University {start_year - 1}",
+                              'Projects', ' '.join(rng.choice(vocabulary) for _ in range(250))])
+        corpus.append((f"resume_{i:05d}.txt", text))
+    return corpus
+
+
+def run_detection(identifiers: List[Dict], blocking: bool, threshold: float) -> Tuple[float, int, Set[Tuple[str, str]]]:
+    """Seconds, full comparisons and duplicate filename pairs for one detection pass (including grouping)"""
+    detector = DuplicateCandidateDetector(blocking=blocking, lsh_threshold=threshold)
+    pairs = set()
+    start = time.perf_counter()
+    for item in identifiers:
+        _, duplicates = detector.add_identifiers(dict(item))
+        pairs.update((dup['filename'], item['filename']) for dup in duplicates)
+    detector.get_duplicate_groups()
+    return time.perf_counter() - start, detector.comparisons, pairs
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark duplicate detection scaling')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 2500, 5000, 10000])
+    parser.add_argument('--exhaustive-limit', type=int, default=1000,
+                        help='Largest corpus also run with exhaustive comparison (quadratic)')
+    parser.add_argument('--threshold', type=float, default=0.85, help='LSH / near-duplicate Jaccard threshold')
+    args = parser.parse_args()
+
+    print(f"🧪 Generating {max(args.sizes)} synthetic resumes...")
+    corpus = generate_corpus(max(args.sizes))
+    extractor = DuplicateCandidateDetector(lsh_threshold=args.threshold)
+    start = time.perf_counter()
+    identifiers = [extractor.extract_candidate_identifiers(text, filename) for filename, text in corpus]
+    print(f"   Identifier extraction: {time.perf_counter() - start:.2f}s "
+          f"({(time.perf_counter() - start) / len(corpus) * 1e6:.0f}µs per resume)")
+
+    print(f"\n{'resumes':>8} {'mode':>11} {'seconds':>9} {'µs/resume':>10} {'comparisons':>12} {'pairs':>7} {'recall':>7}")
+    for size in sorted(args.sizes):
+        subset = identifiers[:size]
+        seconds, comparisons, pairs = run_detection(subset, True, args.threshold)
+        recall = '-'
+        if size <= args.exhaustive_limit:
+            ex_seconds, ex_comparisons, ex_pairs = run_detection(subset, False, args.threshold)
+            print(f"{size:>8} {'exhaustive':>11} {ex_seconds:>9.2f} {ex_seconds / size * 1e6:>10.0f} "
+                  f"{ex_comparisons:>12} {len(ex_pairs):>7} {'1.000':>7}")
+            recall = f"{len(pairs & ex_pairs) / len(ex_pairs):.3f}" if ex_pairs else '1.000'
+        print(f"{size:>8} {'lsh':>11} {seconds:>9.2f} {seconds / size * 1e6:>10.0f} "
+              f"{comparisons:>12} {len(pairs):>7} {recall:>7}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+"""
+benchmark_filtering.py - Throughput of the resume filtering pipeline
+Generates a synthetic ticket folder of PDF, DOCX and TXT resumes with controlled
+skill, experience and duplicate distributions, then drives the stages of
+UpdatedResumeFilteringSystem one by one and reports:
+
+  - resumes/sec over the whole pipeline
+  - p50 / p99 per-resume latency (extraction + scoring)
+  - peak RSS of this process and of its extraction workers
+  - time split across extraction, scoring, duplicate detection and report writing
+
+Every resume is fully scored unless --cascade is given, in which case scoring
+runs the production scoring cascade: professional development is only scored
+for resumes that can still reach the stage 1 shortlist.
+
+Each run is saved as JSON (benchmark_results/ by default) so runs can be
+compared over time; --compare prints the change against an earlier run.
+
+Usage: python benchmark_filtering.py [--sizes 100 1000 10000] [--formats pdf=0.2,docx=0.5,txt=0.3]
+                                     [--duplicate-rate 0.1] [--skill-match-rate 0.5]
+                                     [--experience-mean 6] [--cascade] [--compare previous.json]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows: peak RSS is reported as unavailable
+    resource = None
+
+import numpy as np
+from docx import Document
+
+from resume_filter5 import (CorpusSimilarityModel, ResumeExtractor, UpdatedResumeFilteringSystem,
+                            extractor_version)
+
+FIRST_NAMES = ['Asha', 'Ravi', 'John', 'Maria', 'Wei', 'Omar', 'Lena', 'Kiran', 'Tom', 'Priya', 'Sam', 'Noor']
+LAST_NAMES = ['Patel', 'Smith', 'Khan', 'Garcia', 'Chen', 'Ali', 'Novak', 'Rao', 'Brown', 'Iyer']
+REQUIRED_SKILLS = ['Python', 'Django', 'React', 'AWS', 'Docker', 'PostgreSQL', 'Git', 'REST APIs']
+OTHER_SKILLS = ['Java', 'Spring', 'Angular', 'Azure', 'Kubernetes', 'MongoDB', 'Redis', 'Kafka', 'Spark',
+                'TensorFlow', 'PyTorch', 'GraphQL', 'Flask', 'Hadoop', 'C++', 'Agile']
+CITIES = ['London', 'Bangalore', 'Berlin', 'Remote', 'Toronto', 'Dubai']
+FILLER = ('designed built maintained improved migrated automated monitored scaled tested documented '
+          'services pipelines dashboards platform features workflows deployments integrations customers '
+          'latency reliability throughput teams releases reviews').split()
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def write_pdf(path: Path, lines: List[str], lines_per_page: int = 55):
+    """Minimal text-only PDF (Helvetica, one content stream per page) readable by every PDF backend"""
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None,
+               "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>"]
+    page_ids = []
+    for page in pages:
+        stream = "BT /F1 10 Tf 13 TL 50 760 Td " + " ".join(f"({_pdf_escape(line)}) Tj T*" for line in page) + " ET"
+        objects.append(f"<< /Length {len(stream.encode('latin-1'))} >>\nstream\n{stream}\nendstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       f"/Contents {len(objects)} 0 R /Resources << /Font << /F1 3 0 R >> >> >>")
+        page_ids.append(len(objects))
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(f'{i} 0 R' for i in page_ids)}] /Count {len(page_ids)} >>"
+
+    chunks = [b"%PDF-1.4\n"]
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(sum(len(chunk) for chunk in chunks))
+        chunks.append(f"{number} 0 obj\n{body}\nendobj\n".encode('latin-1'))
+    xref_offset = sum(len(chunk) for chunk in chunks)
+    chunks.append(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode('latin-1'))
+    chunks.extend(f"{offset:010d} 00000 n \n".encode('latin-1') for offset in offsets)
+    chunks.append(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n"
+                  .encode('latin-1'))
+    path.write_bytes(b"".join(chunks))
+
+
+def write_docx(path: Path, lines: List[str]):
+    document = Document()
+    for line in lines:
+        document.add_paragraph(line)
+    document.save(str(path))
+
+
+def write_txt(path: Path, lines: List[str]):
+    path.write_text("\n".join(lines), encoding='utf-8')
+
+
+WRITERS = {'pdf': write_pdf, 'docx': write_docx, 'txt': write_txt}
+
+
+def resume_lines(rng: random.Random, index: int, skill_match_rate: float, experience_mean: float) -> List[str]:
+    """One synthetic resume: contact block, summary, experience timeline, skills, education, projects"""
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    years = int(min(max(rng.gauss(experience_mean, experience_mean / 2), 0), 25))
+    skills = [skill for skill in REQUIRED_SKILLS if rng.random() < skill_match_rate]
+    skills += rng.sample(OTHER_SKILLS, rng.randint(2, 6))
+    rng.shuffle(skills)
+
+    lines = [name, f"{name.lower().replace(' ', '.')}{index}@example.com",
+             f"+44 7{rng.randint(100000000, 999999999)}", rng.choice(CITIES), '',
+             'Summary', f"Software engineer with {years} years of experience in {', '.join(skills[:3])}.", '',
+             'Experience']
+    end_year = 2025
+    for job in range(max(1, min(years // 3 + 1, 5))):
+        start_year = end_year - rng.randint(1, 4)
+        title = rng.choice(['Software Engineer', 'Senior Developer', 'Backend Engineer', 'Tech Lead'])
+        lines.append(f"{title}, Company{rng.randint(1, 500)} {start_year} - {end_year}")
+        lines.append(' '.join(rng.choice(FILLER) for _ in range(rng.randint(15, 40))))
+        end_year = start_year
+    lines += ['', 'Skills', ', '.join(skills), '', 'Education',
+              f"{rng.choice(['Bachelor of Technology', 'Master of Science', 'BSc Computer Science'])}, "
+              f"University {rng.randint(1, 80)} {end_year - 1}", '', 'Projects']
+    lines += [' '.join(rng.choice(FILLER) for _ in range(12)) for _ in range(rng.randint(2, 8))]
+    if rng.random() < 0.3:
+        lines += ['', 'Certifications', f"AWS Certified Solutions Architect {rng.randint(2018, 2024)}"]
+    return lines
+
+
+def generate_ticket(folder: Path, size: int, formats: Dict[str, float], duplicate_rate: float,
+                    skill_match_rate: float, experience_mean: float, seed: int = 42) -> Dict[str, int]:
+    """Write job_details.json and size resumes into folder; returns how many files of each format"""
+    rng = random.Random(seed)
+    folder.mkdir(parents=True, exist_ok=True)
+    job_details = {
+        'ticket_info': {'ticket_id': folder.name.split('_')[0], 'status': 'approved', 'approved': 1},
+        'job_details': {
+            'job_title': 'Backend Engineer',
+            'experience_required': '4-8 years',
+            'location': 'London',
+            'required_skills': ', '.join(REQUIRED_SKILLS),
+            'job_description': 'Build and run Python services on AWS with Django, React and PostgreSQL. '
+                               'Own deployments with Docker and Git based CI, design REST APIs.',
+            'salary_range': '60-80',
+            'deadline': '31-12-2025',
+        },
+    }
+    (folder / 'job_details.json').write_text(json.dumps(job_details, indent=2))
+
+    names, weights = zip(*formats.items())
+    counts = {name: 0 for name in names}
+    written: List[Tuple[List[str], str]] = []
+    for i in range(size):
+        if written and rng.random() < duplicate_rate:
+            # Resubmission: same person, lightly edited, often in another format
+            lines, _ = rng.choice(written)
+            lines = list(lines)
+            lines[-1] = ' '.join(rng.choice(FILLER) for _ in range(12))
+        else:
+            lines = resume_lines(rng, i, skill_match_rate, experience_mean)
+        file_format = rng.choices(names, weights)[0]
+        WRITERS[file_format](folder / f"resume_{i:05d}.{file_format}", lines)
+        written.append((lines, file_format))
+        counts[file_format] += 1
+    return counts
+
+
+def peak_rss_mb() -> Dict[str, Optional[float]]:
+    """Peak resident set size of this process and of its finished children (extraction workers), None if unknown"""
+    if resource is None:
+        return {'process': None, 'children': None}
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    scale = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return {
+        'process': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale, 1),
+        'children': round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale, 1),
+    }
+
+
+def format_rss(megabytes: Optional[float], unit: str = ' MB') -> str:
+    return 'n/a' if megabytes is None else f"{megabytes}{unit}"
+
+
+def run_pipeline(ticket_folder: Path, use_cache: bool, cascade: bool = False) -> Dict:
+    """Drive the filtering stages one by one, timing each stage and every resume.
+
+    cascade=True scores with the prefilter and completes the shortlist after duplicate
+    detection, as a cascade run of filter_resumes() does; the completion counts as scoring.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        system = UpdatedResumeFilteringSystem(str(ticket_folder), use_cache=use_cache, use_identity_index=False)
+        resumes = system.job_ticket.get_resumes()
+    basic_filter = system.basic_filter
+    stages = {}
+    extraction_latency, scoring_latency = [], []
+
+    start = time.perf_counter()
+    parsed_resumes = []
+    for path in resumes:
+        file_start = time.perf_counter()
+        parsed = ResumeExtractor.extract_parsed(path, system.extraction_cache)
+        if parsed is not None:
+            extraction_latency.append(time.perf_counter() - file_start)
+            parsed_resumes.append((path, parsed))
+    stages['extraction'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scores = []
+    for path, parsed in parsed_resumes:
+        file_start = time.perf_counter()
+        scores.append(basic_filter.score_resume_comprehensive(parsed, path, system.job_ticket, prefilter=cascade))
+        scoring_latency.append(time.perf_counter() - file_start)
+    # Similarity stage as stage 1 runs it: one TF-IDF fit over the whole ticket
+    similarity_start = time.perf_counter()
+    description = system.job_ticket.description
+    texts = [parsed.text for _, parsed in parsed_resumes]
+    for score, value in zip(scores, CorpusSimilarityModel.fit(description, texts).score(description, texts)):
+        score['similarity_score'] = float(value)
+    stages['scoring'] = time.perf_counter() - start
+    stages['similarity'] = time.perf_counter() - similarity_start
+
+    start = time.perf_counter()
+    detector = basic_filter.duplicate_detector
+    detector.reset()
+    for path, parsed in parsed_resumes:
+        detector.add_identifiers(detector.extract_candidate_identifiers(parsed, path.name))
+    groups = detector.get_duplicate_groups()
+    stages['duplicate_detection'] = time.perf_counter() - start
+
+    pruned = {}
+    if cascade:
+        start = time.perf_counter()
+        file_index = {path.name: {'score': score} for (path, _), score in zip(parsed_resumes, scores)}
+        with contextlib.redirect_stdout(io.StringIO()):
+            pruned, _ = system._complete_shortlist(file_index, groups,
+                                                   {path.name: parsed for path, parsed in parsed_resumes},
+                                                   {path.name: path for path, _ in parsed_resumes})
+        scores = [file_index[path.name]['score'] for path, _ in parsed_resumes]
+        stages['cascade_completion'] = time.perf_counter() - start
+        stages['scoring'] += stages['cascade_completion']
+
+    # Ranking, stage 2 and the JSON and text reports
+    start = time.perf_counter()
+    scores.sort(key=lambda item: item['final_score'], reverse=True)
+    initial_results = {'all_resumes': scores, 'top_10': scores[:10]}
+    with contextlib.redirect_stdout(io.StringIO()):
+        final_results = system._advanced_scoring(initial_results)
+        report = {
+            'ticket_id': system.job_ticket.ticket_id,
+            'position': system.job_ticket.position,
+            'timestamp': datetime.now().isoformat(),
+            'latest_requirements': {'experience': system.job_ticket.experience_required,
+                                    'tech_stack': system.job_ticket.tech_stack,
+                                    'location': system.job_ticket.location,
+                                    'salary': system.job_ticket.salary_range,
+                                    'deadline': system.job_ticket.deadline},
+            'summary': {'total_resumes': len(resumes),
+                        'unique_candidates': len(scores) - sum(len(group) - 1 for group in groups),
+                        'duplicate_groups_found': len(groups),
+                        'stage1_selected': len(initial_results['top_10']),
+                        'final_selected': len(final_results['top_5_candidates'])},
+            'duplicate_detection': {'duplicate_groups': [{'group_size': len(group),
+                                                          'filenames': [item['filename'] for item in group]}
+                                                         for group in groups]},
+            'stage1_results': initial_results,
+            'final_results': final_results,
+            'final_top_5': final_results['top_5_candidates'],
+        }
+        with open(system.output_folder / 'final_results.json', 'w') as f:
+            json.dump(report, f, indent=2, default=str)
+        system._create_enhanced_summary_report(report)
+    stages['report_writing'] = time.perf_counter() - start
+
+    per_resume = np.array(extraction_latency) + np.array(scoring_latency) if scoring_latency else np.zeros(1)
+    total = stages['extraction'] + stages['scoring'] + stages['duplicate_detection'] + stages['report_writing']
+    return {
+        'resumes': len(resumes),
+        'extracted': len(parsed_resumes),
+        'scoring': 'cascade' if cascade else 'full',
+        'pruned': len(pruned),
+        'duplicate_groups': len(groups),
+        'total_seconds': round(total, 4),
+        'resumes_per_second': round(len(resumes) / total, 2) if total else None,
+        'latency_ms': {
+            'p50': round(float(np.percentile(per_resume, 50)) * 1000, 3),
+            'p99': round(float(np.percentile(per_resume, 99)) * 1000, 3),
+            'max': round(float(per_resume.max()) * 1000, 3),
+        },
+        'stage_seconds': {name: round(seconds, 4) for name, seconds in stages.items()},
+        'stage_share': {name: round(stages[name] / total, 4) if total else 0.0
+                        for name in ('extraction', 'scoring', 'duplicate_detection', 'report_writing')},
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+
+def parse_formats(value: str) -> Dict[str, float]:
+    formats = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        if name.strip() not in WRITERS:
+            raise argparse.ArgumentTypeError(f"unknown format {name!r} (choose from {', '.join(WRITERS)})")
+        formats[name.strip()] = float(weight or 1)
+    return formats
+
+
+def print_comparison(previous: Dict, current: Dict):
+    """Change of each size's headline numbers against an earlier run"""
+    before = {run['resumes']: run for run in previous.get('runs', [])}
+    print(f"\n📈 Compared with {previous.get('timestamp', 'previous run')}:")
+    for run in current['runs']:
+        old = before.get(run['resumes'])
+        if not old:
+            print(f"  {run['resumes']:>7} resumes: no earlier measurement")
+            continue
+        change = (run['resumes_per_second'] - old['resumes_per_second']) / old['resumes_per_second'] * 100
+        # Runs from before the cascade mode existed always scored fully
+        scoring = old.get('scoring', 'full')
+        modes = f" [{scoring} -> {run['scoring']} scoring]" if scoring != run['scoring'] else ''
+        print(f"  {run['resumes']:>7} resumes: {old['resumes_per_second']:.1f} -> {run['resumes_per_second']:.1f} "
+              f"resumes/s ({change:+.1f}%), p99 {old['latency_ms']['p99']:.1f} -> {run['latency_ms']['p99']:.1f} ms"
+              f"{modes}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark resume filtering throughput on a synthetic corpus')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000])
+    parser.add_argument('--formats', type=parse_formats, default='pdf=0.2,docx=0.5,txt=0.3',
+                        help='File format mix as name=weight pairs')
+    parser.add_argument('--duplicate-rate', type=float, default=0.1, help='Share of resubmitted resumes')
+    parser.add_argument('--skill-match-rate', type=float, default=0.5,
+                        help='Probability that a resume lists each required skill')
+    parser.add_argument('--experience-mean', type=float, default=6.0, help='Mean years of experience')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--use-cache', action='store_true', help='Use the extraction cache (warm runs)')
+    parser.add_argument('--cascade', action='store_true',
+                        help='Score with the scoring cascade instead of fully scoring every resume')
+    parser.add_argument('--no-warmup', action='store_true', help='Measure the first size cold')
+    parser.add_argument('--workdir', help='Where to generate the corpus (default: a temporary directory)')
+    parser.add_argument('--keep', action='store_true', help='Keep the generated corpus')
+    parser.add_argument('--output', help='Result file (default: benchmark_results/filtering_<timestamp>.json)')
+    parser.add_argument('--compare', help='Earlier result file to compare against')
+    args = parser.parse_args()
+
+    workdir = Path(args.workdir) if args.workdir else Path(tempfile.mkdtemp(prefix='filtering_bench_'))
+    results = {
+        'timestamp': datetime.now().isoformat(),
+        'config': {key: value for key, value in vars(args).items() if key not in ('output', 'compare', 'workdir', 'keep')},
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'extractor_version': extractor_version(),
+        },
+        'runs': [],
+    }
+
+    try:
+        if not args.no_warmup:
+            # Lazy imports (scikit-learn, spaCy) and first-use compilation would otherwise land in the first size
+            generate_ticket(workdir / 'warmup_synthetic', 20, args.formats, args.duplicate_rate,
+                            args.skill_match_rate, args.experience_mean, args.seed)
+            run_pipeline(workdir / 'warmup_synthetic', args.use_cache, args.cascade)
+
+        for size in sorted(args.sizes):
+            ticket_folder = workdir / f"bench{size}_synthetic"
+            print(f"🧪 Generating {size} synthetic resumes in {ticket_folder}...")
+            start = time.perf_counter()
+            counts = generate_ticket(ticket_folder, size, args.formats, args.duplicate_rate,
+                                     args.skill_match_rate, args.experience_mean, args.seed)
+            print(f"   {counts} in {time.perf_counter() - start:.1f}s")
+
+            run = run_pipeline(ticket_folder, args.use_cache, args.cascade)
+            run['formats'] = counts
+            results['runs'].append(run)
+            print(f"   {run['resumes_per_second']} resumes/s, p50 {run['latency_ms']['p50']} ms, "
+                  f"p99 {run['latency_ms']['p99']} ms, peak RSS {format_rss(run['peak_rss_mb']['process'])}")
+    finally:
+        if not args.keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"\n{'='*78}")
+    print(f"⏱️  FILTERING BENCHMARK ({'scoring cascade' if args.cascade else 'full scoring'})")
+    print(f"{'='*78}")
+    print(f"{'resumes':>8} {'res/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'RSS MB':>7} "
+          f"{'extract':>8} {'score':>7} {'dedupe':>7} {'report':>7}")
+    for run in results['runs']:
+        share = run['stage_share']
+        print(f"{run['resumes']:>8} {run['resumes_per_second']:>8} {run['latency_ms']['p50']:>8} "
+              f"{run['latency_ms']['p99']:>8} {format_rss(run['peak_rss_mb']['process'], unit=''):>7} "
+              f"{share['extraction']:>8.1%} {share['scoring']:>7.1%} "
+              f"{share['duplicate_detection']:>7.1%} {share['report_writing']:>7.1%}")
+
+    output = Path(args.output) if args.output else \
+        Path('benchmark_results') / f"filtering_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2, default=str))
+    print(f"\n💾 Results saved to: {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            print_comparison(json.load(f), results)
+
+
+if __name__ == '__main__':
+    main()
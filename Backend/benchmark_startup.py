@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+benchmark_startup.py - Startup and first-run latency of the filtering subsystem
+Each scenario runs in a fresh interpreter so import and model-loading costs are
+measured cold:
+
+  lazy   - models are loaded on first real use (current behaviour)
+  eager  - the spaCy model is loaded up front, as every filtering run used to do
+
+Usage: python benchmark_startup.py <ticket_folder> [--runs N]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+SCENARIO = r'''
+import json, sys, time, io, contextlib
+timings = {}
+start = time.perf_counter()
+import resume_filter5
+timings['import'] = time.perf_counter() - start
+
+if sys.argv[2] == 'eager':
+    start = time.perf_counter()
+    from model_registry import get_spacy_model
+    timings['model_available'] = get_spacy_model() is not None
+    timings['model_load'] = time.perf_counter() - start
+
+start = time.perf_counter()
+system = resume_filter5.UpdatedResumeFilteringSystem(sys.argv[1], use_cache=False)
+timings['construct'] = time.perf_counter() - start
+
+for run in ('first_run', 'second_run'):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        system.filter_resumes()
+    timings[run] = time.perf_counter() - start
+
+print(json.dumps(timings))
+'''
+
+
+def run_scenario(ticket_folder: Path, mode: str) -> dict:
+    """Run one scenario in a fresh interpreter and return its timings"""
+    result = subprocess.run(
+        [sys.executable, '-c', SCENARIO, str(ticket_folder), mode],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{mode} scenario failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark filtering startup and first-run latency')
+    parser.add_argument('ticket_folder', help='Ticket folder with job details and resumes')
+    parser.add_argument('--runs', type=int, default=3, help='Repetitions per scenario (best time is reported)')
+    args = parser.parse_args()
+
+    source = Path(args.ticket_folder).resolve()
+    if not source.is_dir():
+        print(f"❌ Ticket folder not found: {source}")
+        sys.exit(1)
+
+    # Work on a copy so the benchmark never touches real filtering results
+    workdir = Path(tempfile.mkdtemp(prefix='startup_bench_'))
+    ticket_copy = workdir / source.name
+    shutil.copytree(source, ticket_copy, ignore=shutil.ignore_patterns('filtering_results'))
+
+    try:
+        results = {}
+        for mode in ('lazy', 'eager'):
+            samples = [run_scenario(ticket_copy, mode) for _ in range(args.runs)]
+            results[mode] = {
+                key: min(sample[key] for sample in samples)
+                for key in samples[0] if isinstance(samples[0][key], float)
+            }
+            if 'model_available' in samples[0]:
+                results[mode]['model_available'] = samples[0]['model_available']
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"\n{'='*60}")
+    print(f"⏱️  FILTERING STARTUP BENCHMARK ({args.runs} run(s), best of)")
+    print(f"{'='*60}")
+    print(f"{'stage':<14}{'lazy (s)':>12}{'eager (s)':>12}")
+    for key in ('import', 'model_load', 'construct', 'first_run', 'second_run'):
+        lazy = results['lazy'].get(key)
+        eager = results['eager'].get(key)
+        print(f"{key:<14}{'-' if lazy is None else f'{lazy:.3f}':>12}{'-' if eager is None else f'{eager:.3f}':>12}")
+
+    lazy_total = results['lazy']['import'] + results['lazy']['construct'] + results['lazy']['first_run']
+    eager_total = (results['eager']['import'] + results['eager'].get('model_load', 0)
+                   + results['eager']['construct'] + results['eager']['first_run'])
+    print(f"\nTime to first result: lazy {lazy_total:.3f}s, eager {eager_total:.3f}s")
+    if not results['eager'].get('model_available', True):
+        print("⚠️  en_core_web_sm is not installed, so the eager model load only measured the spaCy import")
+
+
+if __name__ == '__main__':
+    main()
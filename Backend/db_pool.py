@@ -0,0 +1,270 @@
+"""
+db_pool.py - Shared MySQL connection pool for the API server and both bots
+Opening a MySQL connection costs a TCP and auth handshake, and a single chat
+message or API request used to open several. Every module now checks
+connections out of one pool per database and process:
+
+    conn = get_mysql_pool(config).connection()   # waits up to the checkout timeout
+    ...
+    conn.close()                                 # returns it to the pool
+
+or ``with get_mysql_pool(config).get_connection() as conn: ...``.
+
+Connections idle for longer than the health check interval are pinged on
+checkout and replaced when the server dropped them; transactions left open are
+rolled back when a connection comes back. Settings come from the environment:
+MYSQL_POOL_SIZE (10), MYSQL_POOL_TIMEOUT (seconds to wait for a free
+connection, 10) and MYSQL_POOL_HEALTH_CHECK_SECONDS (5).
+"""
+
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+import mysql.connector
+from mysql.connector import Error
+from mysql.connector.errors import PoolError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_CHECKOUT_TIMEOUT = 10.0
+DEFAULT_HEALTH_CHECK_SECONDS = 5.0
+
+
+class PoolTimeoutError(PoolError):
+    """No connection became free within the checkout timeout"""
+
+
+class PooledConnection:
+    """A checked-out connection; close() hands it back to the pool instead of closing it"""
+
+    def __init__(self, pool: 'MySQLPool', raw):
+        self._pool = pool
+        self._raw = raw
+
+    def __getattr__(self, name):
+        raw = self.__dict__.get('_raw')
+        if raw is None:
+            raise Error(msg="Connection was returned to the pool")
+        return getattr(raw, name)
+
+    def is_connected(self) -> bool:
+        # False once returned, so "if conn.is_connected(): conn.close()" cleanup stays safe
+        return self._raw is not None and self._raw.is_connected()
+
+    def close(self):
+        raw, self._raw = self._raw, None
+        if raw is not None:
+            self._pool.release(raw)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __del__(self):
+        # Handlers that return early without close() must not leak their pool slot
+        if self.__dict__.get('_raw') is not None:
+            with self._pool._condition:
+                self._pool.leaked += 1
+            try:
+                self.close()
+            except Exception:
+                pass
+
+
+class MySQLPool:
+    """Fixed-size pool of MySQL connections with blocking checkout and usage metrics"""
+
+    def __init__(self, config: Dict[str, Any], size: int = DEFAULT_POOL_SIZE,
+                 checkout_timeout: float = DEFAULT_CHECKOUT_TIMEOUT,
+                 health_check_seconds: float = DEFAULT_HEALTH_CHECK_SECONDS, name: str = 'mysql'):
+        self.config = dict(config)
+        self.size = max(1, size)
+        self.checkout_timeout = checkout_timeout
+        self.health_check_seconds = health_check_seconds
+        self.name = name
+        # (connection, time it was returned) of idle connections, most recently used last
+        self._idle: List[tuple] = []
+        self._open = 0
+        self._waiters = 0
+        # Re-entrant: a PooledConnection collected while this thread holds the lock releases into it
+        self._condition = threading.Condition(threading.RLock())
+        self.checkouts = 0
+        self.timeouts = 0
+        self.reconnects = 0
+        self.leaked = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def connection(self, timeout: Optional[float] = None) -> PooledConnection:
+        """Check out a healthy connection, waiting up to timeout (default: the pool's checkout timeout)"""
+        timeout = self.checkout_timeout if timeout is None else timeout
+        start = time.perf_counter()
+        with self._condition:
+            self._waiters += 1
+            try:
+                while not self._idle and self._open >= self.size:
+                    remaining = timeout - (time.perf_counter() - start)
+                    if remaining <= 0 or not self._condition.wait(remaining):
+                        if not self._idle and self._open >= self.size:
+                            self.timeouts += 1
+                            raise PoolTimeoutError(
+                                msg=f"No free connection in pool '{self.name}' after {timeout:.1f}s "
+                                    f"({self.size} in use)")
+            finally:
+                self._waiters -= 1
+            if self._idle:
+                raw, idle_since = self._idle.pop()
+            else:
+                # Reserve the slot now, connect outside the lock
+                raw, idle_since = None, None
+                self._open += 1
+            waited = time.perf_counter() - start
+            self.checkouts += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+        try:
+            if raw is None:
+                raw = mysql.connector.connect(**self.config)
+            elif time.monotonic() - idle_since >= self.health_check_seconds:
+                raw = self._checked(raw)
+        except Exception:
+            self._discard()
+            raise
+        return PooledConnection(self, raw)
+
+    def _checked(self, raw):
+        """raw if it still answers a ping, otherwise a fresh connection in its place"""
+        try:
+            raw.ping(reconnect=False)
+            return raw
+        except Error as e:
+            logger.warning(f"Pool '{self.name}': dropping dead connection ({e}), reconnecting")
+            with self._condition:
+                self.reconnects += 1
+            try:
+                raw.close()
+            except Error:
+                pass
+            return mysql.connector.connect(**self.config)
+
+    def release(self, raw):
+        """Take back a connection, rolling back what its user left uncommitted"""
+        try:
+            if not raw.is_connected():
+                raise Error(msg="connection lost")
+            if raw.in_transaction:
+                raw.rollback()
+        except Exception as e:
+            logger.warning(f"Pool '{self.name}': discarding connection on return ({e})")
+            try:
+                raw.close()
+            except Exception:
+                pass
+            self._discard()
+            return
+        with self._condition:
+            self._idle.append((raw, time.monotonic()))
+            self._condition.notify()
+
+    def _discard(self):
+        """Free the slot of a connection that was closed or never opened"""
+        with self._condition:
+            self._open -= 1
+            self._condition.notify()
+
+    @contextmanager
+    def get_connection(self, timeout: Optional[float] = None) -> Iterator[PooledConnection]:
+        """Context manager form of connection(): rolls back on database errors and always returns it"""
+        conn = self.connection(timeout)
+        try:
+            yield conn
+        except Error:
+            if conn.is_connected():
+                conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._condition:
+            return {
+                'size': self.size,
+                'open': self._open,
+                'idle': len(self._idle),
+                'in_use': self._open - len(self._idle),
+                'waiters': self._waiters,
+                'checkouts': self.checkouts,
+                'timeouts': self.timeouts,
+                'reconnects': self.reconnects,
+                'leaked': self.leaked,
+                'wait_seconds_total': round(self.wait_seconds_total, 6),
+                'wait_seconds_max': round(self.wait_seconds_max, 6),
+                'wait_seconds_avg': round(self.wait_seconds_total / self.checkouts, 6) if self.checkouts else 0.0,
+            }
+
+    def close_idle(self):
+        """Close every idle connection (e.g. at shutdown)"""
+        with self._condition:
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+        for raw, _ in idle:
+            try:
+                raw.close()
+            except Error:
+                pass
+
+
+_pools: Dict[tuple, MySQLPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_mysql_pool(config: Dict[str, Any]) -> MySQLPool:
+    """The process-wide pool for this server, user and database, created on first use"""
+    key = (config.get('host'), config.get('port', 3306), config.get('user'), config.get('database'))
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = MySQLPool(
+                config,
+                size=int(os.environ.get('MYSQL_POOL_SIZE') or DEFAULT_POOL_SIZE),
+                checkout_timeout=float(os.environ.get('MYSQL_POOL_TIMEOUT') or DEFAULT_CHECKOUT_TIMEOUT),
+                health_check_seconds=float(os.environ.get('MYSQL_POOL_HEALTH_CHECK_SECONDS')
+                                           or DEFAULT_HEALTH_CHECK_SECONDS),
+                name=f"{config.get('user')}@{config.get('host')}/{config.get('database')}"
+            )
+            _pools[key] = pool
+        return pool
+
+
+def pool_metrics() -> Dict[str, Dict[str, Any]]:
+    """Metrics of every pool of this process, by pool name"""
+    with _pools_lock:
+        pools = list(_pools.values())
+    return {pool.name: pool.metrics() for pool in pools}
+
+
+def prometheus() -> str:
+    """Pool metrics in the Prometheus text exposition format"""
+    exported = [
+        ('mysql_pool_in_use', 'in_use', 'gauge', 'Connections checked out'),
+        ('mysql_pool_idle', 'idle', 'gauge', 'Idle open connections'),
+        ('mysql_pool_waiters', 'waiters', 'gauge', 'Threads waiting for a connection'),
+        ('mysql_pool_checkouts_total', 'checkouts', 'counter', 'Connections handed out'),
+        ('mysql_pool_timeouts_total', 'timeouts', 'counter', 'Checkouts that timed out waiting'),
+        ('mysql_pool_reconnects_total', 'reconnects', 'counter', 'Dead connections replaced on checkout'),
+        ('mysql_pool_wait_seconds_total', 'wait_seconds_total', 'counter', 'Time spent waiting for a connection'),
+    ]
+    metrics = pool_metrics()
+    lines = []
+    for name, metric, kind, description in exported:
+        lines += [f'# HELP {name} {description}', f'# TYPE {name} {kind}']
+        lines += [f'{name}{{pool="{pool}"}} {values[metric]:g}' for pool, values in metrics.items()]
+    return '\n'.join(lines) + '\n'
@@ -27,6 +27,7 @@ import secrets
 import string
 import mysql.connector
 from mysql.connector import Error
+from db_pool import get_mysql_pool
 from contextlib import contextmanager
 from dotenv import load_dotenv
 import uuid
@@ -119,7 +120,7 @@ class DatabaseManager:
         """Context manager for database connections"""
         conn = None
         try:
-            conn = mysql.connector.connect(**self.config)
+            conn = get_mysql_pool(self.config).connection()
             yield conn
         except Error as e:
             logger.error(f"Database error: {e}")
@@ -127,7 +128,8 @@ class DatabaseManager:
                 conn.rollback()
             raise
         finally:
-            if conn and conn.is_connected():
+            if conn:
+                # Back to the pool (dropped there if the connection died)
                 conn.close()
     
     def setup_database(self):
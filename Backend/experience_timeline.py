@@ -0,0 +1,163 @@
+"""
+experience_timeline.py - Work history timeline of a resume
+Finds every month/year date range in a resume with one pass of a precompiled
+pattern, tags each range as work or education from the section it sits in (or
+the words around it when the resume has no section headings) and merges
+overlapping work periods, so concurrent jobs are not counted twice towards the
+candidate's years of experience. Explicit claims such as "7 years of
+experience" are collected in the same pass.
+"""
+
+import re
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+_MONTHS = ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec']
+_MONTH_NAMES = r'jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?|sep(?:t(?:ember)?)?|' \
+               r'oct(?:ober)?|nov(?:ember)?|dec(?:ember)?'
+
+
+def _date(prefix: str) -> str:
+    """A 'March 2019', 'mar. 2019', '03/2019' or bare '2019' date, in groups <prefix>month/<prefix>num/<prefix>year"""
+    return (rf'(?:(?P<{prefix}month>{_MONTH_NAMES})\.?,?\s*|(?P<{prefix}num>0?[1-9]|1[0-2])\s*/\s*)?'
+            rf'(?P<{prefix}year>(?:19|20)\d{{2}})\b')
+
+
+class ExperienceTimeline:
+    """Date ranges found in one resume, as (start, end, kind) in months since year 0 (end exclusive)"""
+
+    def __init__(self, periods: List[Tuple[int, int, str]], stated_years: List[int]):
+        self.periods = periods
+        self.stated_years = stated_years
+        self.work_periods = self.merge([(start, end) for start, end, kind in periods if kind == 'work'])
+
+    @staticmethod
+    def merge(intervals: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """Union of the given intervals as sorted, non-overlapping intervals"""
+        merged = []
+        for start, end in sorted(intervals):
+            if merged and start <= merged[-1][1]:
+                if end > merged[-1][1]:
+                    merged[-1] = (merged[-1][0], end)
+            else:
+                merged.append((start, end))
+        return merged
+
+    @property
+    def work_months(self) -> int:
+        return sum(end - start for start, end in self.work_periods)
+
+    @property
+    def work_years(self) -> float:
+        return self.work_months / 12.0
+
+
+class ExperienceTimelineExtractor:
+    """Builds the ExperienceTimeline of a resume's lowercase text"""
+
+    # A date range ("jan 2018 - present", "2015 to 2019", "03/2020 – 11/2021") or an open "since 2019"
+    RANGE_PATTERN = re.compile(
+        rf'\b(?:{_date("s")}\s*(?:[-–—]+|to|until|till)\s*(?:{_date("e")}|(?P<present>present|current|now|today|date)\b)'
+        rf'|since\s+{_date("c")})'
+    )
+    STATED_YEARS_PATTERN = re.compile(
+        r'\b(\d{1,2})\+?\s*(?:years?|yrs?)\.?\s*(?:of\s*)?(?:professional\s*|total\s*|industry\s*|hands[- ]on\s*)?'
+        r'(?:experience|exp\b)'
+        r'|experience\s*(?:of\s*)?[:–-]?\s*(\d{1,2})\+?\s*(?:years?|yrs?)\b'
+        r'|\b(\d{1,2})\+?\s*years?\s*in\s*(?:software|data|engineering|development|the\s+industry)'
+    )
+    # Section headings are short lines without digits; education is checked first ("academic experience")
+    HEADING_KEYWORDS = [
+        ('education', ['education', 'academic', 'qualification']),
+        ('work', ['experience', 'employment', 'work history', 'career', 'professional background']),
+        ('other', ['skills', 'projects', 'summary', 'objective', 'certification', 'award', 'publication',
+                   'volunteer', 'interests', 'languages', 'references', 'training', 'courses']),
+    ]
+    # Words near a range outside the work and education sections that tell which kind it is
+    EDUCATION_CONTEXT = re.compile(r'degree|bachelor|master|phd|university|college|school|b\.sc|m\.sc|diploma|'
+                                   r'graduat|gpa')
+    WORK_CONTEXT = re.compile(r'company|engineer|developer|intern|manager|analyst|consultant|lead|architect|'
+                              r'position|role|\bat\b|employed|work')
+    CONTEXT_BEFORE = 80
+    CONTEXT_AFTER = 40
+    MAX_HEADING_WORDS = 4
+
+    def extract(self, text_lower: str, now: Optional[datetime] = None) -> ExperienceTimeline:
+        now = now or datetime.now()
+        current = now.year * 12 + now.month
+        headings = self._headings(text_lower)
+
+        periods = []
+        heading_index = 0
+        for match in self.RANGE_PATTERN.finditer(text_lower):
+            if match.group('cyear'):
+                start, end = self._month(match, 'c'), current
+            else:
+                start = self._month(match, 's')
+                end = current if match.group('present') else self._month(match, 'e', end=True)
+            if not 1950 * 12 < start <= current or end <= start:
+                continue
+            end = min(end, current)
+
+            while heading_index < len(headings) and headings[heading_index][0] <= match.start():
+                heading_index += 1
+            section = headings[heading_index - 1][1] if heading_index else None
+            kind = self._kind(text_lower, match, section)
+            if kind is not None:
+                periods.append((start, end, kind))
+
+        stated_years = [int(next(group for group in match.groups() if group))
+                        for match in self.STATED_YEARS_PATTERN.finditer(text_lower)]
+        return ExperienceTimeline(periods, stated_years)
+
+    @staticmethod
+    def _month(match: re.Match, prefix: str, end: bool = False) -> int:
+        """Months since year 0 of a matched date; a range's end month is included, a bare end year is not"""
+        year = int(match.group(prefix + 'year'))
+        if match.group(prefix + 'month'):
+            month = _MONTHS.index(match.group(prefix + 'month')[:3]) + 1
+        elif match.group(prefix + 'num'):
+            month = int(match.group(prefix + 'num'))
+        else:
+            # A bare year means January, at either end: "2016 - 2019" counts as three years, as it always has
+            return year * 12 + 1
+        return year * 12 + month + (1 if end else 0)
+
+    def _headings(self, text_lower: str) -> List[Tuple[int, str]]:
+        """(offset, section kind) of every section heading line, in text order"""
+        headings = []
+        offset = 0
+        for line in text_lower.split('\n'):
+            stripped = line.strip()
+            if stripped and len(stripped.split()) <= self.MAX_HEADING_WORDS and not any(c.isdigit() for c in stripped):
+                for kind, keywords in self.HEADING_KEYWORDS:
+                    if any(keyword in stripped for keyword in keywords):
+                        headings.append((offset, kind))
+                        break
+            offset += len(line) + 1
+        return headings
+
+    def _kind(self, text_lower: str, match: re.Match, section: Optional[str]) -> Optional[str]:
+        """'work' or 'education' for a matched range, None if it belongs to neither"""
+        if section in ('work', 'education'):
+            return section
+        # From the line above the range (where the job title or degree usually is) to the end of its line,
+        # within a few words of it; the closest hint wins
+        line_start = text_lower.rfind('\n', 0, match.start())
+        line_end = text_lower.find('\n', match.end())
+        start = max(text_lower.rfind('\n', 0, max(line_start, 0)) + 1, match.start() - self.CONTEXT_BEFORE)
+        end = min(line_end if line_end >= 0 else len(text_lower), match.end() + self.CONTEXT_AFTER)
+        education = self._distance(self.EDUCATION_CONTEXT, text_lower, start, end, match)
+        work = self._distance(self.WORK_CONTEXT, text_lower, start, end, match)
+        if education is not None and (work is None or education < work):
+            return 'education'
+        if section is None or work is not None:
+            return 'work'
+        return None
+
+    @staticmethod
+    def _distance(pattern: re.Pattern, text_lower: str, start: int, end: int, match: re.Match) -> Optional[int]:
+        """Characters between match and the closest hit of pattern in text_lower[start:end]"""
+        distances = [max(match.start() - hit.end(), hit.start() - match.end(), 0)
+                     for hit in pattern.finditer(text_lower, start, end)]
+        return min(distances) if distances else None
@@ -0,0 +1,334 @@
+"""
+extraction_engine.py - Bounded, sandboxed text extraction for resume files
+Every file is read by a short-lived worker process with a wall-clock timeout and
+an address-space cap, so a malformed or huge document can only cost its own
+extraction. Large PDFs are split into page ranges that are extracted in
+parallel. PyPDF2 reads PDFs by default, as the original extractor did; the
+first installed backend is picked per file type and more can be added with
+register_backend(). PyMuPDF (AGPL) is never picked automatically.
+
+Policy knobs (environment):
+  RESUME_EXTRACT_TIMEOUT      seconds per file (default 30)
+  RESUME_EXTRACT_MAX_PAGES    pages read per PDF (default 50)
+  RESUME_EXTRACT_MAX_MB       largest file that is read at all (default 20)
+  RESUME_EXTRACT_MAX_RSS_MB   memory a worker may allocate (default 1024)
+  RESUME_EXTRACT_SANDBOX      0 to extract in-process without limits
+  RESUME_PDF_BACKEND          force a PDF backend by name (pymupdf to opt in)
+"""
+
+import importlib
+import importlib.util
+import logging
+import multiprocessing
+import os
+import time
+from multiprocessing.connection import wait
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows: no address-space cap
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# A backend reads pages [first_page, last_page) and returns (page texts, total pages)
+Backend = Callable[[str, int, int], Tuple[List[str], int]]
+
+
+def _pdf_pymupdf(path: str, first_page: int, last_page: int) -> Tuple[List[str], int]:
+    import fitz
+    with fitz.open(path) as document:
+        last_page = min(last_page, document.page_count)
+        return [document[i].get_text() for i in range(first_page, last_page)], document.page_count
+
+
+def _pdf_pypdf(path: str, first_page: int, last_page: int) -> Tuple[List[str], int]:
+    import pypdf
+    reader = pypdf.PdfReader(path)
+    pages = reader.pages
+    return [pages[i].extract_text() or '' for i in range(first_page, min(last_page, len(pages)))], len(pages)
+
+
+def _pdf_pypdf2(path: str, first_page: int, last_page: int) -> Tuple[List[str], int]:
+    import PyPDF2
+    reader = PyPDF2.PdfReader(path)
+    pages = reader.pages
+    return [pages[i].extract_text() or '' for i in range(first_page, min(last_page, len(pages)))], len(pages)
+
+
+def _docx_python_docx(path: str, first_page: int, last_page: int) -> Tuple[List[str], int]:
+    import docx
+    document = docx.Document(path)
+    return ["\n".join(paragraph.text for paragraph in document.paragraphs)], 1
+
+
+def _text_file(path: str, first_page: int, last_page: int) -> Tuple[List[str], int]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return [f.read()], 1
+
+
+# Per suffix, (name, module that must be importable, backend), preferred first
+_BACKENDS: Dict[str, List[Tuple[str, Optional[str], Backend]]] = {
+    '.pdf': [
+        ('pypdf2', 'PyPDF2', _pdf_pypdf2),
+        ('pypdf', 'pypdf', _pdf_pypdf),
+        ('pymupdf', 'fitz', _pdf_pymupdf),
+    ],
+    '.docx': [('python-docx', 'docx', _docx_python_docx)],
+    '.doc': [('python-docx', 'docx', _docx_python_docx)],
+    '.txt': [('text', None, _text_file)],
+}
+
+# Only used when RESUME_PDF_BACKEND names them: PyMuPDF is AGPL and not a project dependency
+_OPT_IN_BACKENDS = {'pymupdf'}
+
+# Only PDFs are paginated; other formats come back as a single "page"
+_PAGINATED = {'.pdf'}
+
+
+def register_backend(suffix: str, name: str, function: Backend, module: Optional[str] = None,
+                     first: bool = True):
+    """Add a backend for a file suffix; first=True makes it preferred when its module is installed.
+
+    The function must be importable at module level so worker processes can run it.
+    """
+    backends = _BACKENDS.setdefault(suffix.lower(), [])
+    backends[:] = [backend for backend in backends if backend[0] != name]
+    backends.insert(0 if first else len(backends), (name, module, function))
+
+
+def select_backend(suffix: str) -> Optional[Tuple[str, Backend]]:
+    """Preferred installed backend for a suffix (RESUME_PDF_BACKEND overrides the PDF choice)"""
+    installed = [(name, module, function) for name, module, function in _BACKENDS.get(suffix.lower(), [])
+                 if module is None or importlib.util.find_spec(module) is not None]
+    forced = os.environ.get('RESUME_PDF_BACKEND', '').lower() if suffix.lower() == '.pdf' else ''
+    chosen = next((backend for backend in installed if backend[0] == forced), None) if forced else None
+    if forced and chosen is None:
+        logger.warning(f"PDF backend {forced} is not available, choosing automatically")
+    chosen = chosen or next((backend for backend in installed if backend[0] not in _OPT_IN_BACKENDS), None)
+    if chosen is None:
+        return None
+    
+    name, module, function = chosen
+    if module is not None:
+        # Imported once here so forked workers inherit the module instead of importing it per file
+        importlib.import_module(module)
+    return name, function
+
+
+def _env_number(name: str, default: float) -> float:
+    value = os.environ.get(name)
+    try:
+        return float(value) if value else default
+    except ValueError:
+        logger.warning(f"Ignoring invalid {name}={value!r}")
+        return default
+
+
+class ExtractionPolicy:
+    """Limits applied to every extracted file"""
+
+    def __init__(self, timeout: float = 30.0, max_pages: int = 50, max_bytes: int = 20 * 1024 * 1024,
+                 max_rss_mb: int = 1024, sandbox: bool = True, pages_per_task: int = 8, page_workers: int = 4):
+        self.timeout = timeout
+        self.max_pages = max_pages
+        self.max_bytes = max_bytes
+        self.max_rss_mb = max_rss_mb
+        self.sandbox = sandbox
+        # PDFs longer than pages_per_task are split into ranges read by up to page_workers processes
+        self.pages_per_task = pages_per_task
+        self.page_workers = page_workers
+
+    @classmethod
+    def from_env(cls) -> 'ExtractionPolicy':
+        return cls(
+            timeout=_env_number('RESUME_EXTRACT_TIMEOUT', 30.0),
+            max_pages=int(_env_number('RESUME_EXTRACT_MAX_PAGES', 50)),
+            max_bytes=int(_env_number('RESUME_EXTRACT_MAX_MB', 20) * 1024 * 1024),
+            max_rss_mb=int(_env_number('RESUME_EXTRACT_MAX_RSS_MB', 1024)),
+            sandbox=os.environ.get('RESUME_EXTRACT_SANDBOX', '1').lower() not in ('0', 'false', 'no'),
+        )
+
+
+class ExtractionResult:
+    """Text of one file plus how it was obtained"""
+
+    def __init__(self, text: str = '', backend: Optional[str] = None, pages: int = 0, total_pages: int = 0,
+                 seconds: float = 0.0, error: Optional[str] = None):
+        self.text = text
+        self.backend = backend
+        self.pages = pages
+        self.total_pages = total_pages
+        self.seconds = seconds
+        self.error = error
+
+    @property
+    def truncated(self) -> bool:
+        return self.pages < self.total_pages
+
+    def to_dict(self) -> Dict:
+        return {
+            'seconds': round(self.seconds, 4),
+            'backend': self.backend,
+            'pages': self.pages,
+            'total_pages': self.total_pages,
+            'truncated': self.truncated,
+            'error': self.error,
+        }
+
+
+def _address_space_bytes() -> Optional[int]:
+    """Virtual memory size of this process, or None where /proc is not available"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[0]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _sandboxed_task(connection, function: Backend, path: str, first_page: int, last_page: int,
+                    max_rss_mb: int):
+    """Worker process entry point: cap memory growth, run the backend, send back the pages"""
+    try:
+        # A forked worker starts with its parent's address space, so the cap is on top of that
+        current = _address_space_bytes()
+        if resource is not None and max_rss_mb and current is not None:
+            limit = current + max_rss_mb * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        connection.send(('ok', function(path, first_page, last_page)))
+    except MemoryError:
+        connection.send(('error', f"memory limit of {max_rss_mb} MB exceeded"))
+    except Exception as e:
+        connection.send(('error', f"{type(e).__name__}: {e}"))
+    finally:
+        connection.close()
+
+
+class ExtractionEngine:
+    """Extract text from resume files under an ExtractionPolicy"""
+
+    def __init__(self, policy: Optional[ExtractionPolicy] = None):
+        self.policy = policy or ExtractionPolicy.from_env()
+
+    def signature(self) -> str:
+        """Everything besides the file itself that changes the extracted text"""
+        backends = sorted(f"{suffix}={choice[0]}" for suffix in _BACKENDS
+                          for choice in [select_backend(suffix)] if choice)
+        return f"{','.join(backends)};max_pages={self.policy.max_pages}"
+
+    def extract(self, file_path: Path) -> ExtractionResult:
+        """Extract a file's text; failures come back as an empty result with error set"""
+        start = time.perf_counter()
+        file_path = Path(file_path)
+        result = ExtractionResult()
+
+        choice = select_backend(file_path.suffix)
+        if choice is None:
+            result.error = f"no backend for {file_path.suffix or 'files without extension'}"
+        else:
+            result.backend, function = choice
+            try:
+                size = file_path.stat().st_size
+            except OSError as e:
+                size, result.error = 0, str(e)
+            if size > self.policy.max_bytes:
+                result.error = f"file is {size / 1024 / 1024:.1f} MB, limit is {self.policy.max_bytes / 1024 / 1024:.0f} MB"
+            elif result.error is None:
+                self._read(function, file_path, result, file_path.suffix.lower() in _PAGINATED)
+
+        result.seconds = time.perf_counter() - start
+        if result.error:
+            logger.warning(f"Extraction of {file_path.name} failed: {result.error}")
+        return result
+
+    def _read(self, function: Backend, file_path: Path, result: ExtractionResult, paginated: bool):
+        max_pages = self.policy.max_pages if paginated else 1
+        first_range = min(self.policy.pages_per_task, max_pages) if paginated else 1
+        deadline = time.monotonic() + self.policy.timeout
+
+        outcome = self._run([(0, first_range)], function, file_path, deadline)
+        status, value = outcome[0]
+        if status != 'ok':
+            result.error = value
+            return
+        page_texts, total_pages = value
+        pages = [page_texts]
+
+        # Remaining page ranges of a long PDF run in parallel under the same deadline
+        ranges = [(first, min(first + self.policy.pages_per_task, total_pages, max_pages))
+                  for first in range(first_range, min(total_pages, max_pages), self.policy.pages_per_task)]
+        for batch_start in range(0, len(ranges), self.policy.page_workers):
+            batch = ranges[batch_start:batch_start + self.policy.page_workers]
+            for status, value in self._run(batch, function, file_path, deadline):
+                if status != 'ok':
+                    result.error = value
+                    return
+                pages.append(value[0])
+
+        page_list = [text for chunk in pages for text in chunk]
+        # List join instead of repeated concatenation; every page ends with a newline
+        result.text = ''.join(f"{text}\n" for text in page_list) if paginated else ''.join(page_list)
+        result.pages = len(page_list)
+        result.total_pages = total_pages if paginated else 1
+
+    def _run(self, ranges: List[Tuple[int, int]], function: Backend, file_path: Path,
+             deadline: float) -> List[Tuple[str, object]]:
+        """Run the backend over each page range, in worker processes when sandboxed"""
+        if not self.policy.sandbox:
+            outcomes = []
+            for first, last in ranges:
+                try:
+                    outcomes.append(('ok', function(str(file_path), first, last)))
+                except Exception as e:
+                    outcomes.append(('error', f"{type(e).__name__}: {e}"))
+            return outcomes
+
+        # Same start method as the scoring process pool
+        context = multiprocessing.get_context()
+        workers = []
+        for first, last in ranges:
+            receiver, sender = context.Pipe(duplex=False)
+            process = context.Process(target=_sandboxed_task, daemon=True,
+                                      args=(sender, function, str(file_path), first, last, self.policy.max_rss_mb))
+            process.start()
+            sender.close()
+            workers.append((receiver, process))
+
+        outcomes = {}
+        pending = {receiver: index for index, (receiver, _) in enumerate(workers)}
+        while pending:
+            remaining = deadline - time.monotonic()
+            ready = wait(list(pending), timeout=max(remaining, 0)) if remaining > 0 else []
+            if not ready:
+                for receiver, index in pending.items():
+                    outcomes[index] = ('error', f"timed out after {self.policy.timeout:g}s")
+                break
+            for receiver in ready:
+                index = pending.pop(receiver)
+                try:
+                    outcomes[index] = receiver.recv()
+                except EOFError:
+                    # The worker died without answering (killed by the memory cap or a crash)
+                    process = workers[index][1]
+                    process.join(1)
+                    outcomes[index] = ('error', f"worker exited with code {process.exitcode}")
+
+        for receiver, process in workers:
+            receiver.close()
+            if process.is_alive():
+                process.kill()
+            process.join()
+        return [outcomes[index] for index in range(len(workers))]
+
+
+_default_engine: Optional[ExtractionEngine] = None
+
+
+def get_extraction_engine() -> ExtractionEngine:
+    """Process-wide engine configured from the environment"""
+    global _default_engine
+    if _default_engine is None:
+        _default_engine = ExtractionEngine()
+    return _default_engine
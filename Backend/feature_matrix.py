@@ -0,0 +1,189 @@
+"""
+feature_matrix.py - Per-ticket matrix of component scores for fast re-ranking
+Every unique candidate of a ticket becomes one float32 row of component scores.
+Re-weighting a ticket is then a single matrix-vector product plus a partial
+sort, so recruiters can try different weightings without re-reading any resume.
+Candidates the scoring cascade pruned have no professional development score
+yet and are marked as incomplete; rerank() fills in the ones that could reach
+the requested top N through a callback, so rankings match a full scoring run.
+"""
+
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+# Column order of the matrix; every value is scaled to 0..1
+FEATURE_COLUMNS = [
+    'skills',
+    'experience',
+    'location',
+    'professional_dev',
+    'similarity',
+    'certification',
+    'leadership',
+    'education_level',
+]
+
+# Columns left at 0 for candidates the scoring cascade pruned
+CASCADE_COLUMNS = ['professional_dev']
+
+# Weights that reproduce the stage 1 final_score (merged duplicate groups keep
+# the best value of each component, so their row can score a little higher)
+DEFAULT_WEIGHTS = {
+    'skills': 0.40,
+    'experience': 0.30,
+    'location': 0.10,
+    'professional_dev': 0.20,
+}
+
+FEATURE_MATRIX_FILENAME = 'feature_matrix.npz'
+
+
+def feature_row(score: Dict) -> List[float]:
+    """Component scores of one scored resume in FEATURE_COLUMNS order"""
+    features = score.get('additional_features', {})
+    return [
+        score.get('skill_score', 0.0),
+        score.get('experience_score', 0.0),
+        score.get('location_score', 0.0),
+        score.get('professional_development_score', 0.0),
+        score.get('similarity_score', 0.0),
+        1.0 if features.get('has_certifications') else 0.0,
+        # Same saturation as the stage 2 leadership bonus (five keywords = full marks)
+        min(features.get('leadership_experience', 0) / 5.0, 1.0),
+        features.get('education_level', 0) / 4.0,
+    ]
+
+
+class FeatureMatrix:
+    """Component scores of a ticket's candidates, one row per candidate"""
+
+    def __init__(self, features: np.ndarray, filenames: Sequence[str], signature: str = '',
+                 complete: Optional[np.ndarray] = None):
+        self.features = np.asarray(features, dtype=np.float32).reshape(-1, len(FEATURE_COLUMNS))
+        self.filenames = list(filenames)
+        self.signature = signature
+        # False for rows whose CASCADE_COLUMNS were never computed (prefiltered candidates)
+        self.complete = np.ones(len(self.filenames), dtype=bool) if complete is None \
+            else np.array(complete, dtype=bool)
+
+    @classmethod
+    def from_scores(cls, scores: List[Dict], signature: str = '') -> 'FeatureMatrix':
+        return cls(np.array([feature_row(score) for score in scores], dtype=np.float32),
+                   [score['filename'] for score in scores], signature,
+                   np.array([not score.get('prefiltered') for score in scores], dtype=bool))
+
+    def __len__(self):
+        return len(self.filenames)
+
+    def save(self, path: Path):
+        """Write the matrix as a compressed .npz next to the other filtering results"""
+        path = Path(path)
+        tmp_path = path.with_name(path.name + '.tmp.npz')
+        np.savez_compressed(
+            tmp_path,
+            features=self.features,
+            filenames=np.array(self.filenames, dtype=str),
+            columns=np.array(FEATURE_COLUMNS, dtype=str),
+            signature=np.array(self.signature),
+            complete=self.complete,
+        )
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional['FeatureMatrix']:
+        """Stored matrix, or None if missing or written with a different column layout"""
+        try:
+            with np.load(path, allow_pickle=False) as stored:
+                if list(stored['columns']) != FEATURE_COLUMNS:
+                    return None
+                # Matrices written before the scoring cascade only hold complete rows
+                complete = stored['complete'] if 'complete' in stored.files else None
+                return cls(stored['features'], [str(name) for name in stored['filenames']], str(stored['signature']),
+                           complete)
+        except (OSError, KeyError, ValueError):
+            return None
+
+    @staticmethod
+    def weight_vector(weights: Union[Dict[str, float], Sequence[float], None]) -> np.ndarray:
+        """Validated weight vector; a dict may name any subset of FEATURE_COLUMNS (others weigh 0)"""
+        if weights is None:
+            weights = DEFAULT_WEIGHTS
+        if isinstance(weights, dict):
+            unknown = set(weights) - set(FEATURE_COLUMNS)
+            if unknown:
+                raise ValueError(f"Unknown feature(s): {', '.join(sorted(unknown))}. "
+                                 f"Valid features: {', '.join(FEATURE_COLUMNS)}")
+            vector = [weights.get(column, 0.0) for column in FEATURE_COLUMNS]
+        else:
+            vector = list(weights)
+            if len(vector) != len(FEATURE_COLUMNS):
+                raise ValueError(f"Expected {len(FEATURE_COLUMNS)} weights in the order {', '.join(FEATURE_COLUMNS)}")
+
+        try:
+            vector = np.array(vector, dtype=np.float32)
+        except (TypeError, ValueError):
+            raise ValueError("Weights must be numbers")
+        if not np.all(np.isfinite(vector)):
+            raise ValueError("Weights must be finite numbers")
+        return vector
+
+    def complete_candidates(self, vector: np.ndarray, top_n: int,
+                            complete_rows: Callable[[List[int]], np.ndarray]) -> List[int]:
+        """Fill in the CASCADE_COLUMNS of every incomplete row that could rank in the top top_n under
+        vector; complete_rows(rows) returns their values, one row per requested row. Returns the rows filled in."""
+        columns = [FEATURE_COLUMNS.index(column) for column in CASCADE_COLUMNS]
+        # Every column is scaled to 0..1 and missing ones are stored as 0
+        gain = float(np.clip(vector[columns], 0, None).sum())
+        loss = float(np.clip(vector[columns], None, 0).sum())
+        completed = []
+        while not self.complete.all():
+            scores = self.features.astype(np.float64) @ vector.astype(np.float64)
+            lower = np.where(self.complete, scores, scores + loss)
+            upper = np.where(self.complete, scores, scores + gain)
+            n = min(top_n, len(scores))
+            cutoff = -np.partition(-lower, n - 1)[n - 1]
+            # Rows tied with the cutoff are completed too, so ties are cut on exact scores
+            rows = np.flatnonzero(~self.complete & (np.round(upper, 6) >= np.round(cutoff, 6)))
+            if not len(rows):
+                break
+            values = np.asarray(complete_rows(rows.tolist()), dtype=np.float32).reshape(len(rows), len(columns))
+            self.features[np.ix_(rows, columns)] = values
+            self.complete[rows] = True
+            completed += rows.tolist()
+        return completed
+
+    def rerank(self, weights: Union[Dict[str, float], Sequence[float], None] = None, top_n: int = 10,
+               complete_rows: Optional[Callable[[List[int]], np.ndarray]] = None) -> List[Dict]:
+        """Top top_n candidates under the given weights, best first. Without complete_rows (see
+        complete_candidates) incomplete candidates are ranked on their partial scores."""
+        vector = self.weight_vector(weights)
+        if not len(self) or top_n <= 0:
+            return []
+        if complete_rows is not None:
+            self.complete_candidates(vector, top_n, complete_rows)
+
+        # Rounded so float noise cannot reorder candidates that tie on their scores
+        scores = np.round(self.features.astype(np.float64) @ vector.astype(np.float64), 6)
+        top_n = min(top_n, len(scores))
+        if top_n < len(scores):
+            # Keep everything tied with the n-th best so ties are cut in stored order below
+            cutoff = -np.partition(-scores, top_n - 1)[top_n - 1]
+            candidates = np.flatnonzero(scores >= cutoff)
+        else:
+            candidates = np.arange(len(scores))
+        # Ties keep the stored (stage 1) order
+        order = candidates[np.lexsort((candidates, -scores[candidates]))][:top_n]
+
+        return [
+            {
+                'rank': rank,
+                'filename': self.filenames[row],
+                'score': round(float(scores[row]), 6),
+                'complete': bool(self.complete[row]),
+                'features': {column: round(float(value), 6)
+                             for column, value in zip(FEATURE_COLUMNS, self.features[row])},
+            }
+            for rank, row in enumerate(order, 1)
+        ]
@@ -0,0 +1,210 @@
+"""
+filtering_metrics.py - Timing spans and counters for resume filtering runs
+A RunProfile collects how long each stage of one filter_resumes() call took,
+together with per-stage counters (bytes read, pages parsed, patterns matched,
+...). FilteringMetrics keeps the recent profiles of this process and running
+totals per stage, and renders them in the Prometheus text format.
+"""
+
+import cProfile
+import io
+import logging
+import pstats
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Stages of filter_resumes(), in pipeline order
+STAGES = ['load_ticket', 'extract', 'score', 'dedupe', 'merge', 'advanced_scoring', 'write_results']
+
+
+class RunProfile:
+    """Timing spans and counters of one filtering run"""
+
+    def __init__(self, ticket_id: str = ''):
+        self.ticket_id = ticket_id
+        self.started_at = time.time()
+        self.spans: Dict[str, Dict[str, Any]] = {}
+        self._start = time.perf_counter()
+        self.total_seconds: Optional[float] = None
+
+    def _span(self, name: str) -> Dict[str, Any]:
+        return self.spans.setdefault(name, {'seconds': 0.0, 'calls': 0, 'counters': {}})
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[Dict[str, Any]]:
+        """Time a block as (part of) stage name; yields the span so counters can be added inside"""
+        span = self._span(name)
+        start = time.perf_counter()
+        try:
+            yield span
+        finally:
+            span['seconds'] += time.perf_counter() - start
+            span['calls'] += 1
+
+    def add(self, name: str, seconds: float = 0.0, **counters: float):
+        """Add time measured elsewhere (e.g. in worker processes) and counters to stage name"""
+        span = self._span(name)
+        span['seconds'] += seconds
+        span['calls'] += 1
+        self.count(name, **counters)
+
+    def count(self, name: str, **counters: float):
+        span_counters = self._span(name)['counters']
+        for counter, value in counters.items():
+            span_counters[counter] = span_counters.get(counter, 0) + value
+
+    def finish(self):
+        self.total_seconds = time.perf_counter() - self._start
+
+    def to_dict(self) -> Dict[str, Any]:
+        order = {name: index for index, name in enumerate(STAGES)}
+        spans = sorted(self.spans.items(), key=lambda item: order.get(item[0], len(STAGES)))
+        return {
+            'ticket_id': self.ticket_id,
+            'started_at': self.started_at,
+            'total_seconds': round(self.total_seconds if self.total_seconds is not None
+                                   else time.perf_counter() - self._start, 4),
+            'spans': {
+                name: {'seconds': round(span['seconds'], 4), 'calls': span['calls'],
+                       'counters': {key: round(value, 4) if isinstance(value, float) else value
+                                    for key, value in span['counters'].items()}}
+                for name, span in spans
+            },
+        }
+
+
+class RunProfiler:
+    """Optional cProfile or tracemalloc capture around a filtering run"""
+
+    MODES = ('cprofile', 'tracemalloc')
+
+    def __init__(self, mode: Optional[str]):
+        if mode and mode not in self.MODES:
+            # A typo in RESUME_FILTER_PROFILE must not stop every filtering run
+            logger.warning(f"Ignoring unknown profile mode {mode!r}; choose from {', '.join(self.MODES)}")
+            mode = None
+        self.mode = mode
+        self._profiler = None
+        self._started_tracemalloc = False
+
+    def start(self):
+        self.discard()
+        if self.mode == 'cprofile':
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError as e:
+                # Only one profiler can be active at a time (e.g. another ticket of a batch)
+                logger.warning(f"Not profiling this run: {e}")
+                return
+            self._profiler = profiler
+        elif self.mode == 'tracemalloc':
+            # tracemalloc is process-wide: a capture someone else started would mix their allocations in
+            if tracemalloc.is_tracing():
+                logger.warning("Not tracing this run: tracemalloc is already tracing in this process")
+                return
+            tracemalloc.start(25)
+            self._started_tracemalloc = True
+
+    def discard(self):
+        """Stop capturing without writing anything; a no-op once stop() has run"""
+        if self._profiler is not None:
+            self._profiler.disable()
+            self._profiler = None
+        if self._started_tracemalloc and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._started_tracemalloc = False
+
+    def stop(self, output_prefix: Path, top: int = 40) -> Optional[Dict[str, str]]:
+        """Stop capturing and write the snapshot next to output_prefix; returns the written files"""
+        if self.mode == 'cprofile' and self._profiler is not None:
+            self._profiler.disable()
+            stats_file = output_prefix.with_suffix('.prof')
+            self._profiler.dump_stats(str(stats_file))
+            summary = io.StringIO()
+            pstats.Stats(self._profiler, stream=summary).sort_stats('cumulative').print_stats(top)
+            self._profiler = None
+            summary_file = output_prefix.with_suffix('.txt')
+            summary_file.write_text(summary.getvalue())
+            return {'mode': self.mode, 'stats_file': str(stats_file), 'summary_file': str(summary_file)}
+
+        if self.mode == 'tracemalloc' and self._started_tracemalloc and tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+            lines = [f"current: {current / 1024 / 1024:.1f} MB, peak: {peak / 1024 / 1024:.1f} MB", '']
+            lines += [str(stat) for stat in snapshot.statistics('lineno')[:top]]
+            summary_file = output_prefix.with_suffix('.txt')
+            summary_file.write_text('\n'.join(lines) + '\n')
+            return {'mode': self.mode, 'summary_file': str(summary_file),
+                    'peak_mb': f"{peak / 1024 / 1024:.1f}"}
+        return None
+
+
+class FilteringMetrics:
+    """Process-wide record of filtering runs"""
+
+    MAX_RECENT = 50
+
+    _recent: deque = deque(maxlen=MAX_RECENT)
+    _totals: Dict[str, Dict[str, float]] = {}
+    _runs = 0
+    _lock = threading.Lock()
+
+    @classmethod
+    def record(cls, profile: RunProfile):
+        """Remember a finished run and add it to the per-stage totals"""
+        run = profile.to_dict()
+        with cls._lock:
+            cls._recent.append(run)
+            cls._runs += 1
+            for name, span in run['spans'].items():
+                totals = cls._totals.setdefault(name, {'seconds': 0.0, 'calls': 0})
+                totals['seconds'] += span['seconds']
+                totals['calls'] += span['calls']
+                for counter, value in span['counters'].items():
+                    totals[counter] = totals.get(counter, 0) + value
+
+    @classmethod
+    def recent(cls, ticket_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        with cls._lock:
+            runs = list(cls._recent)
+        return [run for run in runs if ticket_id is None or run['ticket_id'] == ticket_id]
+
+    @classmethod
+    def totals(cls) -> Dict[str, Any]:
+        with cls._lock:
+            return {'runs': cls._runs, 'stages': {name: dict(values) for name, values in cls._totals.items()}}
+
+    @classmethod
+    def prometheus(cls) -> str:
+        """Totals in the Prometheus text exposition format"""
+        totals = cls.totals()
+        lines = ['# HELP resume_filtering_runs_total Completed filtering runs in this process',
+                 '# TYPE resume_filtering_runs_total counter',
+                 f"resume_filtering_runs_total {totals['runs']}",
+                 '# HELP resume_filtering_stage_seconds_total Time spent per filtering stage',
+                 '# TYPE resume_filtering_stage_seconds_total counter']
+        lines += [f'resume_filtering_stage_seconds_total{{stage="{name}"}} {values["seconds"]:.6f}'
+                  for name, values in totals['stages'].items()]
+        lines += ['# HELP resume_filtering_stage_count_total Per-stage counters (bytes read, pages parsed, ...)',
+                  '# TYPE resume_filtering_stage_count_total counter']
+        lines += [f'resume_filtering_stage_count_total{{stage="{name}",counter="{counter}"}} {value:g}'
+                  for name, values in totals['stages'].items()
+                  for counter, value in values.items() if counter not in ('seconds', 'calls')]
+        return '\n'.join(lines) + '\n'
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._recent.clear()
+            cls._totals.clear()
+            cls._runs = 0
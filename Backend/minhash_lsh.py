@@ -0,0 +1,111 @@
+"""
+minhash_lsh.py - MinHash signatures and LSH banding for near-duplicate search
+Signatures estimate the Jaccard similarity of two texts' word shingles; the LSH
+index buckets signatures by bands so that only texts likely to be above a
+similarity threshold are ever compared.
+"""
+
+import re
+import zlib
+from collections import defaultdict
+from typing import Dict, Hashable, List, Set, Tuple
+
+import numpy as np
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_WORD_PATTERN = re.compile(r'\w+')
+
+
+class MinHasher:
+    """MinHash signatures over word shingles, stable across processes and runs"""
+
+    def __init__(self, num_perm: int = 128, shingle_size: int = 3, seed: int = 1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        # Coefficients below 2**32 keep a * crc32 + b inside uint64
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, 1 << 32, size=num_perm, dtype=np.uint64)
+
+    def shingles(self, text: str) -> Set[str]:
+        """Overlapping word n-grams of the lowercased text"""
+        words = _WORD_PATTERN.findall(text.lower())
+        if len(words) <= self.shingle_size:
+            return {' '.join(words)} if words else set()
+        return {' '.join(words[i:i + self.shingle_size]) for i in range(len(words) - self.shingle_size + 1)}
+
+    def signature(self, text: str) -> np.ndarray:
+        """MinHash signature (uint32 array of length num_perm)"""
+        shingles = self.shingles(text)
+        if not shingles:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint32)
+
+        hashes = np.fromiter((zlib.crc32(shingle.encode('utf-8')) for shingle in shingles),
+                             dtype=np.uint64, count=len(shingles))
+        permuted = (np.outer(hashes, self._a) + self._b) % _MERSENNE_PRIME & _MAX_HASH
+        return permuted.min(axis=0).astype(np.uint32)
+
+    @staticmethod
+    def jaccard(signature1: np.ndarray, signature2: np.ndarray) -> float:
+        """Estimated Jaccard similarity of the texts behind two signatures"""
+        if len(signature1) != len(signature2) or not len(signature1):
+            return 0.0
+        return float(np.count_nonzero(signature1 == signature2)) / len(signature1)
+
+    @staticmethod
+    def to_hex(signature: np.ndarray) -> str:
+        """Compact JSON-safe encoding of a signature"""
+        return signature.astype('<u4').tobytes().hex()
+
+    @staticmethod
+    def from_hex(encoded: str) -> np.ndarray:
+        return np.frombuffer(bytes.fromhex(encoded), dtype='<u4')
+
+
+class LSHIndex:
+    """Banded LSH over MinHash signatures.
+
+    The signature is cut into ``bands`` bands of ``rows`` rows; two signatures
+    become candidates when any band matches exactly. Bands and rows are chosen
+    so the probability curve 1 - (1 - s**rows)**bands crosses over at the
+    similarity threshold: raising the threshold favours precision (fewer
+    candidate pairs), lowering it favours recall.
+    """
+
+    def __init__(self, num_perm: int = 128, threshold: float = 0.85):
+        self.num_perm = num_perm
+        self.threshold = threshold
+        self.bands, self.rows = self.optimal_bands(num_perm, threshold)
+        self._buckets: List[Dict[bytes, List[Hashable]]] = [defaultdict(list) for _ in range(self.bands)]
+
+    @staticmethod
+    def optimal_bands(num_perm: int, threshold: float,
+                      false_positive_weight: float = 0.5, false_negative_weight: float = 0.5) -> Tuple[int, int]:
+        """(bands, rows) minimising the weighted false positive and false negative areas around threshold"""
+        below = np.linspace(0.0, threshold, 200)
+        above = np.linspace(threshold, 1.0, 200)
+        best, best_error = (num_perm, 1), float('inf')
+        for bands in range(1, num_perm + 1):
+            rows = num_perm // bands
+            false_positive = np.mean(1 - (1 - below ** rows) ** bands) * threshold
+            false_negative = np.mean((1 - above ** rows) ** bands) * (1.0 - threshold)
+            error = false_positive_weight * false_positive + false_negative_weight * false_negative
+            if error < best_error:
+                best, best_error = (bands, rows), error
+        return best
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+
+    def insert(self, key: Hashable, signature: np.ndarray):
+        """Add a signature under key"""
+        for band, band_key in enumerate(self._band_keys(signature)):
+            self._buckets[band][band_key].append(key)
+
+    def query(self, signature: np.ndarray) -> Set[Hashable]:
+        """Keys sharing at least one band with signature"""
+        candidates = set()
+        for band, band_key in enumerate(self._band_keys(signature)):
+            candidates.update(self._buckets[band].get(band_key, ()))
+        return candidates
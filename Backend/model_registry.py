@@ -0,0 +1,74 @@
+"""
+model_registry.py - Process-wide cache of heavy NLP resources
+Models are loaded on first use and then shared by every filtering job that
+runs in the same process. Nothing is ever downloaded here: a missing model is
+reported and the caller carries on without it.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ModelRegistry:
+    """Lazily loaded, process-wide model cache"""
+
+    _models: Dict[str, Any] = {}
+    _load_seconds: Dict[str, float] = {}
+    _failures: Dict[str, str] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls, name: str, loader: Callable[[], Any]) -> Optional[Any]:
+        """Return the model registered under name, loading it with loader on first use"""
+        if name in cls._models:
+            return cls._models[name]
+        if name in cls._failures:
+            return None
+
+        with cls._lock:
+            if name in cls._models:
+                return cls._models[name]
+            if name in cls._failures:
+                return None
+
+            start = time.perf_counter()
+            try:
+                model = loader()
+            except (ImportError, OSError) as e:
+                cls._failures[name] = str(e)
+                logger.warning(f"Model {name} is not available: {e}")
+                return None
+
+            cls._load_seconds[name] = time.perf_counter() - start
+            cls._models[name] = model
+            logger.info(f"Loaded model {name} in {cls._load_seconds[name]:.2f}s")
+            return model
+
+    @classmethod
+    def status(cls) -> Dict[str, Dict[str, Any]]:
+        """Which models are loaded, how long they took, and which failed"""
+        status = {name: {'loaded': True, 'load_seconds': round(seconds, 3)}
+                  for name, seconds in cls._load_seconds.items()}
+        status.update({name: {'loaded': False, 'error': error} for name, error in cls._failures.items()})
+        return status
+
+    @classmethod
+    def clear(cls):
+        """Drop every cached model and remembered failure"""
+        with cls._lock:
+            cls._models.clear()
+            cls._load_seconds.clear()
+            cls._failures.clear()
+
+
+def get_spacy_model(model_name: str = "en_core_web_sm") -> Optional[Any]:
+    """Shared spaCy pipeline, or None if spaCy or the model is not installed"""
+    def load():
+        import spacy
+        return spacy.load(model_name)
+
+    return ModelRegistry.get(f"spacy:{model_name}", load)
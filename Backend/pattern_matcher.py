@@ -0,0 +1,92 @@
+"""
+pattern_matcher.py - Multi-pattern literal matching for resume scoring
+Compiles a fixed set of literal patterns once and reports every pattern found in
+a text with a single pass over it.
+"""
+
+import re
+from typing import Dict, Iterable, List, Set
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == '_'
+
+
+class MultiPatternMatcher:
+    """Find all occurrences of many literal patterns in one scan.
+
+    The patterns are arranged in a trie that is compiled into a single regular
+    expression, so the automaton walk happens inside the regex engine instead of
+    in Python. At every position the regex reports the longest pattern starting
+    there; shorter patterns starting at the same position are prefixes of it and
+    are looked up in a table built at compile time.
+
+    With ``word_boundaries`` enabled a hit only counts when it is not glued to
+    surrounding letters or digits, so "js" no longer matches inside "adjust".
+    As with ``\\b``, the check only applies to a pattern edge that is itself a
+    word character (".net" still matches in "asp.net").
+    """
+
+    def __init__(self, patterns: Iterable[str], word_boundaries: bool = False):
+        self.patterns = sorted({pattern for pattern in patterns if pattern})
+        self.word_boundaries = word_boundaries
+
+        pattern_set = set(self.patterns)
+        self._prefixes = {
+            pattern: [pattern[:i] for i in range(len(pattern), 0, -1) if pattern[:i] in pattern_set]
+            for pattern in self.patterns
+        }
+        self._regex = re.compile('(?=(%s))' % self._trie_to_regex(self._build_trie())) if self.patterns else None
+
+    def _build_trie(self) -> Dict:
+        trie = {}
+        for pattern in self.patterns:
+            node = trie
+            for char in pattern:
+                node = node.setdefault(char, {})
+            node[''] = {}
+        return trie
+
+    @classmethod
+    def _trie_to_regex(cls, node: Dict) -> str:
+        """Render a trie node as a regex; children differ in their first char so greedy matching is longest-match"""
+        terminal = '' in node
+        branches = [re.escape(char) + cls._trie_to_regex(child)
+                    for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        if len(branches) == 1 and not terminal:
+            return branches[0]
+        group = '(?:%s)' % '|'.join(branches)
+        return group + '?' if terminal else group
+
+    def _at_boundaries(self, text: str, start: int, pattern: str) -> bool:
+        if _is_word_char(pattern[0]) and start > 0 and _is_word_char(text[start - 1]):
+            return False
+        end = start + len(pattern)
+        if _is_word_char(pattern[-1]) and end < len(text) and _is_word_char(text[end]):
+            return False
+        return True
+
+    def find_all(self, text: str) -> Dict[str, List[int]]:
+        """Map each pattern found in text to the offsets where it starts"""
+        hits: Dict[str, List[int]] = {}
+        if self._regex is None:
+            return hits
+
+        for match in self._regex.finditer(text):
+            start = match.start()
+            for pattern in self._prefixes[match.group(1)]:
+                if self.word_boundaries and not self._at_boundaries(text, start, pattern):
+                    continue
+                hits.setdefault(pattern, []).append(start)
+        return hits
+
+    def found(self, text: str) -> Set[str]:
+        """Set of patterns that occur in text"""
+        if self._regex is None:
+            return set()
+        if not self.word_boundaries:
+            longest = {match.group(1) for match in self._regex.finditer(text)}
+            return {prefix for pattern in longest for prefix in self._prefixes[pattern]}
+        return set(self.find_all(text))
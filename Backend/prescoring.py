@@ -0,0 +1,96 @@
+"""
+prescoring.py - Background scoring of uploaded resumes into their ticket's leaderboard
+Uploads are queued here instead of waiting for the next filter-resumes call. A
+single worker thread brings each queued ticket's leaderboard up to date: every
+resume in the folder it does not cover yet is extracted (warming the extraction
+cache for the next filtering run), checked against the shortlisted candidates
+for duplicates and scored against the ticket's cached job profile. Several
+uploads to the same ticket while it waits in the queue are handled in one pass.
+"""
+
+import logging
+import queue
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PreScoringPipeline:
+    """Queue of tickets whose leaderboard needs the newly uploaded resumes scored in"""
+
+    def __init__(self):
+        self._queue: 'queue.Queue[str]' = queue.Queue()
+        self._pending = set()
+        self._last_results: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def enqueue(self, ticket_folder) -> bool:
+        """Queue a ticket folder for pre-scoring; False if it is already waiting"""
+        folder = str(Path(ticket_folder).resolve())
+        with self._lock:
+            if folder in self._pending:
+                return False
+            self._pending.add(folder)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='resume-prescoring', daemon=True)
+                self._thread.start()
+        self._queue.put(folder)
+        return True
+
+    def status(self, ticket_folder) -> Dict:
+        folder = str(Path(ticket_folder).resolve())
+        with self._lock:
+            return {'queued': folder in self._pending, 'last_result': self._last_results.get(folder)}
+
+    def _run(self):
+        while True:
+            folder = self._queue.get()
+            with self._lock:
+                # Uploads arriving from here on queue the ticket again
+                self._pending.discard(folder)
+            start = time.perf_counter()
+            try:
+                result = self.prescore(folder)
+            except Exception as e:
+                logger.error(f"Pre-scoring failed for {folder}: {type(e).__name__}: {e}")
+                result = {'status': 'failed', 'error': f"{type(e).__name__}: {e}"}
+            result.update(seconds=round(time.perf_counter() - start, 3), finished_at=datetime.now().isoformat())
+            with self._lock:
+                self._last_results[folder] = result
+            self._queue.task_done()
+
+    @staticmethod
+    def prescore(ticket_folder) -> Dict:
+        """Score the resumes of one ticket folder that its leaderboard does not cover yet"""
+        from resume_filter5 import UpdatedResumeFilteringSystem
+
+        if (Path(ticket_folder) / '.filtering_in_progress').exists():
+            # The running filtering pass covers these resumes and replaces the leaderboard
+            return {'status': 'skipped', 'reason': 'filtering in progress'}
+        # Identities are registered by the upload itself
+        system = UpdatedResumeFilteringSystem(ticket_folder, use_identity_index=False)
+        result = system.prescore_new_resumes()
+        logger.info(f"Pre-scored ticket {system.job_ticket.ticket_id}: {result}")
+        return result
+
+    def wait(self):
+        """Block until every queued ticket has been processed"""
+        self._queue.join()
+
+
+_pipeline: Optional[PreScoringPipeline] = None
+_pipeline_lock = threading.Lock()
+
+
+def get_prescoring_pipeline() -> PreScoringPipeline:
+    """The process-wide pre-scoring pipeline, created on first use"""
+    global _pipeline
+    with _pipeline_lock:
+        if _pipeline is None:
+            _pipeline = PreScoringPipeline()
+        return _pipeline
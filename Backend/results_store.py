@@ -0,0 +1,386 @@
+"""
+results_store.py - Compact storage of filtering runs with a latest-run pointer
+Every filtering run becomes one folder under filtering_results/runs/:
+
+  candidates.parquet   one row of scalar scores per unique candidate (columnar,
+                       so readers load only the columns and rows they need;
+                       candidates.npz when no Parquet engine is installed)
+  candidates.ndjson.gz instead of the table for streaming runs: the full record of
+                       every resume, one JSON line each, in processing order
+  meta.json            ticket, requirements, summary and timings of the run
+  <section>.json.gz    detail sections (duplicate detection, stage 1 and 2
+                       results, full records of the finally selected candidates)
+  summary_report.txt   the human-readable report
+
+filtering_results/latest.json points at the newest complete run and carries
+the few fields status checks need. Runs are staged in a hidden folder and
+renamed into place, so readers never see half-written runs; only the newest
+RESUME_RESULTS_KEEP_RUNS runs (default 5) are kept.
+
+filtering_results/leaderboard.json is the ticket's live stage 1 shortlist: each
+filtering run seeds it and resumes uploaded afterwards are scored into it in the
+background, so the top candidates are available without a new run.
+"""
+
+import gzip
+import json
+import math
+import os
+import shutil
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: leaderboard updates are only serialized within the process
+    fcntl = None
+
+LATEST_FILENAME = 'latest.json'
+LEADERBOARD_FILENAME = 'leaderboard.json'
+STREAMED_CANDIDATES_FILENAME = 'candidates.ndjson.gz'
+RUNS_FOLDER = 'runs'
+DEFAULT_KEEP_RUNS = 5
+
+# Columns of the per-candidate table and their numpy dtypes ('U' = string)
+CANDIDATE_COLUMNS = {
+    'stage1_rank': 'i4',
+    'final_rank': 'i4',  # 0 = not among the finally selected candidates
+    'filename': 'U',
+    'file_path': 'U',
+    'final_score': 'f8',
+    'adjusted_score': 'f8',  # NaN = not scored by stage 2
+    'skill_score': 'f8',
+    'experience_score': 'f8',
+    'location_score': 'f8',
+    'professional_development_score': 'f8',
+    'similarity_score': 'f8',
+    'detected_experience_years': 'i4',
+    'matched_skills': 'U',  # JSON list
+    'has_duplicates': '?',
+    'duplicate_count': 'i4',
+    'professional_development_level': 'U',
+}
+
+# Detail sections stored as separate blobs
+DETAIL_SECTIONS = ['duplicate_detection', 'stage1_results', 'final_results', 'final_candidates']
+
+
+def parquet_available() -> bool:
+    """Whether pandas can write Parquet here (needs pyarrow or fastparquet)"""
+    for engine in ('pyarrow', 'fastparquet'):
+        try:
+            __import__(engine)
+            return True
+        except ImportError:
+            continue
+    return False
+
+
+def _candidate_row(rank: int, candidate: Dict) -> Dict:
+    adjusted = candidate.get('adjusted_score')
+    return {
+        'stage1_rank': rank,
+        'final_rank': candidate.get('final_rank', 0),
+        'filename': candidate['filename'],
+        'file_path': candidate.get('file_path', ''),
+        'final_score': candidate.get('final_score', 0.0),
+        'adjusted_score': float('nan') if adjusted is None else adjusted,
+        'skill_score': candidate.get('skill_score', 0.0),
+        'experience_score': candidate.get('experience_score', 0.0),
+        'location_score': candidate.get('location_score', 0.0),
+        'professional_development_score': candidate.get('professional_development_score', 0.0),
+        'similarity_score': candidate.get('similarity_score', 0.0),
+        'detected_experience_years': candidate.get('detected_experience_years', 0),
+        'matched_skills': json.dumps(candidate.get('matched_skills', [])),
+        'has_duplicates': bool(candidate.get('has_duplicates', False)),
+        'duplicate_count': candidate.get('duplicate_count', 0),
+        'professional_development_level':
+            candidate.get('professional_development', {}).get('professional_development_level', ''),
+    }
+
+
+def _decode_row(row: Dict) -> Dict:
+    """Table row back to the field types of a candidate record"""
+    # numpy scalars (pandas hands out strings as plain str already) to Python values
+    row = {name: value.item() if isinstance(value, np.generic) else value for name, value in row.items()}
+    if 'matched_skills' in row:
+        row['matched_skills'] = json.loads(row['matched_skills'])
+    if 'adjusted_score' in row and math.isnan(row['adjusted_score']):
+        row['adjusted_score'] = None
+    return row
+
+
+class FilteringResultsStore:
+    """Filtering runs of one ticket, stored under its filtering_results folder"""
+
+    def __init__(self, output_folder: Path, keep_runs: Optional[int] = None):
+        self.output_folder = Path(output_folder)
+        self.runs_folder = self.output_folder / RUNS_FOLDER
+        if keep_runs is None:
+            keep_runs = int(os.environ.get('RESUME_RESULTS_KEEP_RUNS') or DEFAULT_KEEP_RUNS)
+        self.keep_runs = max(1, keep_runs)
+
+    # -- writing ---------------------------------------------------------
+
+    def stage_run(self) -> Path:
+        """Create the hidden staging folder of a new run, for runs that stream files into it before save_run()"""
+        run_id = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+        staging = self.runs_folder / f".{run_id}.tmp"
+        staging.mkdir(parents=True)
+        return staging
+
+    def save_run(self, final_output: Dict, report_writer: Optional[Callable[[Path], None]] = None,
+                 staging: Optional[Path] = None) -> Path:
+        """Store a finished run, point latest at it and prune old runs; returns the run folder.
+
+        report_writer (if given) is called with the path the text report should be written to.
+        staging is a folder from stage_run() that already holds streamed candidates.
+        """
+        staging = staging or self.stage_run()
+        run_id = staging.name[1:-len('.tmp')]
+        try:
+            streamed = staging / STREAMED_CANDIDATES_FILENAME
+            if streamed.exists():
+                table_file = streamed
+            else:
+                table_file = self._write_table(staging, final_output.get('stage1_results', {}).get('all_resumes', []))
+            for section in DETAIL_SECTIONS:
+                if section == 'final_candidates':
+                    value = final_output.get('final_top_5', [])
+                else:
+                    value = final_output.get(section, {})
+                with gzip.open(staging / f"{section}.json.gz", 'wt', encoding='utf-8') as f:
+                    json.dump(value, f, separators=(',', ':'), default=str)
+            meta = {key: value for key, value in final_output.items()
+                    if key not in DETAIL_SECTIONS and key != 'final_top_5'}
+            meta.update(run_id=run_id, candidates_table=table_file.name)
+            with open(staging / 'meta.json', 'w') as f:
+                json.dump(meta, f, indent=2, default=str)
+            if report_writer is not None:
+                report_writer(staging / 'summary_report.txt')
+
+            run_folder = self.runs_folder / run_id
+            staging.rename(run_folder)
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        self._write_latest({
+            'run_id': run_id,
+            'run_folder': f"{RUNS_FOLDER}/{run_id}",
+            'ticket_id': final_output.get('ticket_id'),
+            'position': final_output.get('position'),
+            'timestamp': final_output.get('timestamp'),
+            'summary': final_output.get('summary', {}),
+            'top_candidates': len(final_output.get('final_top_5', [])),
+        })
+        self.apply_retention()
+        return run_folder
+
+    @staticmethod
+    def _write_table(folder: Path, candidates: List[Dict]) -> Path:
+        rows = [_candidate_row(rank, candidate) for rank, candidate in enumerate(candidates, 1)]
+        columns = {name: np.array([row[name] for row in rows], dtype=dtype if dtype != 'U' else str)
+                   for name, dtype in CANDIDATE_COLUMNS.items()}
+        if parquet_available():
+            import pandas as pd
+            path = folder / 'candidates.parquet'
+            pd.DataFrame(columns).to_parquet(path, index=False)
+        else:
+            path = folder / 'candidates.npz'
+            np.savez_compressed(path, **columns)
+        return path
+
+    def _write_latest(self, pointer: Dict):
+        path = self.output_folder / LATEST_FILENAME
+        tmp_path = path.with_name(path.name + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(pointer, f, indent=2, default=str)
+        tmp_path.replace(path)
+
+    def apply_retention(self):
+        """Delete all but the newest keep_runs runs, plus leftovers of runs that never completed"""
+        latest = (self.latest() or {}).get('run_id')
+        runs = sorted(path for path in self.runs_folder.glob('*') if path.is_dir() and not path.name.startswith('.'))
+        for path in runs[:-self.keep_runs]:
+            if path.name != latest:
+                shutil.rmtree(path, ignore_errors=True)
+        # Timestamped snapshots written before runs were stored here
+        for pattern in ('final_results_*.json', 'summary_report_*.txt'):
+            snapshots = sorted(self.output_folder.glob(pattern), key=lambda path: path.stat().st_mtime)
+            for path in snapshots[:-self.keep_runs]:
+                path.unlink()
+        # Staging folders of runs that crashed before being renamed into place (older than a day)
+        cutoff = datetime.now().timestamp() - 24 * 3600
+        for path in self.runs_folder.glob('.*.tmp'):
+            if path.stat().st_mtime < cutoff:
+                shutil.rmtree(path, ignore_errors=True)
+
+    # -- reading ---------------------------------------------------------
+
+    def latest(self) -> Optional[Dict]:
+        """The latest-run pointer, or None if no run was stored yet"""
+        try:
+            with open(self.output_folder / LATEST_FILENAME, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def run_folder(self, run_id: Optional[str] = None) -> Optional[Path]:
+        if run_id is None:
+            run_id = (self.latest() or {}).get('run_id')
+        if not run_id:
+            return None
+        folder = self.runs_folder / run_id
+        return folder if folder.is_dir() else None
+
+    def meta(self, run_id: Optional[str] = None) -> Optional[Dict]:
+        folder = self.run_folder(run_id)
+        if folder is None:
+            return None
+        with open(folder / 'meta.json', 'r') as f:
+            return json.load(f)
+
+    def section(self, name: str, run_id: Optional[str] = None):
+        """One detail section of a run (None if the run does not exist)"""
+        if name not in DETAIL_SECTIONS:
+            raise ValueError(f"Unknown section '{name}'. Valid sections: {', '.join(DETAIL_SECTIONS)}")
+        folder = self.run_folder(run_id)
+        if folder is None:
+            return None
+        with gzip.open(folder / f"{name}.json.gz", 'rt', encoding='utf-8') as f:
+            return json.load(f)
+
+    def report_path(self, run_id: Optional[str] = None) -> Optional[Path]:
+        folder = self.run_folder(run_id)
+        path = folder / 'summary_report.txt' if folder is not None else None
+        return path if path is not None and path.exists() else None
+
+    def candidates(self, columns: Optional[Sequence[str]] = None, max_final_rank: Optional[int] = None,
+                   run_id: Optional[str] = None) -> List[Dict]:
+        """Rows of the candidate table in stage 1 order, reading only the given columns.
+
+        max_final_rank keeps only finally selected candidates ranked 1..max_final_rank,
+        ordered by that rank.
+        """
+        folder = self.run_folder(run_id)
+        if folder is None:
+            return []
+        columns = list(columns or CANDIDATE_COLUMNS)
+        unknown = set(columns) - set(CANDIDATE_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown column(s): {', '.join(sorted(unknown))}")
+        read_columns = columns if max_final_rank is None or 'final_rank' in columns else columns + ['final_rank']
+
+        streamed = folder / STREAMED_CANDIDATES_FILENAME
+        parquet_file = folder / 'candidates.parquet'
+        if streamed.exists():
+            return self._streamed_candidates(folder, columns, max_final_rank, run_id)
+        if parquet_file.exists():
+            import pandas as pd
+            filters = [('final_rank', '>', 0), ('final_rank', '<=', max_final_rank)] \
+                if max_final_rank is not None else None
+            frame = pd.read_parquet(parquet_file, columns=read_columns, filters=filters)
+            data = {name: frame[name].to_numpy() for name in read_columns}
+        else:
+            with np.load(folder / 'candidates.npz', allow_pickle=False) as stored:
+                data = {name: stored[name] for name in read_columns}
+            if max_final_rank is not None:
+                keep = (data['final_rank'] > 0) & (data['final_rank'] <= max_final_rank)
+                data = {name: values[keep] for name, values in data.items()}
+
+        order = np.argsort(data['final_rank'], kind='stable') if max_final_rank is not None \
+            else np.arange(len(data[read_columns[0]]))
+        return [_decode_row({name: data[name][i] for name in columns}) for i in order]
+
+    def _streamed_candidates(self, folder: Path, columns: List[str], max_final_rank: Optional[int],
+                             run_id: Optional[str]) -> List[Dict]:
+        """candidates() for a streaming run, reading its NDJSON one line at a time.
+
+        Rows are per resume in processing order (stage1_rank is that position); the
+        finally selected ones carry their merged, stage 2 scored record.
+        """
+        selected = {candidate['filename']: candidate for candidate in self.section('final_candidates', run_id) or []}
+        rows = []
+        with gzip.open(folder / STREAMED_CANDIDATES_FILENAME, 'rt', encoding='utf-8') as f:
+            for rank, line in enumerate(f, 1):
+                candidate = json.loads(line)
+                candidate = selected.get(candidate['filename'], candidate)
+                if max_final_rank is not None and not 0 < candidate.get('final_rank', 0) <= max_final_rank:
+                    continue
+                row = _candidate_row(rank, candidate)
+                rows.append((row['final_rank'], _decode_row({name: row[name] for name in columns})))
+        if max_final_rank is not None:
+            rows.sort(key=lambda item: item[0])
+        return [row for _, row in rows]
+
+    def top_candidates(self, top_n: int, run_id: Optional[str] = None) -> List[Dict]:
+        """Full records of the finally selected candidates, best first"""
+        selected = self.section('final_candidates', run_id) or []
+        return selected[:top_n]
+
+
+class TicketLeaderboard:
+    """The persisted shortlist of a ticket, kept current between filtering runs.
+
+    The stored document holds the stage 1 shortlist (best final_score first, each
+    entry with the identifiers of its submissions for duplicate checks), the
+    stage 2 top candidates derived from it, the requirements signature it was
+    scored under and the size and mtime of every resume file it covers.
+    """
+
+    _locks: Dict[str, threading.Lock] = {}
+    _locks_guard = threading.Lock()
+
+    def __init__(self, output_folder: Path):
+        self.output_folder = Path(output_folder)
+        self.path = self.output_folder / LEADERBOARD_FILENAME
+
+    @contextmanager
+    def locked(self) -> Iterator[None]:
+        """Serialize read-modify-write cycles on this ticket's leaderboard across threads and processes.
+
+        Processes (API workers, batch runs) take an exclusive flock on leaderboard.json.lock,
+        which the OS releases if the holder dies; threads of one process queue on a lock first.
+        """
+        key = str(self.path.resolve())
+        with self._locks_guard:
+            lock = self._locks.setdefault(key, threading.Lock())
+        with lock:
+            if fcntl is None:
+                yield
+                return
+            self.output_folder.mkdir(parents=True, exist_ok=True)
+            with open(self.path.with_name(self.path.name + '.lock'), 'a') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def load(self) -> Optional[Dict]:
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def current(self) -> Optional[Dict]:
+        """The leaderboard if it still reflects the ticket's requirements and resumes, else None"""
+        leaderboard = self.load()
+        if leaderboard is None or leaderboard.get('stale'):
+            return None
+        return leaderboard
+
+    def save(self, leaderboard: Dict):
+        self.output_folder.mkdir(parents=True, exist_ok=True)
+        leaderboard['updated_at'] = datetime.now().isoformat()
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(leaderboard, f, separators=(',', ':'), default=str)
+        tmp_path.replace(self.path)
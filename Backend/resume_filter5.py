@@ -2,94 +2,684 @@
 # All LLM dependencies removed, using only rule-based scoring
 
 import os
+import copy
 import json
-import PyPDF2
-from docx import Document
+import logging
+import pickle
+import threading
 import numpy as np
-from typing import List, Dict, Tuple, Optional, Any, Set
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import spacy
+from typing import Callable, List, Dict, Tuple, Optional, Any, Set, Union
 from datetime import datetime
-import pandas as pd
 from pathlib import Path
 import re
+import bisect
 import hashlib
+import heapq
 import time
+import sqlite3
 from difflib import SequenceMatcher
 from collections import defaultdict
+from concurrent.futures import Executor, ProcessPoolExecutor
+import multiprocessing
 # import phonenumbers  # Not used, removed to avoid import issues
 from fuzzywuzzy import fuzz
 import jellyfish
 
+from experience_timeline import ExperienceTimelineExtractor
+from extraction_engine import ExtractionResult, get_extraction_engine
+from feature_matrix import CASCADE_COLUMNS, FEATURE_COLUMNS, FEATURE_MATRIX_FILENAME, FeatureMatrix
+from filtering_metrics import FilteringMetrics, RunProfile, RunProfiler
+from minhash_lsh import LSHIndex, MinHasher
+from model_registry import get_spacy_model
+from pattern_matcher import MultiPatternMatcher
+from results_store import FilteringResultsStore, TicketLeaderboard
+from skill_taxonomy import get_skill_taxonomy
+
 # No need for OpenAI or AutoGen imports anymore
 # Configuration simplified - no API keys needed
 
-class ResumeExtractor:
-    """Extract text from various resume formats"""
+logger = logging.getLogger(__name__)
+
+# Bump whenever text extraction or ParsedResume parsing changes so that
+# previously cached extraction results are invalidated.
+EXTRACTOR_VERSION = "1"
+
+
+def extractor_version() -> str:
+    """EXTRACTOR_VERSION plus the extraction backends and page limit in use, which also change the text"""
+    return f"{EXTRACTOR_VERSION}|{get_extraction_engine().signature()}"
+
+# Bump whenever per-resume scoring changes so that incremental runs re-score
+# every resume instead of reusing results from the previous run.
+SCORING_VERSION = "6"
+
+# Candidates stage 1 hands to stage 2; the scoring cascade only completes the
+# expensive stages for candidates that can still make this shortlist
+STAGE1_SHORTLIST = 10
+
+
+class ExtractionCache:
+    """Disk-backed cache of extracted resume text keyed by file SHA-256.
+    
+    Entries are stamped with extractor_version() and evicted least recently used
+    first once the cache grows past max_bytes. A new SQLite connection is opened
+    per operation so the cache is safe to share between threads and worker
+    processes.
+    """
+    
+    DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+    
+    def __init__(self, db_path: str, max_bytes: int = DEFAULT_MAX_BYTES, version: Optional[str] = None):
+        self.db_path = Path(db_path)
+        self.max_bytes = max_bytes
+        self.version = version or extractor_version()
+        self.hits = 0
+        self.misses = 0
+        self._initialized = False
+    
+    @classmethod
+    def for_ticket_folder(cls, ticket_folder: Path) -> 'ExtractionCache':
+        """Default cache shared by every ticket folder under the same storage root"""
+        db_path = os.environ.get('RESUME_CACHE_PATH') or \
+            Path(ticket_folder).parent / '.resume_cache' / 'extracted_text.sqlite3'
+        max_mb = os.environ.get('RESUME_CACHE_MAX_MB')
+        max_bytes = int(max_mb) * 1024 * 1024 if max_mb else cls.DEFAULT_MAX_BYTES
+        return cls(db_path, max_bytes=max_bytes)
+    
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_initialized'] = False
+        return state
     
     @staticmethod
-    def extract_text_from_pdf(file_path: str) -> str:
-        """Extract text from PDF file"""
+    def file_digest(file_path: Path) -> str:
+        """SHA-256 of the file contents"""
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+    
+    def _connect(self) -> sqlite3.Connection:
+        if not self._initialized:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_path), timeout=30)
+        if not self._initialized:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS extracted_text (
+                    sha256 TEXT PRIMARY KEY,
+                    version TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    features TEXT,
+                    size INTEGER NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_extracted_text_last_access "
+                         "ON extracted_text(last_access)")
+            # Entries written by another extractor version can never be hit again
+            conn.execute("DELETE FROM extracted_text WHERE version != ?", (self.version,))
+            conn.commit()
+            self._initialized = True
+        return conn
+    
+    def get(self, sha256: str) -> Optional[Tuple[str, Optional[Dict]]]:
+        """Return (text, features) for a digest, or None on a miss"""
         try:
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-                return text
-        except Exception as e:
-            print(f"Error reading PDF {file_path}: {e}")
-            return ""
+            conn = self._connect()
+            try:
+                row = conn.execute(
+                    "SELECT text, features FROM extracted_text WHERE sha256 = ? AND version = ?",
+                    (sha256, self.version)
+                ).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+                conn.execute("UPDATE extracted_text SET last_access = ? WHERE sha256 = ?",
+                             (time.time(), sha256))
+                conn.commit()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"⚠️ Extraction cache read failed: {e}")
+            return None
+        
+        self.hits += 1
+        text, features = row
+        return text, json.loads(features) if features else None
+    
+    def put(self, sha256: str, text: str, features: Optional[Dict] = None):
+        """Store extracted text (and parsed features) and evict old entries if needed"""
+        features_json = json.dumps(features) if features is not None else None
+        size = len(text.encode('utf-8')) + (len(features_json) if features_json else 0)
+        try:
+            conn = self._connect()
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO extracted_text (sha256, version, text, features, size, last_access) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (sha256, self.version, text, features_json, size, time.time())
+                )
+                self._evict(conn)
+                conn.commit()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"⚠️ Extraction cache write failed: {e}")
+    
+    def _evict(self, conn: sqlite3.Connection):
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM extracted_text").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        
+        rows = conn.execute("SELECT sha256, size FROM extracted_text ORDER BY last_access ASC").fetchall()
+        stale = []
+        for sha256, size in rows:
+            if total <= self.max_bytes:
+                break
+            stale.append((sha256,))
+            total -= size
+        conn.executemany("DELETE FROM extracted_text WHERE sha256 = ?", stale)
+
+
+class CandidateIdentityIndex:
+    """Persistent candidate identity index shared by every ticket under a storage root.
+    
+    Normalized emails, phones, GitHub and LinkedIn handles and content hashes map
+    to a stable identity ID, and every ticket submission is recorded against its
+    identity, so upload-time and filtering-time deduplication and cross-posting
+    detection are key lookups. Uses the same connection-per-operation SQLite
+    pattern as ExtractionCache.
+    """
+    
+    EMPTY_CONTENT_HASH = hashlib.md5(b'').hexdigest()
+    
+    def __init__(self, db_path: str, storage_root: Optional[str] = None):
+        self.db_path = Path(db_path)
+        self.storage_root = Path(storage_root) if storage_root else None
+        self._initialized = False
+    
+    @classmethod
+    def for_storage_root(cls, storage_root: str) -> 'CandidateIdentityIndex':
+        """Default index for every ticket folder under storage_root (e.g. approved_tickets/)"""
+        db_path = os.environ.get('RESUME_IDENTITY_INDEX_PATH') or \
+            Path(storage_root) / '.resume_cache' / 'identity_index.sqlite3'
+        return cls(db_path, storage_root=storage_root)
+    
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_initialized'] = False
+        return state
     
     @staticmethod
-    def extract_text_from_docx(file_path: str) -> str:
-        """Extract text from DOCX file"""
+    def ticket_id_for_folder(ticket_folder: Union[str, Path]) -> str:
+        """Ticket ID of a ticket folder named <ticket_id>_<subject>"""
+        return Path(ticket_folder).name.split('_', 1)[0]
+    
+    @classmethod
+    def identity_keys(cls, identifiers: Dict) -> List[str]:
+        """Identity keys of a submission, strongest first"""
+        keys = [f"email:{email.strip().lower()}" for email in sorted(identifiers.get('emails', [])) if email.strip()]
+        keys.extend(f"phone:{phone}" for phone in sorted(identifiers.get('phones', [])))
+        if identifiers.get('github'):
+            keys.append(f"github:{identifiers['github'].lower()}")
+        if identifiers.get('linkedin'):
+            keys.append(f"linkedin:{identifiers['linkedin'].lower()}")
+        if identifiers.get('content_hash') and identifiers['content_hash'] != cls.EMPTY_CONTENT_HASH:
+            keys.append(f"content:{identifiers['content_hash']}")
+        return keys
+    
+    def _connect(self) -> sqlite3.Connection:
+        if not self._initialized:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_path), timeout=30)
+        if not self._initialized:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS identity_keys (
+                    key TEXT PRIMARY KEY,
+                    identity_id TEXT NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS submissions (
+                    ticket_id TEXT NOT NULL,
+                    filename TEXT NOT NULL,
+                    identity_id TEXT NOT NULL,
+                    registered_at REAL NOT NULL,
+                    PRIMARY KEY (ticket_id, filename)
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_submissions_identity ON submissions(identity_id)")
+            conn.commit()
+            self._initialized = True
+            
+            if self.storage_root and conn.execute("SELECT COUNT(*) FROM submissions").fetchone()[0] == 0:
+                self._backfill(conn)
+        return conn
+    
+    def _backfill(self, conn: sqlite3.Connection):
+        """Seed a new index from the stage 1 results of tickets filtered before it existed"""
+        for stage1_file in self.storage_root.glob('*/filtering_results/stage1_results.json'):
+            try:
+                with open(stage1_file, 'r') as f:
+                    file_index = json.load(f).get('file_index') or {}
+            except (OSError, ValueError):
+                continue
+            
+            ticket_id = self.ticket_id_for_folder(stage1_file.parent.parent)
+            for filename, entry in file_index.items():
+                if entry.get('identifiers'):
+                    self._register(conn, ticket_id, filename, entry['identifiers'])
+        conn.commit()
+    
+    def _resolve(self, conn: sqlite3.Connection, keys: List[str]) -> Optional[str]:
+        """Identity owning any of keys (strongest key wins), creating one if none does.
+        
+        Keys owned by several identities prove they are one candidate, so the others
+        are merged into the strongest key's identity along with their submissions.
+        """
+        if not keys:
+            return None
+        
+        placeholders = ', '.join('?' * len(keys))
+        known = dict(conn.execute(
+            f"SELECT key, identity_id FROM identity_keys WHERE key IN ({placeholders})", keys
+        ).fetchall())
+        
+        identity_id = next((known[key] for key in keys if key in known), None)
+        if identity_id is None:
+            identity_id = 'cand_' + hashlib.sha1(keys[0].encode('utf-8')).hexdigest()[:12]
+        merged = sorted(set(known.values()) - {identity_id})
+        if merged:
+            placeholders = ', '.join('?' * len(merged))
+            conn.execute(f"UPDATE identity_keys SET identity_id = ? WHERE identity_id IN ({placeholders})",
+                         [identity_id] + merged)
+            conn.execute(f"UPDATE submissions SET identity_id = ? WHERE identity_id IN ({placeholders})",
+                         [identity_id] + merged)
+        conn.executemany("INSERT OR IGNORE INTO identity_keys (key, identity_id) VALUES (?, ?)",
+                         [(key, identity_id) for key in keys if key not in known])
+        return identity_id
+    
+    def _register(self, conn: sqlite3.Connection, ticket_id: str, filename: str, identifiers: Dict) -> Optional[str]:
+        identity_id = self._resolve(conn, self.identity_keys(identifiers))
+        if identity_id is not None:
+            conn.execute(
+                "INSERT OR REPLACE INTO submissions (ticket_id, filename, identity_id, registered_at) "
+                "VALUES (?, ?, ?, ?)",
+                (ticket_id, filename, identity_id, time.time())
+            )
+        return identity_id
+    
+    def register(self, ticket_id: str, filename: str, identifiers: Dict) -> Optional[str]:
+        """Record one submission and return its identity ID (None if it has no identity keys)"""
         try:
-            doc = Document(file_path)
-            text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
-            return text
-        except Exception as e:
-            print(f"Error reading DOCX {file_path}: {e}")
-            return ""
+            conn = self._connect()
+            try:
+                identity_id = self._register(conn, ticket_id, filename, identifiers)
+                conn.commit()
+                return identity_id
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"⚠️ Identity index write failed: {e}")
+            return None
+    
+    def register_ticket(self, ticket_id: str, submissions: List[Tuple[str, Dict]],
+                        complete: bool = True) -> Dict[str, Optional[str]]:
+        """Record every current submission of a ticket, dropping ones whose files are gone.
+        
+        complete=False records one batch of a ticket's submissions and leaves the others alone.
+        """
+        identity_ids = {}
+        try:
+            conn = self._connect()
+            try:
+                for filename, identifiers in submissions:
+                    identity_ids[filename] = self._register(conn, ticket_id, filename, identifiers)
+                if complete:
+                    self._forget_missing(conn, ticket_id, set(identity_ids))
+                conn.commit()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"⚠️ Identity index write failed: {e}")
+        return identity_ids
     
     @staticmethod
-    def extract_text(file_path: Path) -> str:
-        """Extract text from resume file"""
-        file_path_str = str(file_path)
-        
-        if file_path.suffix.lower() == '.pdf':
-            return ResumeExtractor.extract_text_from_pdf(file_path_str)
-        elif file_path.suffix.lower() in ['.docx', '.doc']:
-            return ResumeExtractor.extract_text_from_docx(file_path_str)
-        elif file_path.suffix.lower() == '.txt':
-            with open(file_path_str, 'r', encoding='utf-8') as f:
-                return f.read()
+    def _forget_missing(conn: sqlite3.Connection, ticket_id: str, current: Set[str]):
+        stale = [(ticket_id, filename) for (filename,) in conn.execute(
+            "SELECT filename FROM submissions WHERE ticket_id = ?", (ticket_id,)
+        ).fetchall() if filename not in current]
+        conn.executemany("DELETE FROM submissions WHERE ticket_id = ? AND filename = ?", stale)
+    
+    def forget_missing(self, ticket_id: str, current: Set[str]):
+        """Drop a ticket's recorded submissions whose filenames are not in current"""
+        try:
+            conn = self._connect()
+            try:
+                self._forget_missing(conn, ticket_id, current)
+                conn.commit()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"⚠️ Identity index write failed: {e}")
+    
+    def ticket_duplicate_groups(self, ticket_id: str) -> List[List[str]]:
+        """Filenames of each identity with several submissions to the ticket"""
+        try:
+            conn = self._connect()
+            try:
+                rows = conn.execute(
+                    "SELECT identity_id, filename FROM submissions WHERE ticket_id = ? AND identity_id IN "
+                    "(SELECT identity_id FROM submissions WHERE ticket_id = ? GROUP BY identity_id HAVING COUNT(*) > 1) "
+                    "ORDER BY identity_id, registered_at, filename",
+                    (ticket_id, ticket_id)
+                ).fetchall()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"⚠️ Identity index read failed: {e}")
+            return []
+        
+        groups = defaultdict(list)
+        for identity_id, filename in rows:
+            groups[identity_id].append(filename)
+        return list(groups.values())
+    
+    def lookup(self, identifiers: Dict) -> Optional[str]:
+        """Identity ID of a submission without recording it"""
+        keys = self.identity_keys(identifiers)
+        if not keys:
+            return None
+        try:
+            conn = self._connect()
+            try:
+                placeholders = ', '.join('?' * len(keys))
+                known = dict(conn.execute(
+                    f"SELECT key, identity_id FROM identity_keys WHERE key IN ({placeholders})", keys
+                ).fetchall())
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"⚠️ Identity index read failed: {e}")
+            return None
+        return next((known[key] for key in keys if key in known), None)
+    
+    def applications(self, identity_ids: List[str]) -> Dict[str, List[Dict]]:
+        """Every recorded submission for each identity"""
+        identity_ids = [identity_id for identity_id in set(identity_ids) if identity_id]
+        results = {identity_id: [] for identity_id in identity_ids}
+        if not identity_ids:
+            return results
+        try:
+            conn = self._connect()
+            try:
+                placeholders = ', '.join('?' * len(identity_ids))
+                rows = conn.execute(
+                    f"SELECT identity_id, ticket_id, filename FROM submissions "
+                    f"WHERE identity_id IN ({placeholders}) ORDER BY registered_at, ticket_id, filename",
+                    identity_ids
+                ).fetchall()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"⚠️ Identity index read failed: {e}")
+            return results
+        
+        for identity_id, ticket_id, filename in rows:
+            results[identity_id].append({'ticket_id': ticket_id, 'filename': filename})
+        return results
+    
+    def ticket_cross_applications(self, ticket_id: str) -> List[Dict]:
+        """Submissions of a ticket whose candidate also applied to other tickets"""
+        try:
+            conn = self._connect()
+            try:
+                rows = conn.execute(
+                    "SELECT filename, identity_id FROM submissions WHERE ticket_id = ? ORDER BY filename",
+                    (ticket_id,)
+                ).fetchall()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"⚠️ Identity index read failed: {e}")
+            return []
+        
+        applications = self.applications([identity_id for _, identity_id in rows])
+        results = []
+        for filename, identity_id in rows:
+            others = [app for app in applications.get(identity_id, []) if app['ticket_id'] != ticket_id]
+            if others:
+                results.append({'filename': filename, 'identity_id': identity_id, 'other_applications': others})
+        return results
+
+
+class ResumeExtractor:
+    """Extract text from various resume formats"""
+    
+    @staticmethod
+    def _read_file(file_path: Path, stats: Optional[Dict] = None) -> str:
+        """Extract text from resume file without consulting any cache.
+        
+        Goes through the extraction engine, so every file is bounded by its
+        timeout, page and memory limits; stats (if given) receives the timings.
+        """
+        result: ExtractionResult = get_extraction_engine().extract(file_path)
+        if result.error:
+            print(f"Error reading {file_path.name}: {result.error}")
+        if stats is not None:
+            stats.update(result.to_dict(), cached=False)
+        return result.text
+    
+    @staticmethod
+    def extract_text(file_path: Path, cache: Optional[ExtractionCache] = None) -> str:
+        """Extract text from resume file, consulting the extraction cache first"""
+        if cache is None:
+            return ResumeExtractor._read_file(file_path)
+        
+        digest = cache.file_digest(file_path)
+        entry = cache.get(digest)
+        if entry is not None:
+            return entry[0]
+        
+        text = ResumeExtractor._read_file(file_path)
+        if text:
+            cache.put(digest, text)
+        return text
+    
+    @staticmethod
+    def extract_parsed(file_path: Path, cache: Optional[ExtractionCache] = None,
+                       stats: Optional[Dict] = None) -> Optional['ParsedResume']:
+        """Extract and parse a resume file, or return None if it has no text; stats receives extraction timings"""
+        if cache is None:
+            text = ResumeExtractor._read_file(file_path, stats)
+            return ParsedResume(text) if text else None
+        
+        start = time.perf_counter()
+        digest = cache.file_digest(file_path)
+        entry = cache.get(digest)
+        if entry is not None:
+            text, features = entry
+            if stats is not None:
+                stats.update(seconds=round(time.perf_counter() - start, 4), cached=True)
+            if features is not None:
+                return ParsedResume.from_features(text, features)
         else:
-            return ""
+            text = ResumeExtractor._read_file(file_path, stats)
+        
+        if not text:
+            return None
+        
+        parsed = ParsedResume(text)
+        cache.put(digest, text, parsed.to_features())
+        return parsed
 
 
-class DuplicateCandidateDetector:
-    """Advanced duplicate candidate detection system"""
+class ParsedResume:
+    """Resume text parsed once per file and shared by every scorer"""
+    
+    SECTION_KEYWORDS = {
+        'education': ['education', 'academic', 'qualification'],
+        'experience': ['experience', 'employment', 'work history'],
+        'skills': ['skills', 'technologies', 'competencies'],
+    }
+    SECTION_BREAK_KEYWORDS = ['experience', 'education', 'skills', 'projects', 'summary', 'objective']
+    YEAR_PATTERN = re.compile(r'\b(?:19|20)\d{2}\b')
+    
+    def __init__(self, text: str):
+        self.text = text
+        self.lower = text.lower()
+        self.lines = text.split('\n')
+        self.lower_lines = self.lower.split('\n')
+        self.sections = {
+            name: self.extract_section(keywords)
+            for name, keywords in self.SECTION_KEYWORDS.items()
+        }
+        # Sorted (offset, year) pairs for every 4-digit year token in the lowercase text
+        self.year_positions = [(m.start(), int(m.group())) for m in self.YEAR_PATTERN.finditer(self.lower)]
+    
+    @classmethod
+    def ensure(cls, resume: Union[str, 'ParsedResume']) -> 'ParsedResume':
+        """Return resume as a ParsedResume, parsing raw text if needed"""
+        return resume if isinstance(resume, cls) else cls(resume)
+    
+    @classmethod
+    def from_features(cls, text: str, features: Dict) -> 'ParsedResume':
+        """Rebuild a ParsedResume from cached features without re-segmenting the text"""
+        parsed = cls.__new__(cls)
+        parsed.text = text
+        parsed.lower = text.lower()
+        parsed.lines = text.split('\n')
+        parsed.lower_lines = parsed.lower.split('\n')
+        parsed.sections = features['sections']
+        parsed.year_positions = [tuple(item) for item in features['year_positions']]
+        return parsed
+    
+    def to_features(self) -> Dict:
+        """Derived features worth persisting alongside the extracted text"""
+        return {
+            'sections': self.sections,
+            'year_positions': self.year_positions
+        }
+    
+    def extract_section(self, section_keywords: List[str]) -> str:
+        """Extract a section from resume based on keywords"""
+        section_start = -1
+        section_lines = []
+        
+        for i, line_lower in enumerate(self.lower_lines):
+            if any(keyword in line_lower for keyword in section_keywords):
+                section_start = i
+                continue
+            
+            if section_start >= 0:
+                if any(keyword in line_lower for keyword in self.SECTION_BREAK_KEYWORDS):
+                    if not any(keyword in line_lower for keyword in section_keywords):
+                        break
+                
+                section_lines.append(self.lines[i])
+        
+        return '\n'.join(section_lines)
+
+
+class DisjointSet:
+    """Union-find over hashable items (path halving, union by size)"""
     
     def __init__(self):
+        self.parent = {}
+        self.size = {}
+    
+    def add(self, item):
+        if item not in self.parent:
+            self.parent[item] = item
+            self.size[item] = 1
+    
+    def find(self, item):
+        parent = self.parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+    
+    def union(self, item1, item2):
+        root1, root2 = self.find(item1), self.find(item2)
+        if root1 == root2:
+            return root1
+        if self.size[root1] < self.size[root2]:
+            root1, root2 = root2, root1
+        self.parent[root2] = root1
+        self.size[root1] += self.size[root2]
+        return root1
+    
+    def groups(self) -> List[List]:
+        """All sets, each in insertion order, ordered by their first-added member"""
+        components = {}
+        for item in self.parent:
+            components.setdefault(self.find(item), []).append(item)
+        return list(components.values())
+
+
+class DuplicateCandidateDetector:
+    """Advanced duplicate candidate detection system
+    
+    Without an email or phone hit, a new candidate is only compared against
+    candidates it shares a block with: an exact blocking key (GitHub, LinkedIn,
+    content hash, education + experience hash, or a normalized name when both
+    sections are empty) or an LSH bucket of its content MinHash. The exact keys
+    cover every rule in is_duplicate except near-identical content, which is
+    what LSH finds. lsh_threshold trades recall for precision for that rule;
+    blocking=False compares against every candidate instead.
+    
+    email_to_id and phone_to_id only hold the candidates added since reset():
+    confirming a match needs the other candidate's full identifiers, which the
+    persistent CandidateIdentityIndex does not keep, so identity across runs and
+    tickets is resolved by that index instead.
+    """
+    
+    # Hash of an empty education/experience section; every resume without those sections shares it
+    EMPTY_SECTION_HASH = hashlib.md5(b'').hexdigest()[:16]
+    EMPTY_CONTENT_HASH = hashlib.md5(b'').hexdigest()
+    
+    def __init__(self, blocking: bool = True, lsh_threshold: Optional[float] = None, num_perm: int = 128):
+        if lsh_threshold is None:
+            lsh_threshold = float(os.environ.get('RESUME_DUPLICATE_LSH_THRESHOLD', 0.85))
+        self.blocking = blocking
+        self.lsh_threshold = lsh_threshold
+        self.minhasher = MinHasher(num_perm)
+        self.reset()
+    
+    def reset(self):
+        """Forget every candidate added so far"""
         self.candidates_db = {}
         self.email_to_id = {}
         self.phone_to_id = {}
         self.name_variations = defaultdict(set)
-        
-    def extract_candidate_identifiers(self, resume_text: str, filename: str) -> Dict:
+        self.lsh_index = LSHIndex(self.minhasher.num_perm, self.lsh_threshold)
+        self.blocking_index = defaultdict(list)
+        self.insertion_order = {}
+        self.comparisons = 0
+        # Duplicate groups, fed by every positive is_duplicate decision and every shared identity key
+        self.groups = DisjointSet()
+        self.identity_index = {}
+        
+    def extract_candidate_identifiers(self, resume: Union[str, ParsedResume], filename: str) -> Dict:
         """Extract all possible identifiers from resume"""
+        parsed = ParsedResume.ensure(resume)
+        content = self._normalized_content(parsed)
         identifiers = {
             'filename': filename,
-            'emails': self._extract_emails(resume_text),
-            'phones': self._extract_phones(resume_text),
-            'names': self._extract_names(resume_text),
-            'github': self._extract_github(resume_text),
-            'linkedin': self._extract_linkedin(resume_text),
-            'content_hash': self._generate_content_hash(resume_text),
-            'education_hash': self._generate_education_hash(resume_text),
-            'experience_hash': self._generate_experience_hash(resume_text)
+            'emails': self._extract_emails(parsed.text),
+            'phones': self._extract_phones(parsed.text),
+            'names': self._extract_names(parsed),
+            'github': self._extract_github(parsed.text),
+            'linkedin': self._extract_linkedin(parsed.text),
+            'content_hash': self._generate_content_hash(content),
+            'content_minhash': MinHasher.to_hex(self.minhasher.signature(content)),
+            'education_hash': self._generate_education_hash(parsed),
+            'experience_hash': self._generate_experience_hash(parsed)
         }
         return identifiers
     
@@ -132,15 +722,14 @@ class DuplicateCandidateDetector:
         
         return list(set(phones))
     
-    def _extract_names(self, text: str) -> List[str]:
+    def _extract_names(self, parsed: ParsedResume) -> List[str]:
         """Extract potential names from resume"""
         names = []
         
-        lines = text.split('\n')
-        for i, line in enumerate(lines[:10]):
+        for line, line_lower in zip(parsed.lines[:10], parsed.lower_lines[:10]):
             line = line.strip()
             
-            if not line or any(keyword in line.lower() for keyword in 
+            if not line or any(keyword in line_lower for keyword in 
                              ['resume', 'curriculum', 'cv', 'objective', 'summary']):
                 continue
             
@@ -150,7 +739,7 @@ class DuplicateCandidateDetector:
                     names.append(line)
         
         name_pattern = r'(?:Name|NAME|name)\s*[:|-]?\s*([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)'
-        name_matches = re.findall(name_pattern, text)
+        name_matches = re.findall(name_pattern, parsed.text)
         names.extend(name_matches)
         
         return list(set(names))
@@ -182,22 +771,24 @@ class DuplicateCandidateDetector:
                 return match.group(1).lower()
         return None
     
-    def _generate_content_hash(self, text: str) -> str:
-        """Generate hash of key content"""
-        lines = text.split('\n')
+    def _normalized_content(self, parsed: ParsedResume) -> str:
+        """Resume body without the header, contact details and whitespace differences"""
+        lines = parsed.lines
         content_lines = lines[5:] if len(lines) > 5 else lines
         
         content = '\n'.join(content_lines)
         content = re.sub(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', '', content)
         content = re.sub(r'\+?1?\s*\(?(\d{3})\)?[\s.-]?(\d{3})[\s.-]?(\d{4})', '', content)
         
-        content = ' '.join(content.split())
-        
+        return ' '.join(content.split())
+    
+    def _generate_content_hash(self, content: str) -> str:
+        """Generate hash of key content"""
         return hashlib.md5(content.encode()).hexdigest()
     
-    def _generate_education_hash(self, text: str) -> str:
+    def _generate_education_hash(self, parsed: ParsedResume) -> str:
         """Generate hash based on education details"""
-        education_section = self._extract_section(text, ['education', 'academic', 'qualification'])
+        education_section = parsed.sections['education']
         
         degree_patterns = [
             r'(B\.?S\.?|B\.?Sc\.?|Bachelor|B\.?Tech|B\.?E\.?)',
@@ -215,9 +806,9 @@ class DuplicateCandidateDetector:
         edu_string = ' '.join(sorted(degrees + years))
         return hashlib.md5(edu_string.encode()).hexdigest()[:16]
     
-    def _generate_experience_hash(self, text: str) -> str:
+    def _generate_experience_hash(self, parsed: ParsedResume) -> str:
         """Generate hash based on work experience"""
-        experience_section = self._extract_section(text, ['experience', 'employment', 'work history'])
+        experience_section = parsed.sections['experience']
         
         companies = re.findall(r'\b([A-Z][a-zA-Z]+(?:\s+[A-Z][a-zA-Z]+)*)\b', experience_section)
         years = re.findall(r'\b(19\d{2}|20\d{2})\b', experience_section)
@@ -228,29 +819,6 @@ class DuplicateCandidateDetector:
         exp_string = ' '.join(sorted(companies[:5] + years + techs_found))
         return hashlib.md5(exp_string.encode()).hexdigest()[:16]
     
-    def _extract_section(self, text: str, section_keywords: List[str]) -> str:
-        """Extract a section from resume based on keywords"""
-        lines = text.split('\n')
-        section_start = -1
-        section_lines = []
-        
-        for i, line in enumerate(lines):
-            line_lower = line.lower()
-            
-            if any(keyword in line_lower for keyword in section_keywords):
-                section_start = i
-                continue
-            
-            if section_start >= 0:
-                if any(keyword in line_lower for keyword in 
-                      ['experience', 'education', 'skills', 'projects', 'summary', 'objective']):
-                    if not any(keyword in line_lower for keyword in section_keywords):
-                        break
-                
-                section_lines.append(line)
-        
-        return '\n'.join(section_lines)
-    
     def calculate_similarity_score(self, id1: Dict, id2: Dict) -> Dict[str, float]:
         """Calculate similarity scores between two candidates"""
         scores = {
@@ -261,7 +829,8 @@ class DuplicateCandidateDetector:
             'linkedin_match': 0.0,
             'content_similarity': 0.0,
             'education_match': 0.0,
-            'experience_match': 0.0
+            'experience_match': 0.0,
+            'content_jaccard': 0.0
         }
         
         if id1['emails'] and id2['emails']:
@@ -306,6 +875,11 @@ class DuplicateCandidateDetector:
         if id1['experience_hash'] == id2['experience_hash']:
             scores['experience_match'] = 0.8
         
+        if id1.get('content_minhash') and id2.get('content_minhash'):
+            scores['content_jaccard'] = MinHasher.jaccard(
+                MinHasher.from_hex(id1['content_minhash']), MinHasher.from_hex(id2['content_minhash'])
+            )
+        
         return scores
     
     def is_duplicate(self, scores: Dict[str, float]) -> Tuple[bool, float, str]:
@@ -341,12 +915,19 @@ class DuplicateCandidateDetector:
         if weighted_score > 0.85:
             return True, weighted_score, "Very high overall similarity"
         
+        if scores.get('content_jaccard', 0.0) >= self.lsh_threshold:
+            return True, 0.9 * scores['content_jaccard'], "Near-identical resume content"
+        
         return False, weighted_score, "Not duplicate"
     
-    def add_candidate(self, resume_text: str, filename: str) -> Tuple[str, List[Dict]]:
+    def add_candidate(self, resume: Union[str, ParsedResume], filename: str) -> Tuple[str, List[Dict]]:
         """Add candidate and check for duplicates"""
-        identifiers = self.extract_candidate_identifiers(resume_text, filename)
-        
+        identifiers = self.extract_candidate_identifiers(resume, filename)
+        return self.add_identifiers(identifiers)
+    
+    def add_identifiers(self, identifiers: Dict) -> Tuple[str, List[Dict]]:
+        """Add a candidate from previously extracted identifiers and check for duplicates"""
+        filename = identifiers['filename']
         duplicates = []
         
         for email in identifiers['emails']:
@@ -381,7 +962,8 @@ class DuplicateCandidateDetector:
                         })
         
         if not duplicates:
-            for cand_id, candidate in self.candidates_db.items():
+            for cand_id in self._comparison_candidates(identifiers):
+                candidate = self.candidates_db[cand_id]
                 scores = self.calculate_similarity_score(identifiers, candidate)
                 is_dup, confidence, reason = self.is_duplicate(scores)
                 if is_dup:
@@ -393,7 +975,8 @@ class DuplicateCandidateDetector:
                         'matched_by': 'similarity'
                     })
         
-        candidate_id = hashlib.md5(f"{filename}_{datetime.now().isoformat()}".encode()).hexdigest()[:12]
+        # Stable across runs: the same file with the same content keeps its ID
+        candidate_id = hashlib.md5(f"{filename}_{identifiers['content_hash']}".encode()).hexdigest()[:12]
         
         self.candidates_db[candidate_id] = identifiers
         
@@ -406,46 +989,83 @@ class DuplicateCandidateDetector:
         for name in identifiers['names']:
             self.name_variations[name.lower()].add(candidate_id)
         
+        self.groups.add(candidate_id)
+        for duplicate in duplicates:
+            self.groups.union(candidate_id, duplicate['candidate_id'])
+        for key in self._identity_keys(identifiers):
+            if key in self.identity_index:
+                self.groups.union(candidate_id, self.identity_index[key])
+            else:
+                self.identity_index[key] = candidate_id
+        
+        self.insertion_order[candidate_id] = len(self.insertion_order)
+        for key in self._blocking_keys(identifiers):
+            self.blocking_index[key].append(candidate_id)
+        signature = self._content_signature(identifiers)
+        if signature is not None:
+            self.lsh_index.insert(candidate_id, signature)
+        
         return candidate_id, duplicates
     
-    def get_duplicate_groups(self) -> List[List[Dict]]:
-        """Get groups of duplicate candidates with details"""
-        groups = []
-        processed = set()
+    def _content_signature(self, identifiers: Dict):
+        """Decoded content MinHash, or None if missing or built with a different num_perm"""
+        encoded = identifiers.get('content_minhash')
+        if not encoded:
+            return None
+        signature = MinHasher.from_hex(encoded)
+        return signature if len(signature) == self.minhasher.num_perm else None
+    
+    def _identity_keys(self, identifiers: Dict) -> List[str]:
+        """Keys that on their own mark two submissions as the same candidate"""
+        keys = [f"email:{email}" for email in identifiers['emails']]
+        keys.extend(f"phone:{phone}" for phone in identifiers['phones'])
+        if identifiers['github']:
+            keys.append(f"github:{identifiers['github']}")
+        if identifiers['linkedin']:
+            keys.append(f"linkedin:{identifiers['linkedin']}")
+        if identifiers['content_hash'] != self.EMPTY_CONTENT_HASH:
+            keys.append(f"content:{identifiers['content_hash']}")
+        return keys
+    
+    def _blocking_keys(self, identifiers: Dict) -> List[str]:
+        """Exact keys under which two candidates must be compared"""
+        keys = [f"content:{identifiers['content_hash']}"]
+        if identifiers['github']:
+            keys.append(f"github:{identifiers['github']}")
+        if identifiers['linkedin']:
+            keys.append(f"linkedin:{identifiers['linkedin']}")
+        
+        if identifiers['education_hash'] == identifiers['experience_hash'] == self.EMPTY_SECTION_HASH:
+            # Every resume without both sections shares this pair, so block on the name instead
+            for name in identifiers['names']:
+                keys.append("name:" + ' '.join(sorted(re.findall(r'[a-z0-9]+', name.lower()))))
+        else:
+            keys.append(f"eduexp:{identifiers['education_hash']}:{identifiers['experience_hash']}")
+        return keys
+    
+    def _comparison_candidates(self, identifiers: Dict) -> List[str]:
+        """Previously added candidates that need a full similarity comparison, in insertion order"""
+        if not self.blocking:
+            self.comparisons += len(self.candidates_db)
+            return list(self.candidates_db)
         
-        for cand_id in self.candidates_db:
-            if cand_id in processed:
-                continue
-            
-            group = [{'candidate_id': cand_id, 'filename': self.candidates_db[cand_id]['filename']}]
-            processed.add(cand_id)
-            
-            candidate = self.candidates_db[cand_id]
-            
-            for email in candidate['emails']:
-                for other_id in self.candidates_db:
-                    if other_id != cand_id and other_id not in processed:
-                        if email in self.candidates_db[other_id]['emails']:
-                            group.append({
-                                'candidate_id': other_id,
-                                'filename': self.candidates_db[other_id]['filename']
-                            })
-                            processed.add(other_id)
-            
-            for phone in candidate['phones']:
-                for other_id in self.candidates_db:
-                    if other_id != cand_id and other_id not in processed:
-                        if phone in self.candidates_db[other_id]['phones']:
-                            group.append({
-                                'candidate_id': other_id,
-                                'filename': self.candidates_db[other_id]['filename']
-                            })
-                            processed.add(other_id)
-            
-            if len(group) > 1:
-                groups.append(group)
+        candidates = set()
+        for key in self._blocking_keys(identifiers):
+            candidates.update(self.blocking_index.get(key, ()))
+        signature = self._content_signature(identifiers)
+        if signature is not None:
+            candidates.update(self.lsh_index.query(signature))
         
-        return groups
+        self.comparisons += len(candidates)
+        return sorted(candidates, key=self.insertion_order.__getitem__)
+    
+    def get_duplicate_groups(self) -> List[List[Dict]]:
+        """Get groups of duplicate candidates with details"""
+        return [
+            [{'candidate_id': cand_id, 'filename': self.candidates_db[cand_id]['filename']} for cand_id in members]
+            for members in self.groups.groups()
+            if len(members) > 1
+        ]
 
 
 class DuplicateHandlingStrategy:
@@ -489,18 +1109,91 @@ class DuplicateHandlingStrategy:
         return merged
 
 
+class JobProfile:
+    """Immutable job requirements of a ticket, parsed once per version of its job files.
+    
+    Holds the merged job details plus everything scoring derives from them (the
+    expanded skill list, the experience range and the normalized location), so
+    no property has to be re-parsed per resume. Profiles are cached per ticket
+    folder and reused while the job files keep their mtime and size.
+    """
+    
+    __slots__ = ('source_signature', 'raw_data', 'job_details', 'tech_stack',
+                 'experience_required', 'experience_range', 'location', 'location_lower', 'location_is_remote')
+    
+    _cache: Dict[str, 'JobProfile'] = {}
+    _lock = threading.Lock()
+    
+    def __init__(self, raw_data: Any, job_details: Dict, source_signature: Tuple = ()):
+        experience_required = (job_details.get('experience_required') or
+                               job_details.get('experience') or
+                               job_details.get('years_of_experience', '0+ years'))
+        location = job_details.get('location', 'Not specified')
+        skills = job_details.get('required_skills') or job_details.get('tech_stack', '')
+        values = {
+            'source_signature': source_signature,
+            'raw_data': raw_data,
+            'job_details': job_details,
+            'tech_stack': tuple(EnhancedJobTicket._parse_skills(skills)),
+            'experience_required': experience_required,
+            'experience_range': UpdateAwareResumeFilter.parse_experience_range(experience_required),
+            'location': location,
+            'location_lower': location.lower(),
+            'location_is_remote': 'remote' in location.lower(),
+        }
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+    
+    def __setattr__(self, name, value):
+        raise AttributeError("JobProfile is immutable")
+    
+    def __reduce__(self):
+        return JobProfile, (self.raw_data, self.job_details, self.source_signature)
+    
+    @classmethod
+    def cached(cls, ticket_folder: Path, source_signature: Tuple) -> Optional['JobProfile']:
+        """Profile compiled earlier from job files with exactly this signature"""
+        with cls._lock:
+            profile = cls._cache.get(str(Path(ticket_folder).resolve()))
+        return profile if profile is not None and profile.source_signature == source_signature else None
+    
+    @classmethod
+    def store(cls, ticket_folder: Path, profile: 'JobProfile'):
+        with cls._lock:
+            cls._cache[str(Path(ticket_folder).resolve())] = profile
+
+
 class EnhancedJobTicket:
     """Enhanced JobTicket class that reads latest updates from JSON structure"""
     
     def __init__(self, ticket_folder: str):
         self.ticket_folder = Path(ticket_folder)
         self.ticket_id = self.ticket_folder.name
-        self.raw_data = self._load_raw_data()
-        self.job_details = self._merge_with_updates()
+        
+        # Unchanged job files reuse the profile parsed by an earlier run in this process
+        json_file = self._find_json_file()
+        signature = self._source_signature(json_file)
+        self.profile = JobProfile.cached(self.ticket_folder, signature)
+        if self.profile is None:
+            raw_data = self._load_raw_data(json_file)
+            self.profile = JobProfile(raw_data, self._merge_with_updates(raw_data), signature)
+            JobProfile.store(self.ticket_folder, self.profile)
+        # Private copies, so changes made through this ticket never leak into the cached profile
+        self.raw_data = copy.deepcopy(self.profile.raw_data)
+        self.job_details = copy.deepcopy(self.profile.job_details)
         self._print_loaded_details()
     
-    def _load_raw_data(self) -> Dict:
-        """Load the raw JSON data from the ticket folder"""
+    def _source_signature(self, json_file: Path) -> Tuple:
+        """Name, mtime and size of every file the job details are read from"""
+        signature = []
+        for path in (json_file, self.ticket_folder / 'job-description.txt'):
+            if path.exists():
+                stat = path.stat()
+                signature.append((path.name, stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+    
+    def _find_json_file(self) -> Path:
+        """The JSON file holding the job details"""
         priority_files = ['job_details.json', 'job-data.json', 'job.json']
         json_file = None
         
@@ -523,12 +1216,16 @@ class EnhancedJobTicket:
             else:
                 raise FileNotFoundError(f"No JSON file found in {self.ticket_folder}")
         
-        print(f"📄 Loading job details from: {json_file.name}")
+        return json_file
+    
+    def _load_raw_data(self, json_file: Path) -> Any:
+        """Load the raw JSON data from the ticket folder"""
+        logger.info("Loading job details for %s from %s", self.ticket_id, json_file.name)
         
         job_desc_file = self.ticket_folder / 'job-description.txt'
         job_description_text = ""
         if job_desc_file.exists():
-            print(f"📝 Loading job description from: job-description.txt")
+            logger.info("Loading job description for %s from job-description.txt", self.ticket_id)
             with open(job_desc_file, 'r', encoding='utf-8') as f:
                 job_description_text = f.read()
         
@@ -544,16 +1241,16 @@ class EnhancedJobTicket:
             
             return data
         except Exception as e:
-            print(f"❌ Error loading JSON: {e}")
+            logger.error("Error loading job details from %s: %s", json_file, e)
             raise
     
-    def _merge_with_updates(self) -> Dict:
+    def _merge_with_updates(self, raw_data: Any) -> Dict:
         """Merge initial details with latest updates"""
-        if isinstance(self.raw_data, list):
-            print("📝 Detected applications list format, creating job structure...")
+        if isinstance(raw_data, list):
+            logger.info("Job file of %s is an applications list, using default job details", self.ticket_id)
             merged_details = {
                 'ticket_id': self.ticket_id,
-                'applications': self.raw_data,
+                'applications': raw_data,
                 'status': 'active',
                 'created_at': datetime.now().isoformat(),
                 'last_updated': datetime.now().isoformat(),
@@ -568,59 +1265,56 @@ class EnhancedJobTicket:
             }
             return merged_details
         
-        if 'ticket_info' in self.raw_data and 'job_details' in self.raw_data:
-            merged_details = self.raw_data['job_details'].copy()
-            merged_details['ticket_id'] = self.raw_data['ticket_info'].get('ticket_id', self.ticket_id)
-            merged_details['status'] = self.raw_data['ticket_info'].get('status', 'active')
-            merged_details['created_at'] = self.raw_data['ticket_info'].get('created_at', '')
-            merged_details['last_updated'] = self.raw_data.get('saved_at', '')
+        if 'ticket_info' in raw_data and 'job_details' in raw_data:
+            merged_details = raw_data['job_details'].copy()
+            merged_details['ticket_id'] = raw_data['ticket_info'].get('ticket_id', self.ticket_id)
+            merged_details['status'] = raw_data['ticket_info'].get('status', 'active')
+            merged_details['created_at'] = raw_data['ticket_info'].get('created_at', '')
+            merged_details['last_updated'] = raw_data.get('saved_at', '')
             return merged_details
         
-        if 'initial_details' in self.raw_data:
-            merged_details = self.raw_data['initial_details'].copy()
+        if 'initial_details' in raw_data:
+            merged_details = raw_data['initial_details'].copy()
         else:
-            merged_details = self.raw_data.copy()
+            merged_details = raw_data.copy()
         
-        merged_details['ticket_id'] = self.raw_data.get('ticket_id', self.ticket_id)
-        merged_details['status'] = self.raw_data.get('status', 'unknown')
-        merged_details['created_at'] = self.raw_data.get('created_at', '')
-        merged_details['last_updated'] = self.raw_data.get('last_updated', '')
+        merged_details['ticket_id'] = raw_data.get('ticket_id', self.ticket_id)
+        merged_details['status'] = raw_data.get('status', 'unknown')
+        merged_details['created_at'] = raw_data.get('created_at', '')
+        merged_details['last_updated'] = raw_data.get('last_updated', '')
         
-        if 'updates' in self.raw_data and self.raw_data['updates']:
-            print(f"📝 Found {len(self.raw_data['updates'])} update(s)")
+        if 'updates' in raw_data and raw_data['updates']:
+            logger.debug("Found %d update(s) to the job details of %s", len(raw_data['updates']), self.ticket_id)
             
             sorted_updates = sorted(
-                self.raw_data['updates'], 
+                raw_data['updates'], 
                 key=lambda x: x.get('timestamp', ''),
                 reverse=True
             )
             
             latest_update = sorted_updates[0]
-            print(f"✅ Applying latest update from: {latest_update.get('timestamp', 'unknown')}")
+            logger.info("Applying the job details update of %s from %s", self.ticket_id,
+                        latest_update.get('timestamp', 'unknown'))
             
             if 'details' in latest_update:
                 for key, value in latest_update['details'].items():
                     if value:
                         merged_details[key] = value
-                        print(f"   Updated {key}: {value}")
+                        logger.debug("Updated %s: %s", key, value)
         
         return merged_details
     
     def _print_loaded_details(self):
-        """Print the loaded job details for verification"""
-        print("\n" + "="*60)
-        print("📋 LOADED JOB REQUIREMENTS")
-        print("="*60)
-        print(f"Position: {self.position}")
-        print(f"Experience: {self.experience_required}")
-        print(f"Location: {self.location}")
-        print(f"Salary: {self.salary_range}")
-        print(f"Skills: {', '.join(self.tech_stack)}")
-        print(f"Deadline: {self.deadline}")
-        print(f"Last Updated: {self.job_details.get('last_updated', 'Unknown')}")
-        print("="*60 + "\n")
-    
-    def _parse_skills(self, skills_str: str) -> List[str]:
+        """Log the loaded job details for verification"""
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+        logger.debug("Loaded job requirements for %s: position=%s, experience=%s, location=%s, salary=%s, "
+                     "skills=%s, deadline=%s, last updated=%s", self.ticket_id, self.position,
+                     self.experience_required, self.location, self.salary_range, ', '.join(self.tech_stack),
+                     self.deadline, self.job_details.get('last_updated', 'Unknown'))
+    
+    @staticmethod
+    def _parse_skills(skills_str: str) -> List[str]:
         """Parse skills from string format to list"""
         if isinstance(skills_str, list):
             return skills_str
@@ -643,7 +1337,8 @@ class EnhancedJobTicket:
             else:
                 expanded_skills.append(skill.strip())
         
-        return list(set([s for s in expanded_skills if s]))
+        # Order-preserving dedupe so every process sees the same skill order
+        return list(dict.fromkeys(s for s in expanded_skills if s))
     
     @property
     def position(self) -> str:
@@ -653,13 +1348,15 @@ class EnhancedJobTicket:
     
     @property
     def experience_required(self) -> str:
-        return (self.job_details.get('experience_required') or 
-                self.job_details.get('experience') or 
-                self.job_details.get('years_of_experience', '0+ years'))
+        return self.profile.experience_required
+    
+    @property
+    def experience_range(self) -> Tuple[int, int]:
+        return self.profile.experience_range
     
     @property
     def location(self) -> str:
-        return self.job_details.get('location', 'Not specified')
+        return self.profile.location
     
     @property
     def salary_range(self) -> str:
@@ -677,8 +1374,7 @@ class EnhancedJobTicket:
     
     @property
     def tech_stack(self) -> List[str]:
-        skills = self.job_details.get('required_skills') or self.job_details.get('tech_stack', '')
-        return self._parse_skills(skills)
+        return list(self.profile.tech_stack)
     
     @property
     def requirements(self) -> List[str]:
@@ -717,19 +1413,26 @@ class EnhancedJobTicket:
             return nice
         return []
     
+    RESUME_EXTENSIONS = ['.pdf', '.docx', '.doc', '.txt']
+    EXCLUDED_KEYWORDS = ['job_description', 'job-description', 'requirements', 'jd', 'job_posting', 'job-posting']
+    
+    @classmethod
+    def is_resume_file(cls, filename: str) -> bool:
+        """Whether get_resumes() treats a file of the ticket folder as a resume"""
+        return (Path(filename).suffix in cls.RESUME_EXTENSIONS and
+                not any(keyword in filename.lower().replace('_', '-') for keyword in cls.EXCLUDED_KEYWORDS))
+    
     def get_resumes(self) -> List[Path]:
         """Get all resume files from the ticket folder"""
-        resume_extensions = ['.pdf', '.docx', '.doc']
         resumes = []
         
-        for ext in resume_extensions:
+        for ext in self.RESUME_EXTENSIONS:
             resumes.extend(self.ticket_folder.glob(f"*{ext}"))
         
-        excluded_keywords = ['job_description', 'job-description', 'requirements', 'jd', 'job_posting', 'job-posting']
         filtered_resumes = []
         
         for resume in resumes:
-            if not any(keyword in resume.name.lower().replace('_', '-') for keyword in excluded_keywords):
+            if self.is_resume_file(resume.name):
                 filtered_resumes.append(resume)
             else:
                 print(f"   ℹ️ Excluding non-resume file: {resume.name}")
@@ -740,6 +1443,24 @@ class EnhancedJobTicket:
 class ProfessionalDevelopmentScorer:
     """Score candidates based on continuous learning and professional development"""
     
+    SPECIALIZATION_TERMS = ['specialization', 'nanodegree', 'micromasters']
+    COURSE_INDICATORS = [re.compile(pattern) for pattern in [
+        r'completed?\s+\d+\s+courses?',
+        r'\d+\s+courses?\s+completed',
+        r'certification?\s+in',
+        r'specialization\s+in',
+        r'nanodegree',
+        r'micromasters',
+        r'professional certificate'
+    ]]
+    GITHUB_STATS_PATTERNS = [
+        r'(\d+)\+?\s*stars',
+        r'(\d+)\+?\s*followers',
+        r'(\d+)\+?\s*repositories',
+        r'(\d+)\+?\s*contributions'
+    ]
+    GITHUB_STATS_REGEXES = [(pattern, re.compile(pattern)) for pattern in GITHUB_STATS_PATTERNS]
+    
     def __init__(self):
         self.current_year = datetime.now().year
         self.current_month = datetime.now().month
@@ -920,20 +1641,41 @@ class ProfessionalDevelopmentScorer:
                 'weight': 0.7
             }
         }
-    
-    def extract_years_from_text(self, text: str, keyword: str, look_ahead: int = 50) -> List[int]:
-        """Extract years mentioned near a keyword"""
+        
+        self.speaker_event_regexes = {
+            pattern: re.compile(f'{pattern}[^.]*(?:conference|summit|meetup|workshop)')
+            for pattern in self.conference_patterns['speaking']['patterns']
+        }
+        
+        patterns = set(self.SPECIALIZATION_TERMS)
+        for cert_types in self.certifications_db.values():
+            for cert_info in cert_types.values():
+                patterns.update(cert_info['patterns'])
+        for table in (self.learning_platforms, self.conference_patterns, self.content_creation):
+            for info in table.values():
+                patterns.update(info['patterns'])
+        self.matcher = MultiPatternMatcher(patterns)
+    
+    def find_patterns(self, resume: Union[str, ParsedResume]) -> Dict[str, List[int]]:
+        """Scan the resume once for every professional development pattern"""
+        return self.matcher.find_all(ParsedResume.ensure(resume).lower)
+    
+    def extract_years_near(self, parsed: ParsedResume, keyword: str, positions: List[int],
+                           look_ahead: int = 50) -> List[int]:
+        """Extract years mentioned near each occurrence of a keyword"""
         years_found = []
-        keyword_indices = [m.start() for m in re.finditer(keyword, text.lower())]
+        year_positions = parsed.year_positions
         
-        for idx in keyword_indices:
+        for idx in positions:
             start = max(0, idx - 30)
-            end = min(len(text), idx + len(keyword) + look_ahead)
-            snippet = text[start:end]
+            end = idx + len(keyword) + look_ahead
             
-            year_pattern = r'\b(20[1-2][0-9])\b'
-            years = re.findall(year_pattern, snippet)
-            years_found.extend([int(y) for y in years if 2010 <= int(y) <= self.current_year + 1])
+            i = bisect.bisect_left(year_positions, (start,))
+            while i < len(year_positions) and year_positions[i][0] + 4 <= end:
+                year = year_positions[i][1]
+                if 2010 <= year <= self.current_year + 1:
+                    years_found.append(year)
+                i += 1
         
         return years_found
     
@@ -958,9 +1700,12 @@ class ProfessionalDevelopmentScorer:
         else:
             return 0.2
     
-    def score_certifications(self, resume_text: str) -> Dict[str, Any]:
+    def score_certifications(self, resume: Union[str, ParsedResume],
+                             hits: Optional[Dict[str, List[int]]] = None) -> Dict[str, Any]:
         """Score professional certifications"""
-        resume_lower = resume_text.lower()
+        parsed = ParsedResume.ensure(resume)
+        if hits is None:
+            hits = self.find_patterns(parsed)
         
         results = {
             'certification_score': 0.0,
@@ -981,12 +1726,12 @@ class ProfessionalDevelopmentScorer:
             
             for cert_type, cert_info in cert_types.items():
                 for pattern in cert_info['patterns']:
-                    if pattern in resume_lower and pattern not in found_certs:
+                    if pattern in hits and pattern not in found_certs:
                         found_certs.add(pattern)
                         results['certification_count'] += 1
                         category_certs.append(pattern)
                         
-                        years = self.extract_years_from_text(resume_text, pattern)
+                        years = self.extract_years_near(parsed, pattern, hits[pattern])
                         all_years.extend(years)
                         
                         category_scores[category] += cert_info['weight']
@@ -1010,13 +1755,17 @@ class ProfessionalDevelopmentScorer:
             results['years_detected'] = sorted(list(set(all_years)), reverse=True)
             results['recent_certification_score'] = self.calculate_recency_score(all_years)
         
-        results['certifications_found'] = list(found_certs)
+        results['certifications_found'] = sorted(found_certs)
         
         return results
     
-    def score_online_learning(self, resume_text: str) -> Dict[str, Any]:
+    def score_online_learning(self, resume: Union[str, ParsedResume],
+                              hits: Optional[Dict[str, List[int]]] = None) -> Dict[str, Any]:
         """Score online course completions"""
-        resume_lower = resume_text.lower()
+        parsed = ParsedResume.ensure(resume)
+        resume_lower = parsed.lower
+        if hits is None:
+            hits = self.find_patterns(parsed)
         
         results = {
             'online_learning_score': 0.0,
@@ -1031,28 +1780,18 @@ class ProfessionalDevelopmentScorer:
         
         for tier, platform_info in self.learning_platforms.items():
             for platform in platform_info['patterns']:
-                if platform in resume_lower:
+                if platform in hits:
                     platforms_detected.add(platform)
                     platform_weights.append(platform_info['weight'])
         
-        results['platforms_found'] = list(platforms_detected)
-        
-        course_indicators = [
-            r'completed?\s+\d+\s+courses?',
-            r'\d+\s+courses?\s+completed',
-            r'certification?\s+in',
-            r'specialization\s+in',
-            r'nanodegree',
-            r'micromasters',
-            r'professional certificate'
-        ]
+        results['platforms_found'] = sorted(platforms_detected)
         
         course_count = 0
-        for pattern in course_indicators:
-            matches = re.findall(pattern, resume_lower)
+        for regex in self.COURSE_INDICATORS:
+            matches = regex.findall(resume_lower)
             course_count += len(matches)
         
-        if any(term in resume_lower for term in ['specialization', 'nanodegree', 'micromasters']):
+        if any(term in hits for term in self.SPECIALIZATION_TERMS):
             results['specializations_mentioned'] = True
             course_count += 2
         
@@ -1067,7 +1806,7 @@ class ProfessionalDevelopmentScorer:
         
         recent_years = []
         for platform in platforms_detected:
-            years = self.extract_years_from_text(resume_text, platform)
+            years = self.extract_years_near(parsed, platform, hits[platform])
             recent_years.extend(years)
         
         if recent_years:
@@ -1075,9 +1814,13 @@ class ProfessionalDevelopmentScorer:
         
         return results
     
-    def score_conference_participation(self, resume_text: str) -> Dict[str, Any]:
+    def score_conference_participation(self, resume: Union[str, ParsedResume],
+                                       hits: Optional[Dict[str, List[int]]] = None) -> Dict[str, Any]:
         """Score conference attendance and speaking"""
-        resume_lower = resume_text.lower()
+        parsed = ParsedResume.ensure(resume)
+        resume_lower = parsed.lower
+        if hits is None:
+            hits = self.find_patterns(parsed)
         
         results = {
             'conference_score': 0.0,
@@ -1089,17 +1832,17 @@ class ProfessionalDevelopmentScorer:
         }
         
         for pattern in self.conference_patterns['speaking']['patterns']:
-            if pattern in resume_lower:
+            if pattern in hits:
                 results['speaker_events'].append(pattern)
-                event_matches = re.findall(f'{pattern}[^.]*(?:conference|summit|meetup|workshop)', resume_lower)
+                event_matches = self.speaker_event_regexes[pattern].findall(resume_lower)
                 results['events_found'].extend(event_matches)
         
         for pattern in self.conference_patterns['attendance']['patterns']:
-            if pattern in resume_lower:
+            if pattern in hits:
                 results['events_found'].append(pattern)
         
         for conference in self.conference_patterns['major_conferences']['patterns']:
-            if conference in resume_lower:
+            if conference in hits:
                 results['major_conferences'].append(conference)
         
         if results['speaker_events']:
@@ -1116,9 +1859,13 @@ class ProfessionalDevelopmentScorer:
         
         return results
     
-    def score_content_creation(self, resume_text: str) -> Dict[str, Any]:
+    def score_content_creation(self, resume: Union[str, ParsedResume],
+                               hits: Optional[Dict[str, List[int]]] = None) -> Dict[str, Any]:
         """Score technical content creation and community involvement"""
-        resume_lower = resume_text.lower()
+        parsed = ParsedResume.ensure(resume)
+        resume_lower = parsed.lower
+        if hits is None:
+            hits = self.find_patterns(parsed)
         
         results = {
             'content_creation_score': 0.0,
@@ -1134,21 +1881,15 @@ class ProfessionalDevelopmentScorer:
         
         for content_type, content_info in self.content_creation.items():
             for pattern in content_info['patterns']:
-                if pattern in resume_lower:
+                if pattern in hits:
                     results[f'{content_type}_activity'] = True
                     results['content_platforms'].append(pattern)
                     content_scores.append(content_info['weight'])
                     
-                    if 'github' in pattern:
-                        stats_patterns = [
-                            r'(\d+)\+?\s*stars',
-                            r'(\d+)\+?\s*followers',
-                            r'(\d+)\+?\s*repositories',
-                            r'(\d+)\+?\s*contributions'
-                        ]
+                    if 'github' in pattern and results['github_activity'] is None:
                         github_stats = {}
-                        for stat_pattern in stats_patterns:
-                            match = re.search(stat_pattern, resume_lower)
+                        for stat_pattern, regex in self.GITHUB_STATS_REGEXES:
+                            match = regex.search(resume_lower)
                             if match:
                                 github_stats[stat_pattern] = int(match.group(1))
                         if github_stats:
@@ -1161,13 +1902,15 @@ class ProfessionalDevelopmentScorer:
         
         return results
     
-    def calculate_professional_development_score(self, resume_text: str) -> Dict[str, Any]:
+    def calculate_professional_development_score(self, resume: Union[str, ParsedResume]) -> Dict[str, Any]:
         """Calculate comprehensive professional development score"""
+        parsed = ParsedResume.ensure(resume)
+        hits = self.find_patterns(parsed)
         
-        cert_results = self.score_certifications(resume_text)
-        learning_results = self.score_online_learning(resume_text)
-        conference_results = self.score_conference_participation(resume_text)
-        content_results = self.score_content_creation(resume_text)
+        cert_results = self.score_certifications(parsed, hits)
+        learning_results = self.score_online_learning(parsed, hits)
+        conference_results = self.score_conference_participation(parsed, hits)
+        content_results = self.score_content_creation(parsed, hits)
         
         weights = {
             'certifications': 0.35,
@@ -1261,104 +2004,104 @@ class ProfessionalDevelopmentScorer:
         return summary
 
 
+_pd_scorer: Optional[ProfessionalDevelopmentScorer] = None
+
+
+def get_professional_development_scorer() -> ProfessionalDevelopmentScorer:
+    """Process-wide ProfessionalDevelopmentScorer; its pattern tables are compiled once"""
+    global _pd_scorer
+    if _pd_scorer is None:
+        _pd_scorer = ProfessionalDevelopmentScorer()
+    return _pd_scorer
+
+
 class UpdateAwareResumeFilter:
     """Resume filter that considers updated job requirements and professional development"""
     
-    def __init__(self):
-        self.skill_variations = self._build_skill_variations()
-        self.pd_scorer = ProfessionalDevelopmentScorer()
-    
-    def _build_skill_variations(self) -> Dict[str, List[str]]:
-        """Build comprehensive skill variations dictionary"""
-        return {
-            "python": ["python", "py", "python3", "python2", "python 3", "python 2"],
-            "javascript": ["javascript", "js", "node.js", "nodejs", "node", "ecmascript", "es6", "es5"],
-            "java": ["java", "jvm", "j2ee", "java8", "java11", "java17"],
-            "c++": ["c++", "cpp", "cplusplus", "c plus plus"],
-            "c#": ["c#", "csharp", "c sharp", ".net", "dotnet"],
-            "html": ["html", "html5", "html 5"],
-            "css": ["css", "css3", "css 3", "styles", "styling"],
-            "html/css": ["html/css", "html css", "html, css", "html and css", "html & css"],
-            "sql": ["sql", "structured query language", "tsql", "t-sql", "plsql", "pl/sql"],
-            "mongodb": ["mongodb", "mongo", "mongod", "nosql mongodb"],
-            "redis": ["redis", "redis cache", "redis db", "redis database"],
-            "postgresql": ["postgresql", "postgres", "pgsql", "postgre"],
-            "mysql": ["mysql", "my sql", "mariadb"],
-            "react": ["react", "reactjs", "react.js", "react js", "react native"],
-            "angular": ["angular", "angularjs", "angular.js", "angular js"],
-            "django": ["django", "django rest", "drf", "django framework"],
-            "spring": ["spring", "spring boot", "springboot", "spring framework"],
-            "flask": ["flask", "flask api", "flask framework"],
-            "aws": ["aws", "amazon web services", "ec2", "s3", "lambda", "amazon aws"],
-            "gcp": ["gcp", "google cloud", "google cloud platform", "gcloud"],
-            "azure": ["azure", "microsoft azure", "ms azure", "windows azure"],
-            "cloud platforms": ["cloud platforms", "cloud services", "cloud computing", "cloud infrastructure"],
-            "spark": ["spark", "apache spark", "pyspark", "spark sql"],
-            "hadoop": ["hadoop", "hdfs", "mapreduce", "apache hadoop"],
-            "kafka": ["kafka", "apache kafka", "kafka streams"],
-            "machine learning": ["machine learning", "ml", "scikit-learn", "sklearn", "ml models"],
-            "deep learning": ["deep learning", "dl", "neural networks", "nn", "dnn"],
-            "tensorflow": ["tensorflow", "tf", "tf2", "tensorflow 2"],
-            "pytorch": ["pytorch", "torch", "py torch"],
-            "docker": ["docker", "containers", "containerization", "dockerfile"],
-            "kubernetes": ["kubernetes", "k8s", "kubectl", "k8", "container orchestration"],
-            "graphql": ["graphql", "graph ql", "apollo", "graphql api"],
-            "rest": ["rest", "restful", "rest api", "restful api", "rest services"],
-            "rest apis": ["rest apis", "restful apis", "rest api", "restful api", "api development"],
-            "git": ["git", "github", "gitlab", "bitbucket", "version control", "vcs"],
-            "ci/cd": ["ci/cd", "cicd", "continuous integration", "continuous deployment", "jenkins", "travis", "circle ci"],
-            "agile": ["agile", "scrum", "kanban", "sprint", "agile methodology"],
-            "etl": ["etl", "elt", "extract transform load", "data pipeline", "data pipelines"],
-            "data warehouse": ["data warehouse", "data warehousing", "dwh", "datawarehouse"],
-            "apache spark": ["apache spark", "spark", "pyspark", "spark sql", "spark streaming"],
-            "sql/nosql databases": ["sql/nosql", "sql nosql", "sql and nosql", "relational and non-relational", 
-                                   "sql", "nosql", "mysql", "postgresql", "mongodb", "cassandra", "redis",
-                                   "database", "databases", "rdbms", "nosql databases"],
-        }
+    def __init__(self, word_boundaries: Optional[bool] = None):
+        self.pd_scorer = get_professional_development_scorer()
+        self.timeline_extractor = ExperienceTimelineExtractor()
+        if word_boundaries is None:
+            word_boundaries = os.environ.get('RESUME_SKILL_WORD_BOUNDARIES', '').lower() in ('1', 'true', 'yes')
+        self.word_boundaries = word_boundaries
+        self._skill_plans: Dict[Tuple[str, ...], Tuple[MultiPatternMatcher, List[Dict[str, Any]]]] = {}
+        # Signature of the skill taxonomy the cached plans were compiled from
+        self._skill_plans_taxonomy = None
     
-    def calculate_skill_match_score(self, resume_text: str, required_skills: List[str]) -> tuple[float, List[str], Dict[str, List[str]]]:
+    @property
+    def skill_variations(self) -> Dict[str, List[str]]:
+        """Canonical skill -> variations, from the current skill taxonomy"""
+        return get_skill_taxonomy().variations
+    
+    def _compile_skill_plan(self, required_skills: List[str]) -> Tuple[MultiPatternMatcher, List[Dict[str, Any]]]:
+        """Resolve each required skill to its variations and compile all of them into one matcher"""
+        taxonomy = get_skill_taxonomy()
+        if taxonomy.signature != self._skill_plans_taxonomy:
+            # Plans compiled from a previous taxonomy version resolve skills to outdated variations
+            self._skill_plans = {}
+            self._skill_plans_taxonomy = taxonomy.signature
+        key = tuple(required_skills)
+        if key in self._skill_plans:
+            return self._skill_plans[key]
+        
+        plan = []
+        patterns = set()
+        for skill in required_skills:
+            skill_lower = skill.lower().strip()
+            skill_key = taxonomy.resolve(skill_lower)
+            variations = taxonomy.variations[skill_key] if skill_key else []
+            parts = [part.lower() for part in skill.split()] if ' ' in skill else []
+            plan.append({'skill': skill, 'skill_lower': skill_lower, 'variations': variations, 'parts': parts})
+            patterns.update([skill_lower, *variations, *parts])
+        
+        compiled = (MultiPatternMatcher(patterns, word_boundaries=self.word_boundaries), plan)
+        self._skill_plans[key] = compiled
+        return compiled
+    
+    def skill_taxonomy_patterns(self) -> Set[str]:
+        """Every skill key and variation, plus the single words of multi-word ones"""
+        return set(get_skill_taxonomy().patterns)
+    
+    def skill_plan_patterns(self, required_skills: List[str]) -> Set[str]:
+        """Patterns whose presence decides calculate_skill_match_score for required_skills"""
+        _, plan = self._compile_skill_plan(required_skills)
+        return {pattern for entry in plan for pattern in (entry['skill_lower'], *entry['variations'], *entry['parts'])
+                if pattern}
+    
+    def calculate_skill_match_score(self, resume: Union[str, ParsedResume], required_skills: List[str]) -> tuple[float, List[str], Dict[str, List[str]]]:
         """Calculate skill matching score with variations"""
-        resume_lower = resume_text.lower()
+        matcher, _ = self._compile_skill_plan(required_skills)
+        return self.skill_match_from_found(matcher.found(ParsedResume.ensure(resume).lower), required_skills)
+    
+    def skill_match_from_found(self, found: Set[str], required_skills: List[str]) -> tuple[float, List[str], Dict[str, List[str]]]:
+        """calculate_skill_match_score given the set of skill patterns present in the resume"""
+        _, plan = self._compile_skill_plan(required_skills)
+        found = set(found)
+        found.add('')
         matched_skills = []
         detailed_matches = {}
         
-        for skill in required_skills:
-            skill_lower = skill.lower().strip()
-            skill_matched = False
+        for entry in plan:
+            skill = entry['skill']
             
-            if skill_lower in resume_lower:
+            if entry['skill_lower'] in found:
                 matched_skills.append(skill)
-                detailed_matches[skill] = [skill_lower]
-                skill_matched = True
+                detailed_matches[skill] = [entry['skill_lower']]
                 continue
             
-            skill_key = None
-            for key in self.skill_variations:
-                if skill_lower in self.skill_variations[key] or key in skill_lower:
-                    skill_key = key
-                    break
-            
-            if skill_key and skill_key in self.skill_variations:
-                variations_found = []
-                for variation in self.skill_variations[skill_key]:
-                    if variation in resume_lower:
-                        variations_found.append(variation)
-                        skill_matched = True
-                
-                if variations_found:
-                    matched_skills.append(skill)
-                    detailed_matches[skill] = variations_found
-            
-            if not skill_matched and ' ' in skill:
-                parts = skill.split()
-                if all(part.lower() in resume_lower for part in parts):
-                    matched_skills.append(skill)
-                    detailed_matches[skill] = [skill_lower]
+            variations_found = [variation for variation in entry['variations'] if variation in found]
+            if variations_found:
+                matched_skills.append(skill)
+                detailed_matches[skill] = variations_found
+            elif entry['parts'] and all(part in found for part in entry['parts']):
+                matched_skills.append(skill)
+                detailed_matches[skill] = [entry['skill_lower']]
         
         score = len(matched_skills) / len(required_skills) if required_skills else 0
         return score, matched_skills, detailed_matches
     
-    def parse_experience_range(self, experience_str: str) -> tuple[int, int]:
+    @staticmethod
+    def parse_experience_range(experience_str: str) -> tuple[int, int]:
         """Parse experience range like '5-8 years' to (5, 8)"""
         numbers = re.findall(r'\d+', experience_str)
         
@@ -1372,114 +2115,16 @@ class UpdateAwareResumeFilter:
         else:
             return 0, 100
     
-    def calculate_experience_match(self, resume_text: str, required_experience: str) -> tuple[float, int]:
-        """Calculate experience matching score"""
-        min_req, max_req = self.parse_experience_range(required_experience)
-        
-        patterns = [
-            r'(\d+)\+?\s*years?\s*(?:of\s*)?(?:professional\s*)?experience',
-            r'experience\s*[:–-]\s*(\d+)\+?\s*years?',
-            r'(\d+)\+?\s*years?\s*in\s*(?:software|data|engineering|development)',
-            r'total\s*experience\s*[:–-]\s*(\d+)\+?\s*years?',
-            r'(\d+)\+?\s*yrs?\s*exp',
-            r'(\d{4})\s*[-–]\s*(?:present|current|now|(\d{4}))',
-        ]
-        
-        date_patterns = [
-            r'from\s+(?:january|february|march|april|may|june|july|august|september|october|november|december),?\s*(\d{4})\s*[-–]\s*(?:present|current|now)',
-            r'(?:january|february|march|april|may|june|july|august|september|october|november|december),?\s*(\d{4})\s*[-–]\s*(?:january|february|march|april|may|june|july|august|september|october|november|december),?\s*(\d{4})',
-            r'(\d{4})\s*(?:to|-|–)\s*(\d{4})',
-            r'since\s+(?:january|february|march|april|may|june|july|august|september|october|november|december),?\s*(\d{4})',
-        ]
-        
-        month_year_patterns = [
-            r'(?:january|february|march|april|may|june|july|august|september|october|november|december),?\s*(\d{4})\s*[-–]\s*(?:present|current|now)',
-            r'(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*,?\s*(\d{4})\s*[-–]\s*(?:present|current|now)',
-        ]
-        
-        years_found = []
-        experience_periods = []
+    def calculate_experience_match(self, resume: Union[str, ParsedResume], required_experience: str,
+                                   experience_range: Optional[Tuple[int, int]] = None) -> tuple[float, int]:
+        """Calculate experience matching score; experience_range is required_experience already parsed"""
+        timeline = self.timeline_extractor.extract(ParsedResume.ensure(resume).lower)
+        min_req, max_req = experience_range or self.parse_experience_range(required_experience)
         
-        education_keywords = ['education', 'academic', 'degree', 'bachelor', 'master', 'phd', 'university', 'college', 'school']
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, resume_text.lower())
-            for match in matches:
-                if isinstance(match, tuple):
-                    if match[0].isdigit() and len(match[0]) == 4:
-                        start_year = int(match[0])
-                        if match[1] and match[1].isdigit():
-                            end_year = int(match[1])
-                        else:
-                            end_year = datetime.now().year
-                        
-                        match_context = resume_text.lower()[max(0, resume_text.lower().find(match[0])-100):resume_text.lower().find(match[0])+100]
-                        if not any(edu_keyword in match_context for edu_keyword in education_keywords):
-                            if 1990 < start_year <= datetime.now().year:
-                                years_found.append(end_year - start_year)
-                else:
-                    if match.isdigit():
-                        years_found.append(int(match))
-        
-        experience_keywords = ['experience', 'work', 'employed', 'position', 'role', 'job', 'company', 'engineer at', 'developer at']
-        
-        for pattern in month_year_patterns:
-            for match in re.finditer(pattern, resume_text.lower()):
-                match_text = match.group(1) if match.groups() else match.group(0)
-                if match_text.isdigit():
-                    start_year = int(match_text)
-                    
-                    match_context = resume_text.lower()[max(0, match.start()-200):match.end()+50]
-                    if any(exp_keyword in match_context for exp_keyword in experience_keywords):
-                        if 1990 < start_year <= datetime.now().year:
-                            current_year = datetime.now().year
-                            current_month = datetime.now().month
-                            
-                            month_str = resume_text.lower()[max(0, match.start()-20):match.start()].strip()
-                            
-                            month_map = {
-                                'january': 1, 'february': 2, 'march': 3, 'april': 4,
-                                'may': 5, 'june': 6, 'july': 7, 'august': 8,
-                                'september': 9, 'october': 10, 'november': 11, 'december': 12
-                            }
-                            
-                            start_month = 1
-                            for month_name, month_num in month_map.items():
-                                if month_name in month_str:
-                                    start_month = month_num
-                                    break
-                            
-                            if start_year == current_year:
-                                years = (current_month - start_month) / 12.0
-                            elif start_year == current_year - 1:
-                                years = 1 + ((current_month - start_month) / 12.0)
-                            else:
-                                years = current_year - start_year + ((current_month - start_month) / 12.0)
-                            
-                            experience_periods.append(max(0.5, years))
-        
-        for pattern in date_patterns:
-            matches = re.findall(pattern, resume_text.lower())
-            for match in matches:
-                if isinstance(match, tuple):
-                    if len(match) >= 1:
-                        start_year = int(match[0])
-                        if len(match) > 1 and match[1] and match[1].isdigit():
-                            end_year = int(match[1])
-                        else:
-                            end_year = datetime.now().year
-                        
-                        match_context = resume_text.lower()[max(0, resume_text.lower().find(str(start_year))-100):resume_text.lower().find(str(start_year))+100]
-                        if any(exp_keyword in match_context for exp_keyword in experience_keywords) and \
-                           not any(edu_keyword in match_context for edu_keyword in education_keywords):
-                            if 1990 < start_year <= datetime.now().year and end_year - start_year < 10:
-                                experience_periods.append(end_year - start_year)
-                elif match and match.isdigit():
-                    start_year = int(match)
-                    if 1990 < start_year <= datetime.now().year:
-                        experience_periods.append(datetime.now().year - start_year)
-        
-        all_years = years_found + experience_periods
+        # Stated claims plus the merged work history, so overlapping jobs are only counted once
+        all_years = list(timeline.stated_years)
+        if timeline.work_months:
+            all_years.append(timeline.work_years)
         
         if all_years:
             realistic_years = [y for y in all_years if 0 < y < 15]
@@ -1504,25 +2149,43 @@ class UpdateAwareResumeFilter:
         
         return 0.0, 0
     
-    def score_resume(self, resume_text: str, job_ticket: EnhancedJobTicket) -> Dict[str, Any]:
-        """Enhanced score_resume method with professional development"""
+    @staticmethod
+    def combine_scores(weights: Dict[str, float], skill_score: float, exp_score: float,
+                       location_score: float, pd_score: float) -> float:
+        """Weighted final score from the component scores"""
+        return (
+            weights['skills'] * skill_score +
+            weights['experience'] * exp_score +
+            weights['location'] * location_score +
+            weights['professional_dev'] * pd_score
+        )
+    
+    def score_resume(self, resume: Union[str, ParsedResume], job_ticket: EnhancedJobTicket,
+                     professional_development: bool = True) -> Dict[str, Any]:
+        """Enhanced score_resume method with professional development.
+        
+        professional_development=False skips the professional development passes:
+        final_score is then a lower bound (no PD credit) and score_upper_bound the
+        best score the resume could reach, until complete_professional_development()
+        fills the stage in.
+        """
+        parsed = ParsedResume.ensure(resume)
         
+        profile = job_ticket.profile
         skill_score, matched_skills, detailed_matches = self.calculate_skill_match_score(
-            resume_text, job_ticket.tech_stack
+            parsed, profile.tech_stack
         )
         
         exp_score, detected_years = self.calculate_experience_match(
-            resume_text, job_ticket.experience_required
+            parsed, profile.experience_required, profile.experience_range
         )
         
         location_score = 0.0
-        if job_ticket.location.lower() in resume_text.lower():
+        if profile.location_lower in parsed.lower:
             location_score = 1.0
-        elif "remote" in job_ticket.location.lower() or "remote" in resume_text.lower():
+        elif profile.location_is_remote or "remote" in parsed.lower:
             location_score = 0.8
         
-        pd_results = self.pd_scorer.calculate_professional_development_score(resume_text)
-        
         weights = {
             'skills': 0.40,
             'experience': 0.30,
@@ -1530,14 +2193,15 @@ class UpdateAwareResumeFilter:
             'professional_dev': 0.20
         }
         
-        final_score = (
-            weights['skills'] * skill_score +
-            weights['experience'] * exp_score +
-            weights['location'] * location_score +
-            weights['professional_dev'] * pd_results['professional_development_score']
-        )
+        if professional_development:
+            pd_results = self.pd_scorer.calculate_professional_development_score(parsed)
+        else:
+            pd_results = {'professional_development_score': 0.0}
         
-        return {
+        final_score = self.combine_scores(weights, skill_score, exp_score, location_score,
+                                          pd_results['professional_development_score'])
+        
+        result = {
             'final_score': final_score,
             'skill_score': skill_score,
             'experience_score': exp_score,
@@ -1555,41 +2219,304 @@ class UpdateAwareResumeFilter:
                 'location': job_ticket.location
             }
         }
+        if not professional_development:
+            result['prefiltered'] = True
+            # The professional development score is capped at 1.0
+            result['score_upper_bound'] = self.combine_scores(weights, skill_score, exp_score, location_score, 1.0)
+        return result
+    
+    def complete_professional_development(self, score: Dict, resume: Union[str, ParsedResume]) -> Dict:
+        """Prefiltered score with the professional development stage filled in, as a full score_resume() would give"""
+        pd_results = self.pd_scorer.calculate_professional_development_score(ParsedResume.ensure(resume))
+        score = {key: value for key, value in score.items() if key not in ('prefiltered', 'score_upper_bound')}
+        score['professional_development_score'] = pd_results['professional_development_score']
+        score['professional_development'] = pd_results
+        score['final_score'] = self.combine_scores(score['scoring_weights'], score['skill_score'],
+                                                   score['experience_score'], score['location_score'],
+                                                   pd_results['professional_development_score'])
+        return score
 
 
-class UpdateAwareBasicFilter:
-    """Enhanced basic filter with comprehensive scoring and duplicate detection"""
+class CorpusSimilarityModel:
+    """TF-IDF similarity between a job description and every resume of a ticket.
     
-    def __init__(self):
-        self.resume_filter = UpdateAwareResumeFilter()
-        self.duplicate_detector = DuplicateCandidateDetector()
-        self.duplicate_handler = DuplicateHandlingStrategy()
+    The vocabulary is fitted once over the description plus the whole resume
+    corpus, so every candidate is scored in the same vector space and the
+    scores are comparable. Similarities for a batch come from one sparse
+    matrix-vector product (rows are L2-normalized, so the dot product is the
+    cosine).
+    """
+    
+    def __init__(self, vectorizer: Optional[Any] = None):
+        self.vectorizer = vectorizer
+    
+    @classmethod
+    def fit(cls, description: str, texts: List[str]) -> 'CorpusSimilarityModel':
+        """Fit the vocabulary over the job description and all resume texts"""
+        if not description:
+            return cls()
         
-        try:
-            self.nlp = spacy.load("en_core_web_sm")
-        except:
-            os.system("python -m spacy download en_core_web_sm")
-            self.nlp = spacy.load("en_core_web_sm")
+        from sklearn.feature_extraction.text import TfidfVectorizer
         
-        self.vectorizer = TfidfVectorizer(
+        vectorizer = TfidfVectorizer(
             max_features=500,
             stop_words='english',
             ngram_range=(1, 2)
         )
+        try:
+            vectorizer.fit([description] + texts)
+        except ValueError:
+            # Empty vocabulary, e.g. only stop words
+            return cls()
+        return cls(vectorizer)
+    
+    def score(self, description: str, texts: List[str]) -> np.ndarray:
+        """Cosine similarity of each text to the job description"""
+        if self.vectorizer is None or not description or not texts:
+            return np.zeros(len(texts))
+        
+        job_vector = self.vectorizer.transform([description])
+        resume_matrix = self.vectorizer.transform(texts)
+        return (resume_matrix @ job_vector.T).toarray().ravel()
+    
+    def save(self, path: Path, signature: str):
+        """Persist the fitted vocabulary for later incremental runs"""
+        with open(path, 'wb') as f:
+            pickle.dump({'signature': signature, 'vectorizer': self.vectorizer}, f)
+    
+    @classmethod
+    def load(cls, path: Path, signature: str) -> Optional['CorpusSimilarityModel']:
+        """Load a persisted vocabulary, or None if missing or fitted for other requirements"""
+        try:
+            with open(path, 'rb') as f:
+                stored = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return None
+        
+        if not isinstance(stored, dict) or stored.get('signature') != signature:
+            return None
+        return cls(stored['vectorizer'])
+
+
+class SkillBitmapIndex:
+    """Which skill-taxonomy patterns occur in each resume of a ticket, one bitset per resume.
+    
+    Every resume is matched once against the whole taxonomy (plus the ticket's
+    own required skills). When the required skills change, skill matching for
+    a new list is then answered from the bitsets with AND masks instead of
+    re-reading any resume: a skill is present when any of its variation bits
+    is set, or when all bits of its words are set.
+    """
+    
+    FILENAME = 'skill_index.npz'
+    
+    def __init__(self, vocabulary: List[str], word_boundaries: bool = False, filenames: Optional[List[str]] = None,
+                 bits: Optional[np.ndarray] = None, candidate_rows: Optional[np.ndarray] = None):
+        self.vocabulary = list(vocabulary)
+        self.word_boundaries = word_boundaries
+        self.position = {pattern: i for i, pattern in enumerate(self.vocabulary)}
+        self.filenames = filenames or []
+        self.bits = bits if bits is not None else np.zeros((0, self.num_bytes), dtype=np.uint8)
+        # Row of each file's (merged) candidate in the ticket's FeatureMatrix, -1 if none
+        self.candidate_rows = candidate_rows if candidate_rows is not None else np.full(len(self.filenames), -1)
+        self._matcher = None
+    
+    @classmethod
+    def for_skills(cls, resume_filter: 'UpdateAwareResumeFilter', required_skills: List[str]) -> 'SkillBitmapIndex':
+        """Index over the full taxonomy plus whatever the required skills need beyond it"""
+        vocabulary = resume_filter.skill_taxonomy_patterns() | resume_filter.skill_plan_patterns(required_skills)
+        return cls(sorted(vocabulary), resume_filter.word_boundaries)
     
-    def score_resume_comprehensive(self, resume_text: str, resume_path: Path, job_ticket: EnhancedJobTicket) -> Dict:
-        """Comprehensive scoring using multiple methods"""
-        base_scores = self.resume_filter.score_resume(resume_text, job_ticket)
+    @property
+    def num_bytes(self) -> int:
+        return (len(self.vocabulary) + 7) // 8
+    
+    def covers(self, resume_filter: 'UpdateAwareResumeFilter', required_skills: List[str]) -> bool:
+        """True if every pattern needed to match required_skills is indexed"""
+        return (resume_filter.word_boundaries == self.word_boundaries and
+                resume_filter.skill_plan_patterns(required_skills) <= self.position.keys())
+    
+    def encode(self, resume: Union[str, ParsedResume]) -> str:
+        """Hex bitset of the indexed patterns found in a resume"""
+        if self._matcher is None:
+            self._matcher = MultiPatternMatcher(self.vocabulary, word_boundaries=self.word_boundaries)
+        present = np.zeros(len(self.vocabulary), dtype=bool)
+        present[[self.position[pattern] for pattern in self._matcher.found(ParsedResume.ensure(resume).lower)]] = True
+        return np.packbits(present).tobytes().hex()
+    
+    def decode(self, encoded: str) -> Set[str]:
+        """Patterns whose bit is set in a hex bitset"""
+        present = np.unpackbits(np.frombuffer(bytes.fromhex(encoded), dtype=np.uint8), count=len(self.vocabulary))
+        return {self.vocabulary[i] for i in np.flatnonzero(present)}
+    
+    def _mask(self, patterns: List[str]) -> np.ndarray:
+        present = np.zeros(len(self.vocabulary), dtype=bool)
+        present[[self.position[pattern] for pattern in patterns]] = True
+        return np.packbits(present)
+    
+    def skill_matches(self, resume_filter: 'UpdateAwareResumeFilter', required_skills: List[str]) -> Tuple[np.ndarray, List[str]]:
+        """Boolean (files x skills) matrix of matched skills, and the skills with patterns outside the index"""
+        _, plan = resume_filter._compile_skill_plan(required_skills)
+        matched = np.zeros((len(self.filenames), len(plan)), dtype=bool)
+        unindexed = []
+        
+        for column, entry in enumerate(plan):
+            if not entry['skill_lower']:
+                matched[:, column] = True
+                continue
+            
+            patterns = [entry['skill_lower'], *entry['variations'], *entry['parts']]
+            if any(pattern not in self.position for pattern in patterns):
+                unindexed.append(entry['skill'])
+            
+            any_patterns = [p for p in (entry['skill_lower'], *entry['variations']) if p in self.position]
+            if any_patterns:
+                matched[:, column] = np.any(self.bits & self._mask(any_patterns), axis=1)
+            if entry['parts'] and all(part in self.position for part in entry['parts']):
+                all_mask = self._mask(entry['parts'])
+                matched[:, column] |= np.all((self.bits & all_mask) == all_mask, axis=1)
+        
+        return matched, unindexed
+    
+    def what_if(self, matrix: FeatureMatrix, required_skills: Union[str, List[str]],
+                weights: Union[Dict[str, float], List[float], None] = None, top_n: int = 10,
+                complete_rows: Optional[Callable[[List[int]], np.ndarray]] = None) -> Dict[str, Any]:
+        """Leaderboard of the ticket's candidates if required_skills replaced the current skill list;
+        complete_rows fills in pruned candidates that could make it (see FeatureMatrix.rerank)"""
+        required_skills = EnhancedJobTicket._parse_skills(required_skills)
+        if not required_skills:
+            raise ValueError("At least one skill is required")
+        
+        resume_filter = UpdateAwareResumeFilter(word_boundaries=self.word_boundaries)
+        matched, unindexed = self.skill_matches(resume_filter, required_skills)
+        file_scores = matched.sum(axis=1) / len(required_skills)
+        
+        # Duplicate groups keep their best submission's skill score, as in stage 1
+        skill_column = FEATURE_COLUMNS.index('skills')
+        features = matrix.features.copy()
+        features[:, skill_column] = 0.0
+        known = self.candidate_rows >= 0
+        np.maximum.at(features[:, skill_column], self.candidate_rows[known], file_scores[known].astype(np.float32))
+        
+        preview = FeatureMatrix(features, matrix.filenames, matrix.signature, matrix.complete)
+        leaderboard = preview.rerank(weights, top_n, complete_rows)
+        # Scores completed for the preview do not depend on the skills, so the ticket's matrix keeps them
+        completed = preview.complete & ~matrix.complete
+        for column in CASCADE_COLUMNS:
+            index = FEATURE_COLUMNS.index(column)
+            matrix.features[completed, index] = preview.features[completed, index]
+        matrix.complete |= completed
+        previous_ranks = {item['filename']: item['rank'] for item in matrix.rerank(weights, len(matrix))}
+        
+        row_of = {filename: row for row, filename in enumerate(matrix.filenames)}
+        for item in leaderboard:
+            files = np.flatnonzero(self.candidate_rows == row_of[item['filename']])
+            best = files[np.argmax(file_scores[files])] if len(files) else None
+            item['matched_skills'] = [skill for skill, hit in zip(required_skills, matched[best]) if hit] \
+                if best is not None else []
+            item['previous_rank'] = previous_ranks.get(item['filename'])
         
-        similarity_score = 0.0
-        if job_ticket.description:
-            try:
-                tfidf_matrix = self.vectorizer.fit_transform([job_ticket.description, resume_text])
-                similarity_score = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
-            except:
-                similarity_score = 0.0
+        return {
+            'required_skills': required_skills,
+            'unindexed_skills': unindexed,
+            'total_candidates': len(matrix),
+            'candidates': leaderboard
+        }
+    
+    def with_files(self, encoded: Dict[str, str], candidate_rows: Dict[str, int]) -> 'SkillBitmapIndex':
+        """Index over this vocabulary holding the given per-file hex bitsets"""
+        filenames = list(encoded)
+        bits = np.array([np.frombuffer(bytes.fromhex(encoded[name]), dtype=np.uint8) for name in filenames],
+                        dtype=np.uint8).reshape(len(filenames), self.num_bytes)
+        rows = np.array([candidate_rows.get(name, -1) for name in filenames], dtype=np.int64)
+        return SkillBitmapIndex(self.vocabulary, self.word_boundaries, filenames, bits, rows)
+    
+    def save(self, path: Path):
+        """Write the index as a compressed .npz next to the other filtering results"""
+        path = Path(path)
+        tmp_path = path.with_name(path.name + '.tmp.npz')
+        np.savez_compressed(
+            tmp_path,
+            vocabulary=np.array(self.vocabulary, dtype=str),
+            word_boundaries=np.array(self.word_boundaries),
+            filenames=np.array(self.filenames, dtype=str),
+            bits=self.bits,
+            candidate_rows=self.candidate_rows,
+        )
+        tmp_path.replace(path)
+    
+    @classmethod
+    def load(cls, path: Path) -> Optional['SkillBitmapIndex']:
+        """Stored index, or None if missing or unreadable"""
+        try:
+            with np.load(path, allow_pickle=False) as stored:
+                return cls([str(pattern) for pattern in stored['vocabulary']], bool(stored['word_boundaries']),
+                           [str(name) for name in stored['filenames']], stored['bits'], stored['candidate_rows'])
+        except (OSError, KeyError, ValueError):
+            return None
+
+
+class PrunedCandidateScorer:
+    """Professional development scores of candidates the scoring cascade pruned, computed on request.
+    
+    Passed as complete_rows to FeatureMatrix.rerank() and SkillBitmapIndex.what_if(), so
+    only pruned candidates that could reach the requested top N are read again (through
+    the extraction cache) and scored.
+    """
+    
+    def __init__(self, ticket_folder: Union[str, Path], matrix: FeatureMatrix, skill_index: SkillBitmapIndex,
+                 use_cache: bool = True):
+        self.ticket_folder = Path(ticket_folder)
+        self.matrix = matrix
+        self.skill_index = skill_index
+        self.extraction_cache = ExtractionCache.for_ticket_folder(self.ticket_folder) if use_cache else None
+        self.pd_scorer = get_professional_development_scorer()
+    
+    def __call__(self, rows: List[int]) -> np.ndarray:
+        column = FEATURE_COLUMNS.index('professional_dev')
+        filenames = np.array(self.skill_index.filenames, dtype=object)
+        values = []
+        for row in rows:
+            # A merged duplicate group keeps its best submission's score, and the row already
+            # holds the best of its completely scored submissions
+            best = float(self.matrix.features[row, column])
+            for name in filenames[self.skill_index.candidate_rows == row]:
+                resume_path = self.ticket_folder / name
+                parsed = ResumeExtractor.extract_parsed(resume_path, self.extraction_cache) \
+                    if resume_path.exists() else None
+                if parsed is None:
+                    logger.warning(f"Could not re-read {resume_path} to complete its score")
+                    continue
+                best = max(best, self.pd_scorer.calculate_professional_development_score(parsed)
+                           ['professional_development_score'])
+            values.append([best])
+        return np.array(values, dtype=np.float32)
+
+
+class UpdateAwareBasicFilter:
+    """Enhanced basic filter with comprehensive scoring and duplicate detection"""
+    
+    def __init__(self):
+        self.resume_filter = UpdateAwareResumeFilter()
+        self.duplicate_detector = DuplicateCandidateDetector()
+        self.duplicate_handler = DuplicateHandlingStrategy()
+    
+    @property
+    def nlp(self):
+        """spaCy pipeline from the process-wide registry, loaded on first use (None if not installed)"""
+        return get_spacy_model("en_core_web_sm")
+    
+    def score_resume_comprehensive(self, resume: Union[str, ParsedResume], resume_path: Path, job_ticket: EnhancedJobTicket,
+                                   similarity_score: float = 0.0, prefilter: bool = False) -> Dict:
+        """Comprehensive scoring using multiple methods; similarity_score comes from the CorpusSimilarityModel stage.
         
-        additional_features = self._extract_additional_features(resume_text)
+        prefilter=True skips the professional development stage (see UpdateAwareResumeFilter.score_resume);
+        complete_prefiltered() adds it for resumes that survive the cascade.
+        """
+        parsed = ParsedResume.ensure(resume)
+        base_scores = self.resume_filter.score_resume(parsed, job_ticket, professional_development=not prefilter)
+        
+        additional_features = self._extract_additional_features(parsed)
         
         result = {
             "file_path": str(resume_path),
@@ -1608,10 +2535,17 @@ class UpdateAwareBasicFilter:
             "scoring_weights": base_scores['scoring_weights'],
             "job_requirements_used": base_scores['job_requirements']
         }
+        if prefilter:
+            result['prefiltered'] = True
+            result['score_upper_bound'] = base_scores['score_upper_bound']
         
         return result
     
-    def _extract_additional_features(self, resume_text: str) -> Dict:
+    def complete_prefiltered(self, score: Dict, resume: Union[str, ParsedResume]) -> Dict:
+        """Run the stage a prefiltered score skipped; the result equals a full score_resume_comprehensive()"""
+        return self.resume_filter.complete_professional_development(score, ParsedResume.ensure(resume))
+    
+    def _extract_additional_features(self, resume: Union[str, ParsedResume]) -> Dict:
         """Extract additional features from resume"""
         features = {}
         
@@ -1622,7 +2556,7 @@ class UpdateAwareBasicFilter:
             'diploma': 1
         }
         
-        resume_lower = resume_text.lower()
+        resume_lower = ParsedResume.ensure(resume).lower
         education_score = 0
         for keyword, score in education_keywords.items():
             if keyword in resume_lower:
@@ -1642,16 +2576,39 @@ class UpdateAwareBasicFilter:
 class UpdatedResumeFilteringSystem:
     """Complete resume filtering system WITHOUT LLM - Pure algorithmic approach"""
     
-    def __init__(self, ticket_folder: str):
+    def __init__(self, ticket_folder: str, workers: int = 1, use_cache: bool = True,
+                 use_identity_index: bool = True, profile: Optional[str] = None,
+                 executor: Optional[Executor] = None, full_scoring: Optional[bool] = None):
         self.ticket_folder = Path(ticket_folder)
+        start = time.perf_counter()
         self.job_ticket = EnhancedJobTicket(ticket_folder)
+        self._ticket_load_seconds = time.perf_counter() - start
+        # Optional cProfile/tracemalloc capture of each run (RESUME_FILTER_PROFILE=cprofile|tracemalloc)
+        self.profiler = RunProfiler(profile or os.environ.get('RESUME_FILTER_PROFILE') or None)
+        self.run_profile = RunProfile(self.job_ticket.ticket_id)
         self.basic_filter = UpdateAwareBasicFilter()
+        # Number of processes used for extraction and scoring (None/0 = all cores)
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        # Process pool owned by the caller (e.g. a batch run) and shared with other tickets;
+        # its workers must be started with _init_batch_worker
+        self.executor = executor
+        # Scoring cascade: workers only compute the cheap stages and the expensive ones run for
+        # candidates that can still make the stage 1 shortlist (RESUME_FULL_SCORING=1 scores everything)
+        if full_scoring is None:
+            full_scoring = os.environ.get('RESUME_FULL_SCORING', '').lower() in ('1', 'true', 'yes')
+        self.cascade = not full_scoring
+        self.extraction_cache = ExtractionCache.for_ticket_folder(self.ticket_folder) if use_cache else None
+        self.identity_index = CandidateIdentityIndex.for_storage_root(self.ticket_folder.resolve().parent) \
+            if use_identity_index else None
         
         self.output_folder = self.ticket_folder / "filtering_results"
         self.output_folder.mkdir(exist_ok=True)
+        self.results_store = FilteringResultsStore(self.output_folder)
+        self.leaderboard = TicketLeaderboard(self.output_folder)
     
-    def filter_resumes(self) -> Dict:
-        """Main filtering method with pure algorithmic approach"""
+    def filter_resumes(self, incremental: bool = False, streaming: bool = False) -> Dict:
+        """Main filtering method; incremental=True only scores resumes that are new or changed since the last run,
+        streaming=True keeps memory bounded on tickets with very many resumes (see streaming_filter.py)"""
         print(f"\n{'='*70}")
         print(f"🚀 RESUME FILTERING SYSTEM (NO LLM)")
         print(f"{'='*70}")
@@ -1665,7 +2622,11 @@ class UpdatedResumeFilteringSystem:
         print(f"  • Deadline: {self.job_ticket.deadline}")
         print(f"{'='*70}\n")
         
-        resumes = self.job_ticket.get_resumes()
+        profile = self.run_profile = RunProfile(self.job_ticket.ticket_id)
+        profile.add('load_ticket', self._ticket_load_seconds)
+        with profile.span('load_ticket') as span:
+            resumes = self.job_ticket.get_resumes()
+            span['counters']['resumes'] = len(resumes)
         print(f"📄 Found {len(resumes)} resumes to process")
         
         if not resumes:
@@ -1674,68 +2635,469 @@ class UpdatedResumeFilteringSystem:
                 "ticket_id": self.job_ticket.ticket_id
             }
         
-        print("\n🔍 Stage 1: Algorithmic Filtering with Duplicate Detection...")
-        initial_results = self._basic_filtering_with_duplicates(resumes)
+        self.profiler.start()
+        try:
+            if streaming:
+                initial_results, leaderboard, staging = self._streaming_stage1(resumes, incremental)
+            else:
+                initial_results, leaderboard = self._standard_stage1(resumes, incremental)
+                staging = None
+        
+            print("\n🧮 Stage 2: Advanced Scoring and Ranking...")
+            with profile.span('advanced_scoring') as span:
+                final_results = self._advanced_scoring(initial_results)
+                span['counters']['candidates'] = len(initial_results['top_10'])
+        
+            with profile.span('write_results'):
+                with open(self.output_folder / "final_results.json", 'w') as f:
+                    json.dump(final_results, f, indent=2, default=str)
+                self._count_written(self.output_folder / "final_results.json")
+        
+            final_output = {
+                "ticket_id": self.job_ticket.ticket_id,
+                "position": self.job_ticket.position,
+                "timestamp": datetime.now().isoformat(),
+                "job_status": self.job_ticket.job_details.get('status', 'unknown'),
+                "requirements_last_updated": self.job_ticket.job_details.get('last_updated', ''),
+                "latest_requirements": {
+                    "experience": self.job_ticket.experience_required,
+                    "tech_stack": self.job_ticket.tech_stack,
+                    "location": self.job_ticket.location,
+                    "salary": self.job_ticket.salary_range,
+                    "deadline": self.job_ticket.deadline
+                },
+                "summary": {
+                    "total_resumes": len(resumes),
+                    "unique_candidates": initial_results.get('unique_candidates', len(resumes)),
+                    "duplicate_groups_found": initial_results.get('duplicate_groups_count', 0),
+                    "stage1_selected": len(initial_results["top_10"]),
+                    "final_selected": len(final_results.get("top_5_candidates", [])),
+                },
+                "duplicate_detection": initial_results.get('duplicate_summary', {}),
+                "stage1_results": initial_results,
+                "final_results": final_results,
+                "final_top_5": final_results.get("top_5_candidates", []),
+            }
         
-        with open(self.output_folder / "stage1_results.json", 'w') as f:
-            json.dump(initial_results, f, indent=2, default=str)
+            run_stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            profile.finish()
+            final_output["performance"] = profile.to_dict()
+            snapshot = self.profiler.stop(self.output_folder / f"profile_{self.job_ticket.ticket_id}_{run_stamp}")
+            if snapshot:
+                final_output["performance"]["profile"] = snapshot
+                print(f"🔬 {snapshot['mode']} snapshot saved to: {snapshot['summary_file']}")
+        finally:
+            # A run that raised must not leave cProfile or tracemalloc running
+            self.profiler.discard()
+        
+        # Timed after the performance block is taken, so these writes only show up in the process metrics
+        with profile.span('write_results'):
+            run_folder = self.results_store.save_run(
+                final_output, lambda report_path: self._create_enhanced_summary_report(final_output, report_path),
+                staging=staging
+            )
+            self._count_written(*(path for path in run_folder.iterdir()))
+            leaderboard.update(timestamp=final_output['timestamp'], run_id=run_folder.name,
+                               final_top_5=final_output['final_top_5'])
+            with self.leaderboard.locked():
+                self.leaderboard.save(leaderboard)
+            self._count_written(self.leaderboard.path)
+        FilteringMetrics.record(profile)
         
-        print("\n🧮 Stage 2: Advanced Scoring and Ranking...")
-        final_results = self._advanced_scoring(initial_results)
+        print(f"\n✅ Filtering complete! Results saved to: {run_folder}")
         
-        with open(self.output_folder / "final_results.json", 'w') as f:
-            json.dump(final_results, f, indent=2, default=str)
+        return final_output
+    
+    def _standard_stage1(self, resumes: List[Path], incremental: bool) -> Tuple[Dict, Dict]:
+        """Stage 1 over every resume in memory; returns its results and the leaderboard seed"""
+        profile = self.run_profile
+        print("\n🔍 Stage 1: Algorithmic Filtering with Duplicate Detection...")
+        initial_results = self._basic_filtering_with_duplicates(resumes, incremental=incremental)
         
-        final_output = {
-            "ticket_id": self.job_ticket.ticket_id,
-            "position": self.job_ticket.position,
-            "timestamp": datetime.now().isoformat(),
-            "job_status": self.job_ticket.job_details.get('status', 'unknown'),
-            "requirements_last_updated": self.job_ticket.job_details.get('last_updated', ''),
-            "latest_requirements": {
+        with profile.span('write_results'):
+            # Read back only by the next incremental run, so written compactly
+            with open(self.output_folder / "stage1_results.json", 'w') as f:
+                json.dump(initial_results, f, separators=(',', ':'), default=str)
+            
+            # Component scores of every unique candidate, for re-ranking without re-scoring,
+            # and which skill patterns each resume contains, for trying other skill lists
+            FeatureMatrix.from_scores(
+                initial_results['all_resumes'], initial_results['requirements_signature']
+            ).save(self.output_folder / FEATURE_MATRIX_FILENAME)
+            candidate_rows = {filename: row for row, item in enumerate(initial_results['all_resumes'])
+                              for filename in item.get('all_filenames', [item['filename']])}
+            SkillBitmapIndex(initial_results['skill_vocabulary'], initial_results['skill_word_boundaries']).with_files(
+                {name: entry['skill_bits'] for name, entry in initial_results['file_index'].items()}, candidate_rows
+            ).save(self.output_folder / SkillBitmapIndex.FILENAME)
+            self._count_written(self.output_folder / "stage1_results.json",
+                                self.output_folder / FEATURE_MATRIX_FILENAME,
+                                self.output_folder / SkillBitmapIndex.FILENAME)
+        
+        # Stage 2 re-sorts and annotates the shortlist in place; the leaderboard keeps the stage 1 view
+        leaderboard = self._leaderboard_seed(resumes, initial_results)
+        
+        # The per-file index and skill vocabulary are only needed by the next incremental run
+        initial_results = {k: v for k, v in initial_results.items()
+                           if k not in ('file_index', 'skill_vocabulary', 'skill_word_boundaries')}
+        return initial_results, leaderboard
+    
+    def _streaming_stage1(self, resumes: List[Path], incremental: bool) -> Tuple[Dict, Dict, Path]:
+        """Stage 1 streamed into a staged run folder; returns its results, the leaderboard seed and the folder"""
+        from streaming_filter import StreamingFilter
+        
+        print("\n🔍 Stage 1: Streaming Algorithmic Filtering with Duplicate Detection...")
+        if incremental:
+            print("  ℹ️ Streaming runs score every resume; --incremental is ignored")
+        staging = self.results_store.stage_run()
+        initial_results, leaderboard = StreamingFilter(self).run(resumes, staging)
+        
+        with self.run_profile.span('write_results'):
+            with open(self.output_folder / "stage1_results.json", 'w') as f:
+                json.dump(initial_results, f, separators=(',', ':'), default=str)
+            self._count_written(self.output_folder / "stage1_results.json")
+            # Re-ranking and what-if previews must not serve a previous run's candidates
+            for stale in (FEATURE_MATRIX_FILENAME, SkillBitmapIndex.FILENAME):
+                if (self.output_folder / stale).exists():
+                    (self.output_folder / stale).unlink()
+        return initial_results, leaderboard, staging
+    
+    def _leaderboard_seed(self, resumes: List[Path], initial_results: Dict) -> Dict:
+        """Leaderboard document for a finished stage 1, covering every resume of the run"""
+        file_index = initial_results['file_index']
+        shortlist = []
+        for candidate in initial_results['top_10']:
+            names = candidate.get('all_filenames', [candidate['filename']])
+            shortlist.append({'candidate': copy.deepcopy(candidate),
+                              'identifiers': [file_index[name]['identifiers'] for name in names]})
+        return self._empty_leaderboard(
+            shortlist=shortlist,
+            files={path.name: [path.stat().st_size, path.stat().st_mtime_ns] for path in resumes},
+            total_resumes=len(resumes)
+        )
+    
+    def _empty_leaderboard(self, **fields) -> Dict:
+        leaderboard = {
+            'ticket_id': self.job_ticket.ticket_id,
+            'position': self.job_ticket.position,
+            'requirements_signature': self._requirements_signature(),
+            'latest_requirements': {
                 "experience": self.job_ticket.experience_required,
                 "tech_stack": self.job_ticket.tech_stack,
                 "location": self.job_ticket.location,
                 "salary": self.job_ticket.salary_range,
                 "deadline": self.job_ticket.deadline
             },
-            "summary": {
-                "total_resumes": len(resumes),
-                "unique_candidates": initial_results.get('unique_candidates', len(resumes)),
-                "duplicate_groups_found": initial_results.get('duplicate_groups_count', 0),
-                "stage1_selected": len(initial_results["top_10"]),
-                "final_selected": len(final_results.get("top_5_candidates", [])),
-            },
-            "duplicate_detection": initial_results.get('duplicate_summary', {}),
-            "stage1_results": initial_results,
-            "final_results": final_results,
-            "final_top_5": final_results.get("top_5_candidates", []),
+            'timestamp': None,
+            'run_id': None,
+            'prescored': 0,
+            'total_resumes': 0,
+            'files': {},
+            'shortlist': [],
+            'final_top_5': []
+        }
+        leaderboard.update(fields)
+        return leaderboard
+    
+    def prescore_new_resumes(self) -> Dict:
+        """Score resumes the leaderboard does not cover yet into it, without a filtering run.
+        
+        Each new resume is extracted, scored in full against the cached job profile,
+        merged into a shortlisted candidate it duplicates, and the shortlist and its
+        stage 2 top candidates are updated. A leaderboard scored under other job
+        requirements, or covering files that were changed or removed since, cannot be
+        updated this way; it is marked stale until the next filtering run.
+        """
+        signature = self._requirements_signature()
+        leaderboard = self.leaderboard.load() or self._empty_leaderboard()
+        if leaderboard.get('stale'):
+            return {'status': 'stale', 'reason': leaderboard['stale']}
+        
+        stale_reason = None
+        resumes = {path.name: path for path in self.job_ticket.get_resumes()}
+        if leaderboard['requirements_signature'] != signature:
+            stale_reason = "job requirements or scoring changed since the leaderboard was built"
+        else:
+            changed = [name for name, (size, mtime_ns) in leaderboard['files'].items()
+                       if name not in resumes or (resumes[name].stat().st_size, resumes[name].stat().st_mtime_ns)
+                       != (size, mtime_ns)]
+            if changed:
+                stale_reason = f"{len(changed)} scored resume(s) changed or removed"
+        if stale_reason:
+            with self.leaderboard.locked():
+                leaderboard = self.leaderboard.load() or leaderboard
+                leaderboard['stale'] = stale_reason
+                self.leaderboard.save(leaderboard)
+            return {'status': 'stale', 'reason': stale_reason}
+        
+        new_resumes = [path for name, path in resumes.items() if name not in leaderboard['files']]
+        if not new_resumes:
+            return {'status': 'up_to_date', 'scored': 0}
+        
+        similarity_model = CorpusSimilarityModel.load(self.output_folder / "similarity_vocabulary.pkl",
+                                                      self._requirements_signature(include_tech_stack=False))
+        scored = []
+        for resume_path in new_resumes:
+            stat = resume_path.stat()
+            parsed, score_result, _ = _extract_and_score(resume_path, self.basic_filter, self.job_ticket,
+                                                         self.extraction_cache)
+            identifiers = None
+            if parsed is not None:
+                identifiers = self.basic_filter.duplicate_detector.extract_candidate_identifiers(parsed, resume_path.name)
+                score_result['file_path'] = str(resume_path)
+                score_result['has_duplicates'] = False
+                if similarity_model is not None:
+                    score_result['similarity_score'] = float(
+                        similarity_model.score(self.job_ticket.description, [parsed.text])[0]
+                    )
+            scored.append((resume_path.name, [stat.st_size, stat.st_mtime_ns], score_result, identifiers))
+        
+        with self.leaderboard.locked():
+            # Re-read: a filtering run may have replaced the leaderboard while these were scored
+            leaderboard = self.leaderboard.load() or self._empty_leaderboard()
+            if leaderboard.get('stale') or leaderboard['requirements_signature'] != signature:
+                return {'status': 'stale', 'reason': leaderboard.get('stale') or "leaderboard replaced"}
+            added = 0
+            for name, file_stat, score_result, identifiers in scored:
+                if name in leaderboard['files']:
+                    continue
+                leaderboard['files'][name] = file_stat
+                added += 1
+                if score_result is not None:
+                    self._offer_to_shortlist(leaderboard['shortlist'], score_result, identifiers)
+            leaderboard['prescored'] += added
+            leaderboard['total_resumes'] = len(leaderboard['files'])
+            stage2 = self._advanced_scoring({'top_10': [copy.deepcopy(entry['candidate'])
+                                                        for entry in leaderboard['shortlist']]})
+            leaderboard['final_top_5'] = stage2['top_5_candidates']
+            self.leaderboard.save(leaderboard)
+        
+        return {'status': 'updated', 'scored': added,
+                'shortlisted': [entry['candidate']['filename'] for entry in leaderboard['shortlist']]}
+    
+    def _offer_to_shortlist(self, shortlist: List[Dict], score_result: Dict, identifiers: Dict):
+        """Add a scored resume to the shortlist, merged into the candidate it duplicates, keeping the best"""
+        detector = DuplicateCandidateDetector()
+        owner = {}
+        for position, entry in enumerate(shortlist):
+            for member in entry['identifiers']:
+                candidate_id, _ = detector.add_identifiers(dict(member))
+                owner[candidate_id] = position
+        _, duplicates = detector.add_identifiers(dict(identifiers))
+        
+        if duplicates:
+            # Same candidate as a shortlisted one: the group keeps its best scores, as in stage 1
+            entry = shortlist[owner[duplicates[0]['candidate_id']]]
+            filenames = entry['candidate'].get('all_filenames', [entry['candidate']['filename']])
+            merged = self.basic_filter.duplicate_handler.merge_scores([entry['candidate'], score_result])
+            merged['all_filenames'] = filenames + [score_result['filename']]
+            merged['duplicate_count'] = len(merged['all_filenames'])
+            merged['duplicate_info']['count'] = merged['duplicate_count']
+            merged['duplicate_info']['filenames'] = merged['all_filenames']
+            entry['candidate'] = merged
+            entry['identifiers'].append(identifiers)
+        else:
+            shortlist.append({'candidate': score_result, 'identifiers': [identifiers]})
+        
+        # Stable, so candidates already listed win ties as earlier files do in stage 1
+        shortlist.sort(key=lambda entry: entry['candidate']['final_score'], reverse=True)
+        del shortlist[STAGE1_SHORTLIST:]
+    
+    def _count_written(self, *paths: Path):
+        """Add the given output files to the write_results counters"""
+        for path in paths:
+            self.run_profile.count('write_results', files_written=1, bytes_written=path.stat().st_size)
+    
+    def _extract_and_score_all(self, resumes: List[Path]) -> List[Tuple[Optional[ParsedResume], Optional[Dict], Dict]]:
+        """Extract and score every resume, serially or on a process pool, preserving input order"""
+        workers = min(self.workers, len(resumes))
+        
+        if self.executor is not None and resumes:
+            # Chunks of this ticket interleave with other tickets' chunks on the shared pool
+            print(f"  Processing {len(resumes)} resumes on the shared worker pool...")
+            chunksize = max(1, len(resumes) // (self.workers * 4))
+            futures = [self.executor.submit(_extract_and_score_chunk, self.job_ticket, self.extraction_cache,
+                                            resumes[i:i + chunksize], self.cascade)
+                       for i in range(0, len(resumes), chunksize)]
+            return [item for future in futures for item in future.result()]
+        
+        if workers <= 1:
+            processed = []
+            for i, resume_path in enumerate(resumes):
+                print(f"  Processing {i+1}/{len(resumes)}: {resume_path.name}")
+                processed.append(_extract_and_score(resume_path, self.basic_filter, self.job_ticket,
+                                                    self.extraction_cache, self.cascade))
+            return processed
+        
+        print(f"  Processing {len(resumes)} resumes on {workers} worker processes...")
+        chunksize = max(1, len(resumes) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, mp_context=worker_process_context(),
+                                 initializer=_init_scoring_worker,
+                                 initargs=(self.job_ticket, self.extraction_cache, self.cascade)) as executor:
+            return list(executor.map(_extract_and_score_worker, resumes, chunksize=chunksize))
+    
+    def _requirements_signature(self, include_tech_stack: bool = True) -> str:
+        """Hash of everything a stored per-resume score depends on besides the resume itself"""
+        requirements = {
+            'scoring_version': SCORING_VERSION,
+            'skill_word_boundaries': self.basic_filter.resume_filter.word_boundaries,
+            'extractor_version': extractor_version(),
+            'position': self.job_ticket.position,
+            'experience': self.job_ticket.experience_required,
+            'location': self.job_ticket.location,
+            'description': self.job_ticket.description
         }
+        if include_tech_stack:
+            requirements['tech_stack'] = self.job_ticket.tech_stack
+            # Skill scores also depend on the synonyms each required skill resolves to
+            requirements['skill_taxonomy'] = get_skill_taxonomy().signature
+        return hashlib.sha256(json.dumps(requirements, sort_keys=True, default=str).encode()).hexdigest()
+    
+    def _load_previous_results(self) -> Tuple[Optional[Dict], str]:
+        """Load the last run's stage 1 results if its per-file scores can still be reused"""
+        stage1_file = self.output_folder / "stage1_results.json"
+        if not stage1_file.exists():
+            return None, "no previous run found"
         
-        output_file = self.output_folder / f"final_results_{self.job_ticket.ticket_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(output_file, 'w') as f:
-            json.dump(final_output, f, indent=2, default=str)
+        try:
+            with open(stage1_file, 'r') as f:
+                previous = json.load(f)
+        except (OSError, ValueError) as e:
+            return None, f"previous results unreadable ({e})"
         
-        self._create_enhanced_summary_report(final_output)
+        if not previous.get('file_index'):
+            return None, "previous run has no file index"
         
-        print(f"\n✅ Filtering complete! Results saved to: {output_file}")
+        if not previous.get('skill_vocabulary'):
+            return None, "previous run has no skill index"
         
-        return final_output
+        if previous.get('requirements_signature') == self._requirements_signature():
+            return previous, "previous run reusable"
+        
+        # Only the required skills changed: skill scores can be recomputed from the skill index
+        skill_index = SkillBitmapIndex(previous['skill_vocabulary'], previous.get('skill_word_boundaries', False))
+        if (previous.get('base_requirements_signature') == self._requirements_signature(include_tech_stack=False)
+                and skill_index.covers(self.basic_filter.resume_filter, self.job_ticket.tech_stack)):
+            return previous, "required skills changed; skill scores recomputed from the skill index"
+        
+        return None, "job requirements or scoring changed since the last run"
     
-    def _basic_filtering_with_duplicates(self, resumes: List[Path]) -> Dict:
+    def _basic_filtering_with_duplicates(self, resumes: List[Path], incremental: bool = False) -> Dict:
         """Stage 1 with duplicate detection and handling"""
         
+        previous_results, reason = self._load_previous_results() if incremental else (None, "full run requested")
+        similarity_file = self.output_folder / "similarity_vocabulary.pkl"
+        # TF-IDF similarity only depends on the description, never on the required skills
+        similarity_signature = self._requirements_signature(include_tech_stack=False)
+        similarity_model = None
+        if previous_results is not None:
+            # Reused similarity scores are only comparable with new ones in the same vocabulary
+            similarity_model = CorpusSimilarityModel.load(similarity_file, similarity_signature)
+            if similarity_model is None:
+                previous_results, reason = None, "no persisted TF-IDF vocabulary"
+        if incremental and previous_results is None:
+            print(f"\n♻️ Incremental mode: falling back to a full run ({reason})")
+        
+        previous_index = previous_results['file_index'] if previous_results is not None else None
+        skills_changed = (previous_results is not None and
+                          previous_results.get('requirements_signature') != self._requirements_signature())
+        resume_filter = self.basic_filter.resume_filter
+        if previous_results is not None:
+            skill_index = SkillBitmapIndex(previous_results['skill_vocabulary'], resume_filter.word_boundaries)
+        else:
+            skill_index = SkillBitmapIndex.for_skills(resume_filter, self.job_ticket.tech_stack)
+        
+        # Diff the folder against the previous run: size and mtime identify
+        # untouched files cheaply, the content hash catches rewritten ones.
+        file_index = {}
+        to_process = []
+        for resume_path in resumes:
+            stat = resume_path.stat()
+            entry = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+            previous = (previous_index or {}).get(resume_path.name)
+            
+            if previous and previous.get('size') == entry['size'] and previous.get('mtime_ns') == entry['mtime_ns']:
+                entry = dict(previous)
+            else:
+                entry['sha256'] = ExtractionCache.file_digest(resume_path)
+                if previous and previous.get('sha256') == entry['sha256']:
+                    entry['identifiers'] = previous['identifiers']
+                    entry['score'] = previous['score']
+                    entry['skill_bits'] = previous['skill_bits']
+            
+            # Scores the last cascade pruned are reused as they are; _complete_shortlist re-reads
+            # such a resume only if its upper bound can reach this run's shortlist
+            if 'score' not in entry:
+                to_process.append(resume_path)
+            elif skills_changed:
+                entry['score'] = self._rescore_skills(entry['score'], skill_index.decode(entry['skill_bits']))
+            file_index[resume_path.name] = entry
+        
+        incremental_summary = {
+            'mode': 'incremental' if previous_index is not None else 'full',
+            'reason': reason,
+            'reused': len(resumes) - len(to_process),
+            'scored': len(to_process)
+        }
+        if previous_index is not None:
+            print(f"\n♻️ Incremental mode: reusing {incremental_summary['reused']} unchanged resume(s), "
+                  f"scoring {incremental_summary['scored']} new or changed")
+        
+        print("\n📊 Extracting and scoring resumes...")
+        profile = self.run_profile
+        start = time.perf_counter()
+        processed = self._extract_and_score_all(to_process)
+        pool_seconds = time.perf_counter() - start
+        
+        new_texts = []
+        new_names = []
+        # Parsed resumes of this run, kept while the cascade may still have to complete their scores
+        parsed_resumes = {}
+        extraction_timings = {}
+        worker_seconds = {'extract': 0.0, 'score': 0.0}
+        for resume_path, (parsed, score_result, stats) in zip(to_process, processed):
+            for stage, seconds in stats.pop('spans', {}).items():
+                worker_seconds[stage] += seconds
+            extraction_timings[resume_path.name] = stats
+            profile.count('extract', files=1, bytes_read=file_index[resume_path.name]['size'],
+                          pages_parsed=stats.get('pages', 0), cache_hits=int(bool(stats.get('cached'))),
+                          failures=int(parsed is None))
+            if parsed is None:
+                print(f"    ⚠️ Failed to extract text from {resume_path.name}")
+                del file_index[resume_path.name]
+                continue
+            
+            file_index[resume_path.name]['identifiers'] = \
+                self.basic_filter.duplicate_detector.extract_candidate_identifiers(parsed, resume_path.name)
+            file_index[resume_path.name]['score'] = score_result
+            file_index[resume_path.name]['skill_bits'] = skill_index.encode(parsed)
+            profile.count('score', resumes=1,
+                          patterns_matched=len(skill_index.decode(file_index[resume_path.name]['skill_bits'])))
+            new_texts.append(parsed.text)
+            new_names.append(resume_path.name)
+            if score_result.get('prefiltered'):
+                parsed_resumes[resume_path.name] = parsed
+        
+        # The pool's wall time, split between the stages in proportion to the per-resume timings
+        # (their sum exceeds the wall time when several workers run at once)
+        total_worker_seconds = sum(worker_seconds.values())
+        for stage, seconds in worker_seconds.items():
+            share = seconds / total_worker_seconds if total_worker_seconds else 0.0
+            profile.add(stage, pool_seconds * share, worker_seconds=seconds)
+        profile.count('score', reused=incremental_summary['reused'])
+        
         print("\n🔍 Detecting duplicate candidates...")
+        start = time.perf_counter()
         
+        self.basic_filter.duplicate_detector.reset()
         duplicate_map = {}
         
         for resume_path in resumes:
-            resume_text = ResumeExtractor.extract_text(resume_path)
-            if not resume_text:
+            entry = file_index.get(resume_path.name)
+            if entry is None:
                 continue
             
-            candidate_id, duplicates = self.basic_filter.duplicate_detector.add_candidate(
-                resume_text, resume_path.name
+            candidate_id, duplicates = self.basic_filter.duplicate_detector.add_identifiers(
+                dict(entry['identifiers'])
             )
             
             duplicate_map[resume_path.name] = {
@@ -1750,28 +3112,68 @@ class UpdatedResumeFilteringSystem:
         
         dup_groups = self.basic_filter.duplicate_detector.get_duplicate_groups()
         
-        print("\n📊 Scoring resumes...")
+        # Register this ticket's submissions in the cross-ticket identity index
+        ticket_id = CandidateIdentityIndex.ticket_id_for_folder(self.ticket_folder)
+        identity_ids = {}
+        applications = {}
+        if self.identity_index is not None:
+            identity_ids = self.identity_index.register_ticket(
+                ticket_id, [(name, entry['identifiers']) for name, entry in file_index.items() if 'identifiers' in entry]
+            )
+            applications = self.identity_index.applications(list(identity_ids.values()))
+        profile.add('dedupe', time.perf_counter() - start,
+                    comparisons=self.basic_filter.duplicate_detector.comparisons, groups=len(dup_groups))
+        
+        with profile.span('score') as span:
+            prefiltered = sum(1 for entry in file_index.values() if entry['score'].get('prefiltered'))
+            resume_paths = {resume_path.name: resume_path for resume_path in resumes}
+            pruned, reread = self._complete_shortlist(file_index, dup_groups, parsed_resumes, resume_paths) \
+                if prefiltered else ({}, 0)
+            cascade_summary = {
+                'enabled': self.cascade,
+                'shortlist_size': STAGE1_SHORTLIST,
+                'completed': prefiltered - len(pruned),
+                'pruned': len(pruned),
+                'reread': reread
+            }
+            if prefiltered:
+                print(f"\n✂️ Scoring cascade: completed {cascade_summary['completed']} resume(s), "
+                      f"skipped professional development scoring for {cascade_summary['pruned']} that cannot "
+                      f"reach the top {STAGE1_SHORTLIST}")
+            span['counters']['completed'] = cascade_summary['completed']
+            span['counters']['pruned'] = cascade_summary['pruned']
+            
+            # Every new resume gets a similarity, so re-ranking by it needs no re-scoring
+            description = self.job_ticket.description
+            if similarity_model is None:
+                similarity_model = CorpusSimilarityModel.fit(description, new_texts)
+                similarity_model.save(similarity_file, similarity_signature)
+            for name, similarity in zip(new_names, similarity_model.score(description, new_texts)):
+                file_index[name]['score']['similarity_score'] = float(similarity)
+            span['counters']['similarity_scored'] = len(new_texts)
+        
+        start = time.perf_counter()
         scored_resumes = []
-        processed_candidates = set()
         
-        for i, resume_path in enumerate(resumes):
-            print(f"  Processing {i+1}/{len(resumes)}: {resume_path.name}")
-            
-            resume_text = ResumeExtractor.extract_text(resume_path)
-            if not resume_text:
-                print(f"    ⚠️ Failed to extract text from {resume_path.name}")
+        for resume_path in resumes:
+            entry = file_index.get(resume_path.name)
+            if entry is None:
                 continue
             
+            # Copy so the stored per-file score stays free of run-specific fields
+            score_result = dict(entry['score'])
+            score_result['file_path'] = str(resume_path)
+            
             candidate_info = duplicate_map.get(resume_path.name, {})
             candidate_id = candidate_info.get('candidate_id')
             
-            score_result = self.basic_filter.score_resume_comprehensive(
-                resume_text, 
-                resume_path,
-                self.job_ticket
-            )
-            
             score_result['candidate_id'] = candidate_id
+            identity_id = identity_ids.get(resume_path.name)
+            if identity_id:
+                score_result['identity_id'] = identity_id
+                score_result['other_applications'] = [
+                    app for app in applications.get(identity_id, []) if app['ticket_id'] != ticket_id
+                ]
             
             if candidate_info.get('duplicates'):
                 score_result['has_duplicates'] = True
@@ -1783,9 +3185,18 @@ class UpdatedResumeFilteringSystem:
             scored_resumes.append(score_result)
         
         final_scored_resumes = self._merge_duplicate_scores(scored_resumes, dup_groups)
+        for candidate in final_scored_resumes:
+            bounds = [pruned[name] for name in candidate.get('all_filenames', [candidate['filename']])
+                      if name in pruned]
+            if bounds:
+                # final_score is only a lower bound for these candidates
+                candidate['prefiltered'] = True
+                candidate['score_upper_bound'] = max(bounds)
         
         final_scored_resumes.sort(key=lambda x: x["final_score"], reverse=True)
-        top_10 = final_scored_resumes[:10]
+        top_10 = final_scored_resumes[:STAGE1_SHORTLIST]
+        profile.add('merge', time.perf_counter() - start,
+                    candidates_in=len(scored_resumes), candidates_out=len(final_scored_resumes))
         
         print("\n📊 Top Candidates (after duplicate handling):")
         for i, candidate in enumerate(top_10[:min(len(top_10), 5)]):
@@ -1800,6 +3211,7 @@ class UpdatedResumeFilteringSystem:
             "total_resumes_submitted": len(resumes),
             "unique_candidates": len(final_scored_resumes),
             "duplicate_groups_found": len(dup_groups),
+            "candidates_in_other_tickets": sum(1 for item in final_scored_resumes if item.get('other_applications')),
             "duplicate_groups": [
                 {
                     "group_size": len(group),
@@ -1824,44 +3236,122 @@ class UpdatedResumeFilteringSystem:
             },
             "duplicate_summary": duplicate_summary,
             "unique_candidates": len(final_scored_resumes),
-            "duplicate_groups_count": len(dup_groups)
+            "duplicate_groups_count": len(dup_groups),
+            "incremental": incremental_summary,
+            "cascade": cascade_summary,
+            "extraction": self._extraction_summary(extraction_timings),
+            "requirements_signature": self._requirements_signature(),
+            "base_requirements_signature": similarity_signature,
+            "skill_vocabulary": skill_index.vocabulary,
+            "skill_word_boundaries": skill_index.word_boundaries,
+            "file_index": file_index
+        }
+    
+    def _complete_shortlist(self, file_index: Dict[str, Dict], dup_groups: List[List[Dict]],
+                            parsed_resumes: Dict[str, ParsedResume],
+                            resume_paths: Dict[str, Path]) -> Tuple[Dict[str, float], int]:
+        """Scoring cascade: complete prefiltered scores, best upper bound first, until no remaining
+        candidate can reach the stage 1 shortlist. Returns the upper bound of each file left
+        prefiltered, and how many resumes had to be read again.
+        
+        A duplicate group ranks as its best submission, exactly as after merging. Since
+        upper bounds never underestimate, every candidate of a full run's shortlist is
+        completed and the shortlist comes out the same. Scores pruned by an earlier run
+        are completed too when they can now reach the shortlist; their resumes are read
+        again through the extraction cache.
+        """
+        grouped = set()
+        units = []
+        for group in dup_groups:
+            units.append([item['filename'] for item in group if item['filename'] in file_index])
+            grouped.update(units[-1])
+        units += [[name] for name in file_index if name not in grouped]
+        
+        def upper_bound(name: str) -> float:
+            score = file_index[name]['score']
+            return score.get('score_upper_bound', score['final_score'])
+        
+        bounds = [max(upper_bound(name) for name in unit) for unit in units]
+        shortlist = []  # min-heap of the best complete candidate scores so far
+        pruned = {}
+        reread = 0
+        for position in sorted(range(len(units)), key=lambda i: bounds[i], reverse=True):
+            unit = units[position]
+            if len(shortlist) >= STAGE1_SHORTLIST and bounds[position] < shortlist[0]:
+                pruned.update((name, bounds[position]) for name in unit
+                              if file_index[name]['score'].get('prefiltered'))
+                continue
+            for name in unit:
+                if not file_index[name]['score'].get('prefiltered'):
+                    continue
+                parsed = parsed_resumes.get(name)
+                if parsed is None:
+                    parsed = ResumeExtractor.extract_parsed(resume_paths[name], self.extraction_cache)
+                    reread += 1
+                if parsed is None:
+                    print(f"    ⚠️ Failed to re-read {name}; keeping its partial score")
+                    pruned[name] = bounds[position]
+                    continue
+                file_index[name]['score'] = self.basic_filter.complete_prefiltered(file_index[name]['score'], parsed)
+            best = max(file_index[name]['score']['final_score'] for name in unit)
+            if len(shortlist) < STAGE1_SHORTLIST:
+                heapq.heappush(shortlist, best)
+            else:
+                heapq.heappushpop(shortlist, best)
+        return pruned, reread
+    
+    @staticmethod
+    def _extraction_summary(extraction_timings: Dict[str, Dict]) -> Dict:
+        """Per-file extraction timings of this run, with the slow, cut-short and failed files pulled out"""
+        extracted = {name: stats for name, stats in extraction_timings.items() if not stats.get('cached')}
+        return {
+            "files_extracted": len(extracted),
+            "files_from_cache": len(extraction_timings) - len(extracted),
+            "total_seconds": round(sum(stats.get('seconds', 0.0) for stats in extracted.values()), 4),
+            "slowest": sorted(extracted, key=lambda name: extracted[name].get('seconds', 0.0), reverse=True)[:5],
+            "truncated": [name for name, stats in extracted.items() if stats.get('truncated')],
+            "failed": {name: stats['error'] for name, stats in extracted.items() if stats.get('error')},
+            "files": extraction_timings
         }
     
+    def _rescore_skills(self, score: Dict, found: Set[str]) -> Dict:
+        """Stored per-resume score updated for the current required skills"""
+        resume_filter = self.basic_filter.resume_filter
+        skill_score, matched_skills, detailed_matches = resume_filter.skill_match_from_found(
+            found, self.job_ticket.tech_stack
+        )
+        
+        score = dict(score)
+        score['skill_score'] = skill_score
+        score['matched_skills'] = matched_skills
+        score['detailed_skill_matches'] = detailed_matches
+        score['final_score'] = resume_filter.combine_scores(
+            score['scoring_weights'], skill_score, score['experience_score'],
+            score['location_score'], score['professional_development_score']
+        )
+        if score.get('prefiltered'):
+            score['score_upper_bound'] = resume_filter.combine_scores(
+                score['scoring_weights'], skill_score, score['experience_score'], score['location_score'], 1.0
+            )
+        score['job_requirements_used'] = dict(score['job_requirements_used'],
+                                              required_skills=self.job_ticket.tech_stack)
+        return score
+    
     def _merge_duplicate_scores(self, scored_resumes: List[Dict], dup_groups: List[List[Dict]]) -> List[Dict]:
         """Merge scores for duplicate candidates"""
-        
-        id_to_resumes = defaultdict(list)
-        for resume in scored_resumes:
-            if resume.get('candidate_id'):
-                id_to_resumes[resume['candidate_id']].append(resume)
-        
-        final_results = []
-        processed_ids = set()
-        
-        for group in dup_groups:
-            group_candidate_ids = [item['candidate_id'] for item in group]
-            group_resumes = []
-            
-            for cid in group_candidate_ids:
-                if cid in id_to_resumes:
-                    group_resumes.extend(id_to_resumes[cid])
-            
-            if group_resumes:
-                merged_candidate = self.basic_filter.duplicate_handler.merge_scores(group_resumes)
-                final_results.append(merged_candidate)
-                
-                for cid in group_candidate_ids:
-                    processed_ids.add(cid)
+        group_of = {item['candidate_id']: index for index, group in enumerate(dup_groups) for item in group}
+        group_resumes = [[] for _ in dup_groups]
+        single_resumes = []
         
         for resume in scored_resumes:
-            cid = resume.get('candidate_id')
-            if cid and cid not in processed_ids:
-                final_results.append(resume)
-                processed_ids.add(cid)
-            elif not cid:
-                final_results.append(resume)
+            index = group_of.get(resume.get('candidate_id'))
+            if index is None:
+                single_resumes.append(resume)
+            else:
+                group_resumes[index].append(resume)
         
-        return final_results
+        merged = [self.basic_filter.duplicate_handler.merge_scores(resumes) for resumes in group_resumes if resumes]
+        return merged + single_resumes
     
     def _advanced_scoring(self, initial_results: Dict) -> Dict:
         """Stage 2: Advanced algorithmic scoring without LLM"""
@@ -1936,9 +3426,10 @@ class UpdatedResumeFilteringSystem:
         
         return "; ".join(reasons).capitalize()
     
-    def _create_enhanced_summary_report(self, results: Dict):
+    def _create_enhanced_summary_report(self, results: Dict, report_path: Optional[Path] = None):
         """Create detailed summary report"""
-        report_path = self.output_folder / f"summary_report_{self.job_ticket.ticket_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+        report_path = report_path or \
+            self.output_folder / f"summary_report_{self.job_ticket.ticket_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
         
         with open(report_path, 'w') as f:
             f.write(f"RESUME FILTERING SUMMARY REPORT (NO LLM)\n")
@@ -1995,6 +3486,68 @@ class UpdatedResumeFilteringSystem:
         print(f"\n📄 Summary report created: {report_path}")
 
 
+# Per-process state for the parallel scoring pool. Each worker builds its own
+# filter once in the initializer instead of once per resume.
+_worker_context: Dict[str, Any] = {}
+
+
+def worker_process_context():
+    """Start method for worker pools: forked children of a threaded server (pre-scoring thread, open
+    SQLite handles) could inherit held locks, so workers come from a clean forkserver where available"""
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+
+def _init_scoring_worker(job_ticket: EnhancedJobTicket, extraction_cache: Optional[ExtractionCache],
+                         prefilter: bool = False):
+    """Initialize a scoring worker process"""
+    _worker_context['job_ticket'] = job_ticket
+    _worker_context['basic_filter'] = UpdateAwareBasicFilter()
+    _worker_context['extraction_cache'] = extraction_cache
+    _worker_context['prefilter'] = prefilter
+
+
+def _extract_and_score(resume_path: Path, basic_filter: UpdateAwareBasicFilter,
+                       job_ticket: EnhancedJobTicket,
+                       extraction_cache: Optional[ExtractionCache] = None,
+                       prefilter: bool = False) -> Tuple[Optional[ParsedResume], Optional[Dict], Dict]:
+    """Extract and parse one resume once, then score it (only the cheap stages if prefilter);
+    parsed and score are None if extraction failed"""
+    stats = {}
+    start = time.perf_counter()
+    parsed = ResumeExtractor.extract_parsed(resume_path, extraction_cache, stats)
+    # Wall time of extraction plus parsing and of scoring, for the run's timing spans
+    stats['spans'] = {'extract': time.perf_counter() - start}
+    if parsed is None:
+        return None, None, stats
+    
+    start = time.perf_counter()
+    score_result = basic_filter.score_resume_comprehensive(parsed, resume_path, job_ticket, prefilter=prefilter)
+    stats['spans']['score'] = time.perf_counter() - start
+    return parsed, score_result, stats
+
+
+def _extract_and_score_worker(resume_path: Path) -> Tuple[Optional[ParsedResume], Optional[Dict], Dict]:
+    """Process-pool entry point for _extract_and_score"""
+    return _extract_and_score(resume_path, _worker_context['basic_filter'], _worker_context['job_ticket'],
+                              _worker_context['extraction_cache'], _worker_context['prefilter'])
+
+
+def _init_batch_worker():
+    """Initialize a worker of a pool shared by several tickets; the ticket travels with each chunk"""
+    _worker_context['basic_filter'] = UpdateAwareBasicFilter()
+
+
+def _extract_and_score_chunk(job_ticket: EnhancedJobTicket, extraction_cache: Optional[ExtractionCache],
+                             resume_paths: List[Path],
+                             prefilter: bool = False) -> List[Tuple[Optional[ParsedResume], Optional[Dict], Dict]]:
+    """Shared-pool entry point: extract and score a chunk of one ticket's resumes"""
+    if 'basic_filter' not in _worker_context:
+        _init_batch_worker()
+    return [_extract_and_score(resume_path, _worker_context['basic_filter'], job_ticket, extraction_cache, prefilter)
+            for resume_path in resume_paths]
+
+
 def main():
     """Main function for running the resume filter without LLM"""
     import sys
@@ -2002,6 +3555,16 @@ def main():
     
     parser = argparse.ArgumentParser(description='Resume Filtering System WITHOUT LLM')
     parser.add_argument('ticket_folder', help='Path to the ticket folder containing resumes and job details')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Number of worker processes for extraction and scoring (0 = all cores)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only score resumes that are new or changed since the last run')
+    parser.add_argument('--profile', choices=RunProfiler.MODES,
+                        help='Save a cProfile or tracemalloc snapshot of the run next to the results')
+    parser.add_argument('--full-scoring', action='store_true',
+                        help='Run every scoring stage for every resume instead of the scoring cascade')
+    parser.add_argument('--streaming', action='store_true',
+                        help='Stream results to disk and keep only the shortlist in memory (for very large tickets)')
     
     args = parser.parse_args()
     
@@ -2011,9 +3574,10 @@ def main():
     
     try:
         print("🚀 Initializing Resume Filtering System (No LLM Required)...")
-        filter_system = UpdatedResumeFilteringSystem(args.ticket_folder)
+        filter_system = UpdatedResumeFilteringSystem(args.ticket_folder, workers=args.workers,
+                                                     profile=args.profile, full_scoring=args.full_scoring or None)
         
-        results = filter_system.filter_resumes()
+        results = filter_system.filter_resumes(incremental=args.incremental, streaming=args.streaming)
         
         if "error" not in results:
             print(f"\n{'='*70}")
@@ -2022,6 +3586,8 @@ def main():
             print(f"Total resumes processed: {results['summary']['total_resumes']}")
             print(f"Unique candidates identified: {results['summary']['unique_candidates']}")
             print(f"Duplicate groups found: {results['summary']['duplicate_groups_found']}")
+            print(f"Time per stage: " + ", ".join(
+                f"{name} {span['seconds']:.2f}s" for name, span in results['performance']['spans'].items()))
             print(f"\nTop candidates:")
             for i, candidate in enumerate(results['final_top_5']):
                 print(f"  {i+1}. {candidate['filename']}")
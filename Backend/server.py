@@ -7,7 +7,6 @@ Combines: Chat Bot + All API Endpoints + Resume Management + Cloudflare Tunnel +
 from flask import Flask, jsonify, request, send_file, render_template_string
 from flask_cors import CORS
 from flask_socketio import SocketIO, emit
-import mysql.connector
 from mysql.connector import Error
 from datetime import datetime
 import json
@@ -34,6 +33,7 @@ from email import encoders
 import ssl
 from threading import Thread
 import hashlib
+import importlib.util
 import secrets
 try:
     import jwt
@@ -53,6 +53,12 @@ from datetime import datetime, timedelta
 
 # Import AI bot handler
 from ai_bot3 import ChatBotHandler, Config
+from model_registry import ModelRegistry
+from filtering_metrics import FilteringMetrics, RunProfiler
+from db_pool import get_mysql_pool, pool_metrics, prometheus as db_pool_prometheus
+from skill_taxonomy import get_skill_taxonomy, reload_skill_taxonomy, taxonomy_path
+from prescoring import get_prescoring_pipeline
+from results_store import FilteringResultsStore, TicketLeaderboard
 
 # ============================================
 # CONFIGURATION - HARDCODED
@@ -137,10 +143,9 @@ logger.info("Chat bot handler initialized successfully")
 # ============================================
 
 def get_db_connection():
-    """Create and return database connection"""
+    """Check a connection out of the shared pool; conn.close() returns it"""
     try:
-        conn = mysql.connector.connect(**MYSQL_CONFIG)
-        return conn
+        return get_mysql_pool(MYSQL_CONFIG).connection()
     except Error as e:
         logger.error(f"Database connection failed: {e}")
         return None
@@ -941,6 +946,43 @@ def save_resume_to_ticket(ticket_id, file, applicant_name=None, applicant_email=
         logger.error(f"Error saving resume for ticket {ticket_id}: {e}")
         return None
 
+def register_resume_identity(file_path, applicant_email=None, applicant_phone=None):
+    """Record an uploaded resume in the cross-ticket candidate identity index"""
+    try:
+        from resume_filter5 import (CandidateIdentityIndex, DuplicateCandidateDetector,
+                                    ExtractionCache, ResumeExtractor)
+        
+        resume_path = Path(file_path)
+        parsed = ResumeExtractor.extract_parsed(resume_path, ExtractionCache.for_ticket_folder(resume_path.parent))
+        if parsed is not None:
+            identifiers = DuplicateCandidateDetector().extract_candidate_identifiers(parsed, resume_path.name)
+        else:
+            identifiers = {'filename': resume_path.name, 'emails': [], 'phones': []}
+        
+        # The form fields identify the applicant even when the resume text does not
+        if applicant_email:
+            identifiers['emails'] = sorted(set(identifiers['emails']) | {applicant_email.lower()})
+        phone_digits = re.sub(r'\D', '', applicant_phone or '')
+        if len(phone_digits) >= 10:
+            identifiers['phones'] = sorted(set(identifiers['phones']) | {phone_digits[-10:]})
+        
+        index = CandidateIdentityIndex.for_storage_root(BASE_STORAGE_PATH)
+        ticket_id = CandidateIdentityIndex.ticket_id_for_folder(resume_path.parent)
+        identity_id = index.register(ticket_id, resume_path.name, identifiers)
+        if not identity_id:
+            return
+        
+        previous = [app for app in index.applications([identity_id])[identity_id]
+                    if not (app['ticket_id'] == ticket_id and app['filename'] == resume_path.name)]
+        if previous:
+            other_tickets = sorted({app['ticket_id'] for app in previous if app['ticket_id'] != ticket_id})
+            resubmissions = len(previous) - sum(1 for app in previous if app['ticket_id'] != ticket_id)
+            logger.info(f"Candidate {identity_id} ({resume_path.name}) previously applied to "
+                        f"{len(other_tickets)} other ticket(s) {other_tickets} and resubmitted "
+                        f"{resubmissions} time(s) to ticket {ticket_id}")
+    except Exception as e:
+        logger.error(f"Error registering candidate identity for {file_path}: {e}")
+
 def get_ticket_resumes(ticket_id):
     """Get list of resumes for a ticket"""
     try:
@@ -1195,8 +1237,13 @@ def index():
                 <ul>
                     <li>POST /api/tickets/&lt;id&gt;/filter-resumes - Trigger filtering</li>
                     <li>GET /api/tickets/&lt;id&gt;/top-resumes - Get top candidates</li>
+                    <li>GET /api/tickets/&lt;id&gt;/candidates - Scores of every candidate</li>
                     <li>GET /api/tickets/&lt;id&gt;/filtering-report - Get report</li>
+                    <li>POST /api/tickets/&lt;id&gt;/rerank - Re-rank with custom weights</li>
+                    <li>POST /api/tickets/&lt;id&gt;/what-if - Preview ranking for other skills</li>
                     <li>GET /api/tickets/&lt;id&gt;/filtering-status - Check status</li>
+                    <li>POST /api/filtering/batch - Filter many tickets at once</li>
+                    <li>GET /api/filtering/batch/&lt;batch_id&gt; - Batch progress and report</li>
                     <li>POST /api/tickets/&lt;id&gt;/send-top-resumes - Send via webhook</li>
                 </ul>
             </div>
@@ -1359,19 +1406,14 @@ def health_check():
     # Check storage directory
     storage_status = "accessible" if os.path.exists(BASE_STORAGE_PATH) else "not_found"
     
-    # Check if filtering module is available
+    # Check if filtering module is available without importing it on every probe
     filtering_module_status = "not_found"
     filtering_module_error = None
-    try:
-        from resume_filter5 import UpdatedResumeFilteringSystem
+    filtering_module_loaded = 'resume_filter5' in sys.modules
+    if filtering_module_loaded or importlib.util.find_spec('resume_filter5') is not None:
         filtering_module_status = "available"
-    except ImportError as e:
-        filtering_module_error = str(e)
-        try:
-            from resume_filter5 import UpdatedResumeFilteringSystem
-            filtering_module_status = "available (as resume_filter5)"
-        except ImportError as e2:
-            filtering_module_error = f"resume_filter5: {e}, resume_filter: {e2}"
+    else:
+        filtering_module_error = "resume_filter5 not found"
     
     return jsonify({
         'status': 'ok' if db_status == "connected" else 'error',
@@ -1381,6 +1423,8 @@ def health_check():
         'storage': storage_status,
         'filtering_module': filtering_module_status,
         'filtering_module_error': filtering_module_error,
+        'filtering_module_loaded': filtering_module_loaded,
+        'nlp_models': ModelRegistry.status(),
         'chat_enabled': True,
         'api_enabled': True,
         'timestamp': datetime.now().isoformat()
@@ -1890,6 +1934,28 @@ def check_filtering_system():
     # Check OpenAI API key
     diagnostics['openai_api_key'] = 'set' if os.environ.get('OPENAI_API_KEY') else 'not set'
     
+    # Per-stage timings of the filtering runs of this server process
+    if request.args.get('format') == 'prometheus':
+        return FilteringMetrics.prometheus() + db_pool_prometheus(), 200, \
+            {'Content-Type': 'text/plain; version=0.0.4'}
+    
+    # Usage of the MySQL connection pools shared by the request handlers and the chat bot
+    diagnostics['db_pool'] = pool_metrics()
+    
+    ticket_id = request.args.get('ticket_id')
+    diagnostics['filtering_metrics'] = {
+        'totals': FilteringMetrics.totals(),
+        'recent_runs': FilteringMetrics.recent(ticket_id)[-10:]
+    }
+    if ticket_id:
+        # The last completed run of the ticket, also when it ran before this process started
+        ticket_folders = [f for f in os.listdir(BASE_STORAGE_PATH) if f.startswith(f"{ticket_id}_")]
+        status_file = os.path.join(BASE_STORAGE_PATH, ticket_folders[0], 'filtering_status.json') \
+            if ticket_folders else None
+        if status_file and os.path.exists(status_file):
+            with open(status_file, 'r') as f:
+                diagnostics['filtering_metrics']['last_ticket_run'] = json.load(f).get('performance')
+    
     return jsonify({
         'success': True,
         'diagnostics': diagnostics
@@ -1899,6 +1965,62 @@ def check_filtering_system():
 # RESUME FILTERING ENDPOINTS - WITH AI INTEGRATION
 # ============================================
 
+def load_latest_filtering_summary(filtering_results_path):
+    """Timestamp, summary and selected-candidate count of a ticket's latest filtering run (None if never filtered)"""
+    latest_run = FilteringResultsStore(filtering_results_path).latest()
+    if latest_run is not None:
+        return {
+            'timestamp': latest_run.get('timestamp'),
+            'summary': latest_run.get('summary', {}),
+            'top_candidates': latest_run.get('top_candidates', 0),
+            'updated_at': os.path.getmtime(os.path.join(filtering_results_path, 'latest.json'))
+        }
+    
+    # Results written before runs were stored compactly
+    result_files = list(Path(filtering_results_path).glob('final_results_*.json'))
+    if not result_files:
+        return None
+    latest_result = max(result_files, key=lambda x: x.stat().st_mtime)
+    with open(latest_result, 'r') as f:
+        filtering_data = json.load(f)
+    return {
+        'timestamp': filtering_data.get('timestamp'),
+        'summary': filtering_data.get('summary', {}),
+        'top_candidates': len(filtering_data.get('final_top_5', filtering_data.get('top_5_candidates', []))),
+        'updated_at': latest_result.stat().st_mtime
+    }
+
+def load_leaderboard(folder_path):
+    """Top candidates from a ticket's pre-scored leaderboard, in the shape of a filtering run (None if unusable).
+    
+    Resumes the leaderboard does not cover yet are queued for pre-scoring.
+    """
+    from resume_filter5 import EnhancedJobTicket
+    
+    leaderboard = TicketLeaderboard(os.path.join(folder_path, 'filtering_results')).current()
+    if leaderboard is None:
+        return None
+    
+    pending = [f for f in os.listdir(folder_path)
+               if EnhancedJobTicket.is_resume_file(f) and f not in leaderboard['files']]
+    pipeline = get_prescoring_pipeline()
+    if pending:
+        pipeline.enqueue(folder_path)
+    return {
+        'timestamp': leaderboard.get('updated_at'),
+        'position': leaderboard.get('position'),
+        'latest_requirements': leaderboard.get('latest_requirements', {}),
+        'summary': {'total_resumes': leaderboard.get('total_resumes', 0)},
+        'final_top_5': leaderboard.get('final_top_5', []),
+        'leaderboard': {
+            'updated_at': leaderboard.get('updated_at'),
+            'last_filtering_run': leaderboard.get('timestamp'),
+            'prescored_since_run': leaderboard.get('prescored', 0),
+            'pending_resumes': len(pending),
+            'queued': pipeline.status(folder_path)['queued']
+        }
+    }
+
 @app.route('/api/tickets/<ticket_id>/filter-resumes', methods=['POST'])
 @require_api_key
 def trigger_resume_filtering(ticket_id):
@@ -1939,37 +2061,73 @@ def trigger_resume_filtering(ticket_id):
         # Check if filtering results already exist
         filtering_results_path = os.path.join(folder_path, 'filtering_results')
         
-        # Safely get the force parameter
+        # Safely get the force, incremental, workers, profile, full_scoring and streaming parameters
         force_refilter = False
+        incremental = False
+        workers = None
+        profile = None
+        full_scoring = None
+        streaming = False
         try:
             if request.is_json and request.json:
                 force_refilter = request.json.get('force', False)
+                incremental = bool(request.json.get('incremental', False))
+                workers = request.json.get('workers')
+                profile = request.json.get('profile') or None
+                if 'full_scoring' in request.json:
+                    full_scoring = bool(request.json['full_scoring'])
+                streaming = bool(request.json.get('streaming', False))
         except:
-            # If JSON parsing fails, just use default
+            # If JSON parsing fails, just use defaults
             force_refilter = False
+            incremental = False
+            workers = None
+            profile = None
+            full_scoring = None
+            streaming = False
         
-        if os.path.exists(filtering_results_path) and not force_refilter:
-            result_files = list(Path(filtering_results_path).glob('final_results_*.json'))
-            if result_files:
-                # Get the latest result
-                latest_result = max(result_files, key=lambda x: x.stat().st_mtime)
-                
-                with open(latest_result, 'r') as f:
-                    filtering_data = json.load(f)
-                
+        # One process unless asked for more; 0 means all cores, as for the CLI
+        try:
+            workers = 1 if workers is None else int(workers)
+            workers = workers or os.cpu_count() or 1
+        except (TypeError, ValueError):
+            return jsonify({'success': False, 'error': "'workers' must be an integer"}), 400
+        
+        if profile is not None and profile not in RunProfiler.MODES:
+            return jsonify({
+                'success': False,
+                'error': f"Unknown profile mode '{profile}'",
+                'valid_profiles': list(RunProfiler.MODES)
+            }), 400
+        
+        # Never run more worker processes than the machine has cores
+        workers = max(1, min(workers, os.cpu_count() or 1))
+        
+        # An incremental request is always a refresh of existing results
+        if os.path.exists(filtering_results_path) and not (force_refilter or incremental):
+            latest_run = load_latest_filtering_summary(filtering_results_path)
+            if latest_run:
                 return jsonify({
                     'success': True,
                     'message': 'Filtering results already exist. Use force=true to re-run.',
                     'status': 'completed',
                     'data': {
-                        'filtered_at': filtering_data.get('timestamp'),
-                        'total_resumes': filtering_data.get('summary', {}).get('total_resumes', 0),
-                        'top_candidates_count': len(filtering_data.get('final_top_5', filtering_data.get('top_5_candidates', [])))
+                        'filtered_at': latest_run['timestamp'],
+                        'total_resumes': latest_run['summary'].get('total_resumes', 0),
+                        'top_candidates_count': latest_run['top_candidates']
                     }
                 })
         
-        # Create lock file
-        with open(filtering_lock_file, 'w') as f:
+        # Create lock file (exclusively, so a batch run that took the ticket meanwhile keeps it)
+        try:
+            lock_fd = os.open(filtering_lock_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return jsonify({
+                'success': False,
+                'error': 'Filtering is already in progress for this ticket',
+                'status': 'in_progress'
+            }), 409
+        with os.fdopen(lock_fd, 'w') as f:
             f.write(json.dumps({
                 'started_at': datetime.now().isoformat(),
                 'pid': os.getpid()
@@ -1981,6 +2139,8 @@ def trigger_resume_filtering(ticket_id):
                 logger.info(f"Starting AI filtering for ticket {ticket_id}")
                 logger.info(f"Folder path: {folder_path}")
                 logger.info(f"Resume files found: {resume_files}")
+                logger.info(f"Worker processes: {workers}, incremental: {incremental}, profile: {profile}, "
+                            f"full scoring: {full_scoring}, streaming: {streaming}")
                 
                 # Try to import the filtering system
                 try:
@@ -1998,10 +2158,11 @@ def trigger_resume_filtering(ticket_id):
                 
                 # Create and run the filtering system
                 logger.info("Creating filter system instance...")
-                filter_system = UpdatedResumeFilteringSystem(folder_path)
+                filter_system = UpdatedResumeFilteringSystem(folder_path, workers=workers, profile=profile,
+                                                             full_scoring=full_scoring)
                 
                 logger.info("Running filter_resumes()...")
-                results = filter_system.filter_resumes()
+                results = filter_system.filter_resumes(incremental=incremental, streaming=streaming)
                 
                 if "error" not in results:
                     logger.info(f"AI filtering completed successfully for ticket {ticket_id}")
@@ -2014,6 +2175,9 @@ def trigger_resume_filtering(ticket_id):
                             'completed_at': datetime.now().isoformat(),
                             'total_resumes': results.get('summary', {}).get('total_resumes', 0),
                             'top_candidates': len(results.get('final_top_5', results.get('top_5_candidates', []))),
+                            'incremental': results.get('stage1_results', {}).get('incremental'),
+                            'cascade': results.get('stage1_results', {}).get('cascade'),
+                            'performance': results.get('performance'),
                             'success': True
                         }, f)
                 else:
@@ -2082,6 +2246,8 @@ def trigger_resume_filtering(ticket_id):
             'data': {
                 'ticket_id': ticket_id,
                 'resume_count': len(resume_files),
+                'workers': workers,
+                'incremental': incremental,
                 'started_at': datetime.now().isoformat()
             }
         })
@@ -2128,18 +2294,27 @@ def get_top_resumes(ticket_id):
                 'error': 'No filtering results found. Please run resume filtering first.'
             }), 404
         
-        # Get the latest filtering results
-        result_files = list(Path(filtering_results_path).glob('final_results*.json'))
-        if not result_files:
-            return jsonify({
-                'success': False,
-                'error': 'No filtering results found'
-            }), 404
-        
-        latest_result = max(result_files, key=lambda x: x.stat().st_mtime)
-        
-        with open(latest_result, 'r') as f:
-            filtering_data = json.load(f)
+        # Uploads since the last filtering run are scored into the leaderboard in the background;
+        # otherwise only the latest run's summary and selected candidates are read
+        store = FilteringResultsStore(filtering_results_path)
+        filtering_data = load_leaderboard(folder_path)
+        if filtering_data is None:
+            filtering_data = store.meta()
+            if filtering_data is not None:
+                filtering_data['final_top_5'] = store.top_candidates(top_n)
+        if filtering_data is None:
+            # Results written before runs were stored compactly
+            result_files = list(Path(filtering_results_path).glob('final_results*.json'))
+            if not result_files:
+                return jsonify({
+                    'success': False,
+                    'error': 'No filtering results found'
+                }), 404
+            
+            latest_result = max(result_files, key=lambda x: x.stat().st_mtime)
+            
+            with open(latest_result, 'r') as f:
+                filtering_data = json.load(f)
         
         # Get top candidates
         top_candidates = filtering_data.get('final_top_5', filtering_data.get('top_5_candidates', []))[:top_n]
@@ -2281,6 +2456,8 @@ def get_top_resumes(ticket_id):
                     'top_candidates_returned': len(candidates_with_details)
                 },
                 'top_candidates': candidates_with_details,
+                'source': 'leaderboard' if 'leaderboard' in filtering_data else 'filtering_run',
+                'leaderboard': filtering_data.get('leaderboard'),
                 'ai_analysis': ai_analysis
             }
         })
@@ -2294,6 +2471,233 @@ def get_top_resumes(ticket_id):
             'error': str(e)
         }), 500
 
+@app.route('/api/tickets/<ticket_id>/candidates', methods=['GET'])
+@require_api_key
+def get_ranked_candidates(ticket_id):
+    """Scores of every candidate of the latest filtering run, reading only the requested columns"""
+    try:
+        from results_store import CANDIDATE_COLUMNS
+        
+        ticket_folders = [f for f in os.listdir(BASE_STORAGE_PATH) 
+                         if f.startswith(f"{ticket_id}_")]
+        
+        if not ticket_folders:
+            return jsonify({
+                'success': False,
+                'error': 'Ticket folder not found'
+            }), 404
+        
+        store = FilteringResultsStore(os.path.join(BASE_STORAGE_PATH, ticket_folders[0], 'filtering_results'))
+        latest_run = store.latest()
+        if latest_run is None:
+            return jsonify({
+                'success': False,
+                'error': 'No filtering results found. Please run resume filtering first.'
+            }), 404
+        
+        columns = [c.strip() for c in request.args.get('columns', '').split(',') if c.strip()] or None
+        selected_only = request.args.get('selected', 'false').lower() == 'true'
+        try:
+            limit = max(0, int(request.args.get('limit', 0)))
+            candidates = store.candidates(columns, max_final_rank=latest_run.get('top_candidates', 0)
+                                          if selected_only else None)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e),
+                'valid_columns': list(CANDIDATE_COLUMNS)
+            }), 400
+        
+        return jsonify({
+            'success': True,
+            'data': {
+                'ticket_id': ticket_id,
+                'run_id': latest_run['run_id'],
+                'filtered_at': latest_run.get('timestamp'),
+                'total_candidates': len(candidates),
+                'candidates': candidates[:limit] if limit else candidates
+            }
+        })
+        
+    except Exception as e:
+        logger.error(f"Error getting ranked candidates: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/tickets/<ticket_id>/cross-applications', methods=['GET'])
+@require_api_key
+def get_cross_applications(ticket_id):
+    """Get resumes of a ticket whose candidates also applied to other tickets"""
+    try:
+        from resume_filter5 import CandidateIdentityIndex
+        
+        index = CandidateIdentityIndex.for_storage_root(BASE_STORAGE_PATH)
+        cross_applications = index.ticket_cross_applications(ticket_id)
+        
+        return jsonify({
+            'success': True,
+            'data': {
+                'ticket_id': ticket_id,
+                'candidates_in_other_tickets': len(cross_applications),
+                'candidates': cross_applications
+            }
+        })
+        
+    except Exception as e:
+        logger.error(f"Error getting cross applications: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+def save_completed_feature_matrix(matrix, matrix_path, loaded_mtime_ns, incomplete_before):
+    """Keep scores completed for a rerank or what-if request, unless a filtering run replaced the matrix meanwhile"""
+    if int((~matrix.complete).sum()) == incomplete_before:
+        return
+    try:
+        if os.stat(matrix_path).st_mtime_ns == loaded_mtime_ns:
+            matrix.save(matrix_path)
+    except OSError as e:
+        logger.warning(f"Could not store completed candidate scores in {matrix_path}: {e}")
+
+@app.route('/api/tickets/<ticket_id>/rerank', methods=['POST'])
+@require_api_key
+def rerank_ticket_candidates(ticket_id):
+    """Re-rank a filtered ticket's candidates with custom weights; only candidates the scoring
+    cascade pruned that could reach the requested top are scored further"""
+    try:
+        from feature_matrix import FEATURE_COLUMNS, FEATURE_MATRIX_FILENAME, FeatureMatrix
+        from resume_filter5 import PrunedCandidateScorer, SkillBitmapIndex
+        
+        ticket_folders = [f for f in os.listdir(BASE_STORAGE_PATH) 
+                         if f.startswith(f"{ticket_id}_")]
+        
+        if not ticket_folders:
+            return jsonify({
+                'success': False,
+                'error': 'Ticket folder not found'
+            }), 404
+        
+        ticket_folder = os.path.join(BASE_STORAGE_PATH, ticket_folders[0])
+        matrix_path = os.path.join(ticket_folder, 'filtering_results', FEATURE_MATRIX_FILENAME)
+        try:
+            loaded_mtime_ns = os.stat(matrix_path).st_mtime_ns
+        except OSError:
+            loaded_mtime_ns = None
+        matrix = FeatureMatrix.load(matrix_path)
+        if matrix is None:
+            return jsonify({
+                'success': False,
+                'error': 'No feature matrix found. Please run filtering first.'
+            }), 404
+        skill_index = SkillBitmapIndex.load(os.path.join(ticket_folder, 'filtering_results', SkillBitmapIndex.FILENAME))
+        incomplete_before = int((~matrix.complete).sum())
+        
+        data = request.get_json(silent=True) or {}
+        try:
+            top_n = int(data.get('top', 10))
+            candidates = matrix.rerank(
+                data.get('weights'), top_n,
+                PrunedCandidateScorer(ticket_folder, matrix, skill_index) if skill_index is not None else None
+            )
+        except (TypeError, ValueError) as e:
+            return jsonify({
+                'success': False,
+                'error': str(e),
+                'valid_features': FEATURE_COLUMNS
+            }), 400
+        save_completed_feature_matrix(matrix, matrix_path, loaded_mtime_ns, incomplete_before)
+        
+        return jsonify({
+            'success': True,
+            'data': {
+                'ticket_id': ticket_id,
+                'total_candidates': len(matrix),
+                # Candidates pruned by the scoring cascade that could not reach the requested top
+                # have no professional development score yet
+                'incomplete_candidates': int((~matrix.complete).sum()),
+                'weights': {column: round(weight, 6) for column, weight in
+                            zip(FEATURE_COLUMNS, matrix.weight_vector(data.get('weights')).tolist())},
+                'candidates': candidates
+            }
+        })
+        
+    except Exception as e:
+        logger.error(f"Error re-ranking candidates: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/tickets/<ticket_id>/what-if', methods=['POST'])
+@require_api_key
+def what_if_skills(ticket_id):
+    """Preview the leaderboard of a filtered ticket for an alternative required-skills list"""
+    try:
+        from feature_matrix import FEATURE_COLUMNS, FEATURE_MATRIX_FILENAME, FeatureMatrix
+        from resume_filter5 import PrunedCandidateScorer, SkillBitmapIndex
+        
+        ticket_folders = [f for f in os.listdir(BASE_STORAGE_PATH) 
+                         if f.startswith(f"{ticket_id}_")]
+        
+        if not ticket_folders:
+            return jsonify({
+                'success': False,
+                'error': 'Ticket folder not found'
+            }), 404
+        
+        ticket_folder = os.path.join(BASE_STORAGE_PATH, ticket_folders[0])
+        filtering_results_path = os.path.join(ticket_folder, 'filtering_results')
+        matrix_path = os.path.join(filtering_results_path, FEATURE_MATRIX_FILENAME)
+        try:
+            loaded_mtime_ns = os.stat(matrix_path).st_mtime_ns
+        except OSError:
+            loaded_mtime_ns = None
+        matrix = FeatureMatrix.load(matrix_path)
+        skill_index = SkillBitmapIndex.load(os.path.join(filtering_results_path, SkillBitmapIndex.FILENAME))
+        if matrix is None or skill_index is None:
+            return jsonify({
+                'success': False,
+                'error': 'No skill index found. Please run filtering first.'
+            }), 404
+        
+        data = request.get_json(silent=True) or {}
+        skills = data.get('skills')
+        if not skills or not (isinstance(skills, str) or
+                              (isinstance(skills, list) and all(isinstance(skill, str) for skill in skills))):
+            return jsonify({
+                'success': False,
+                'error': 'skills must be a non-empty list of strings or a comma-separated string'
+            }), 400
+        
+        try:
+            top_n = int(data.get('top', 10))
+            incomplete_before = int((~matrix.complete).sum())
+            result = skill_index.what_if(matrix, skills, data.get('weights'), top_n,
+                                         PrunedCandidateScorer(ticket_folder, matrix, skill_index))
+        except (TypeError, ValueError) as e:
+            return jsonify({
+                'success': False,
+                'error': str(e),
+                'valid_features': FEATURE_COLUMNS
+            }), 400
+        save_completed_feature_matrix(matrix, matrix_path, loaded_mtime_ns, incomplete_before)
+        
+        result['ticket_id'] = ticket_id
+        return jsonify({
+            'success': True,
+            'data': result
+        })
+        
+    except Exception as e:
+        logger.error(f"Error running skills what-if: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @app.route('/api/tickets/<ticket_id>/filtering-report', methods=['GET'])
 @require_api_key
 def get_filtering_report(ticket_id):
@@ -2319,27 +2723,30 @@ def get_filtering_report(ticket_id):
             }), 404
         
         # Get the latest summary report
-        report_files = list(Path(filtering_results_path).glob('summary_report_*.txt'))
-        if not report_files:
-            return jsonify({
-                'success': False,
-                'error': 'No summary report found'
-            }), 404
-        
-        latest_report = max(report_files, key=lambda x: x.stat().st_mtime)
+        store = FilteringResultsStore(filtering_results_path)
+        latest_report = store.report_path()
+        if latest_report is not None:
+            json_results = store.latest()
+            json_results_path = store.run_folder()
+        else:
+            # Reports written before runs were stored compactly
+            report_files = list(Path(filtering_results_path).glob('summary_report_*.txt'))
+            if not report_files:
+                return jsonify({
+                    'success': False,
+                    'error': 'No summary report found'
+                }), 404
+            
+            latest_report = max(report_files, key=lambda x: x.stat().st_mtime)
+            
+            latest_run = load_latest_filtering_summary(filtering_results_path)
+            json_results = latest_run or {}
+            result_files = list(Path(filtering_results_path).glob('final_results_*.json'))
+            json_results_path = max(result_files, key=lambda x: x.stat().st_mtime) if result_files else None
         
         with open(latest_report, 'r') as f:
             report_content = f.read()
         
-        # Also get the JSON results
-        result_files = list(Path(filtering_results_path).glob('final_results_*.json'))
-        if result_files:
-            latest_result = max(result_files, key=lambda x: x.stat().st_mtime)
-            with open(latest_result, 'r') as f:
-                json_results = json.load(f)
-        else:
-            json_results = {}
-        
         return jsonify({
             'success': True,
             'data': {
@@ -2350,7 +2757,7 @@ def get_filtering_report(ticket_id):
                 'summary_stats': json_results.get('summary', {}),
                 'files': {
                     'report': str(latest_report),
-                    'json_results': str(latest_result) if result_files else None
+                    'json_results': str(json_results_path) if json_results_path else None
                 }
             }
         })
@@ -2454,6 +2861,107 @@ def send_top_resumes_email(ticket_id):
             'error': str(e)
         }), 500
 
+@app.route('/api/filtering/batch', methods=['POST'])
+@require_api_key
+def trigger_batch_filtering():
+    """Filter several tickets (default: every approved ticket) on one shared worker pool"""
+    try:
+        data = request.get_json(silent=True) or {}
+        tickets = data.get('tickets', 'approved')
+        
+        if tickets == 'approved':
+            conn = get_db_connection()
+            if not conn:
+                return jsonify({'success': False, 'error': 'Database connection failed'}), 500
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute("SELECT ticket_id FROM tickets WHERE approval_status = 'approved'")
+            ticket_ids = [row['ticket_id'] for row in cursor.fetchall()]
+            cursor.close()
+            conn.close()
+        elif isinstance(tickets, list) and tickets:
+            ticket_ids = [str(ticket_id) for ticket_id in tickets]
+        else:
+            return jsonify({
+                'success': False,
+                'error': "'tickets' must be a non-empty list of ticket IDs or \"approved\""
+            }), 400
+        
+        try:
+            workers = int(data.get('workers', 0)) or os.cpu_count() or 1
+            concurrency = int(data.get('concurrency', 2))
+        except (TypeError, ValueError):
+            return jsonify({'success': False, 'error': "'workers' and 'concurrency' must be integers"}), 400
+        # Never run more worker processes than the machine has cores
+        workers = max(1, min(workers, os.cpu_count() or 1))
+        incremental = bool(data.get('incremental', False))
+        full_scoring = bool(data['full_scoring']) if 'full_scoring' in data else None
+        streaming = bool(data.get('streaming', False))
+        profile = data.get('profile') or None
+        if profile is not None and profile not in RunProfiler.MODES:
+            return jsonify({
+                'success': False,
+                'error': f"Unknown profile mode '{profile}'",
+                'valid_profiles': list(RunProfiler.MODES)
+            }), 400
+        
+        from batch_filtering import BatchFilteringScheduler
+        scheduler = BatchFilteringScheduler(BASE_STORAGE_PATH, workers=workers, concurrency=concurrency,
+                                            incremental=incremental, profile=profile, full_scoring=full_scoring,
+                                            streaming=streaming)
+        batch_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+        ticket_count = len(scheduler.ticket_folders(ticket_ids))
+        
+        def run_batch():
+            try:
+                logger.info(f"Starting batch filtering {batch_id} for {ticket_count} ticket(s)")
+                report = scheduler.run(ticket_ids, batch_id=batch_id)
+                logger.info(f"Batch filtering {batch_id} completed: {report['throughput']}")
+            except Exception as e:
+                logger.error(f"Error running batch filtering {batch_id}: {type(e).__name__}: {e}")
+        
+        threading.Thread(target=run_batch, name=f"batch-filtering-{batch_id}", daemon=True).start()
+        
+        return jsonify({
+            'success': True,
+            'message': 'Batch filtering started',
+            'status': 'started',
+            'data': {
+                'batch_id': batch_id,
+                'ticket_count': ticket_count,
+                'workers': workers,
+                'concurrency': concurrency,
+                'incremental': incremental,
+                'status_url': f"/api/filtering/batch/{batch_id}"
+            }
+        })
+        
+    except Exception as e:
+        logger.error(f"Error triggering batch filtering: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/filtering/batch/<batch_id>', methods=['GET'])
+@require_api_key
+def get_batch_filtering_report(batch_id):
+    """Progress and consolidated report of a batch filtering run"""
+    from batch_filtering import BATCH_RESULTS_FOLDER
+    report_file = os.path.join(BASE_STORAGE_PATH, BATCH_RESULTS_FOLDER, f"batch_{secure_filename(batch_id)}.json")
+    if not os.path.exists(report_file):
+        return jsonify({
+            'success': False,
+            'error': 'Batch not found'
+        }), 404
+    
+    with open(report_file, 'r') as f:
+        report = json.load(f)
+    
+    return jsonify({
+        'success': True,
+        'data': report
+    })
+
 @app.route('/api/tickets/<ticket_id>/filtering-status', methods=['GET'])
 @require_api_key
 def get_filtering_status(ticket_id):
@@ -2520,17 +3028,13 @@ def get_filtering_status(ticket_id):
         
         filtering_info = {}
         if has_filtering_results:
-            result_files = list(Path(filtering_results_path).glob('final_results_*.json'))
-            if result_files:
-                latest_result = max(result_files, key=lambda x: x.stat().st_mtime)
-                with open(latest_result, 'r') as f:
-                    filtering_data = json.load(f)
-                
+            latest_run = load_latest_filtering_summary(filtering_results_path)
+            if latest_run:
                 filtering_info = {
-                    'filtered_at': filtering_data.get('timestamp'),
-                    'total_processed': filtering_data.get('summary', {}).get('total_resumes', 0),
-                    'top_candidates': len(filtering_data.get('final_top_5', filtering_data.get('top_5_candidates', []))),
-                    'last_updated': datetime.fromtimestamp(latest_result.stat().st_mtime).isoformat()
+                    'filtered_at': latest_run['timestamp'],
+                    'total_processed': latest_run['summary'].get('total_resumes', 0),
+                    'top_candidates': latest_run['top_candidates'],
+                    'last_updated': datetime.fromtimestamp(latest_run['updated_at']).isoformat()
                 }
         
         return jsonify({
@@ -3826,15 +4330,6 @@ def verify_jwt_token(token):
     except jwt.InvalidTokenError:
         return False, "Invalid token"
 
-def get_db_connection():
-    """Get database connection"""
-    try:
-        conn = mysql.connector.connect(**MYSQL_CONFIG)
-        return conn
-    except Error as e:
-        logger.error(f"Database connection error: {e}")
-        return None
-
 def create_user_table():
     """Create users table if it doesn't exist"""
     conn = get_db_connection()
@@ -4284,6 +4779,13 @@ def upload_resume(ticket_id):
         )
         
         if saved_path:
+            # Deduplicate against every ticket in the background so the upload stays fast
+            Thread(target=register_resume_identity,
+                   args=(saved_path, applicant_email, applicant_phone),
+                   daemon=True).start()
+            # Score it into the ticket's leaderboard so top resumes are current without a filtering run
+            get_prescoring_pipeline().enqueue(os.path.dirname(saved_path))
+            
             # Generate unique application ID
             application_id = f"APP_{ticket_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{applicant_name.replace(' ', '').upper()[:4]}"
             
@@ -4937,6 +5439,30 @@ def cleanup_folders_endpoint():
             'error': str(e)
         }), 500
 
+@app.route('/api/maintenance/skill-taxonomy', methods=['GET', 'POST'])
+@require_api_key
+def skill_taxonomy_endpoint():
+    """Show the loaded skill taxonomy version (GET) or reload it from its file now (POST)"""
+    try:
+        taxonomy = reload_skill_taxonomy() if request.method == 'POST' else get_skill_taxonomy()
+        if request.method == 'POST':
+            logger.info(f"Skill taxonomy reloaded on request: version {taxonomy.version}")
+        return jsonify({
+            'success': True,
+            'path': str(taxonomy_path()),
+            'version': taxonomy.version,
+            'signature': taxonomy.signature,
+            'skills': len(taxonomy.variations),
+            'variations': len(taxonomy.canonical_for)
+        })
+        
+    except (OSError, ValueError) as e:
+        logger.error(f"Error loading skill taxonomy: {e}")
+        return jsonify({
+            'success': False,
+            'error': f"Invalid skill taxonomy: {type(e).__name__}: {e}"
+        }), 400
+
 @app.route('/api/maintenance/folder-stats', methods=['GET'])
 @require_api_key
 def get_folder_statistics():
@@ -5094,8 +5620,13 @@ def main():
     print("  GET  /api/tickets/<id>/filtering-status")
     print("  POST /api/tickets/<id>/filter-resumes")
     print("  GET  /api/tickets/<id>/top-resumes")
+    print("  GET  /api/tickets/<id>/candidates")
     print("  GET  /api/tickets/<id>/filtering-report")
+    print("  POST /api/tickets/<id>/rerank")
+    print("  POST /api/tickets/<id>/what-if")
     print("  POST /api/tickets/<id>/send-top-resumes")
+    print("  POST /api/filtering/batch")
+    print("  GET  /api/filtering/batch/<batch_id>")
     
     print("\n✋ Press CTRL+C to stop the server")
     print("="*80 + "\n")
@@ -0,0 +1,150 @@
+"""
+skill_taxonomy.py - The skill synonym table used for skill matching
+The canonical skills and their variations live in skill_taxonomy.json (or the
+file named by RESUME_SKILL_TAXONOMY_PATH), so adding a synonym is a data change
+instead of a code deploy. Loading compiles the table into reverse indexes and a
+matcher over the canonical names, and the compiled form is pickled under
+.resume_cache/ next to the file so later processes skip the compile step.
+
+get_skill_taxonomy() checks the file for changes every few seconds
+(RESUME_SKILL_TAXONOMY_CHECK_SECONDS) and swaps in the new version; everything
+compiled from a taxonomy is keyed by its signature so it is rebuilt after a
+reload.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from pattern_matcher import MultiPatternMatcher
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TAXONOMY_PATH = Path(__file__).resolve().parent / 'skill_taxonomy.json'
+DEFAULT_CHECK_SECONDS = 5.0
+# Bump when the compiled form changes so older pickles are rebuilt
+COMPILED_FORMAT = 1
+
+
+class SkillTaxonomy:
+    """One version of the skill table, compiled for lookups"""
+
+    def __init__(self, skills: Dict[str, List[str]], version: int = 0, signature: str = ''):
+        self.version = version
+        self.signature = signature
+        # canonical -> variations, in file order
+        self.variations = {canonical.lower(): [variation.lower() for variation in variations]
+                           for canonical, variations in skills.items()}
+        self.order = {canonical: i for i, canonical in enumerate(self.variations)}
+        # variation -> canonical skills listing it, in file order
+        self.canonical_for: Dict[str, List[str]] = {}
+        for canonical, variations in self.variations.items():
+            for variation in variations:
+                self.canonical_for.setdefault(variation, []).append(canonical)
+        # Finds every canonical name contained in a required skill ("apache spark developer" -> spark, apache spark)
+        self._name_matcher = MultiPatternMatcher(self.variations)
+        self.patterns = frozenset(word for canonical, variations in self.variations.items()
+                                  for pattern in (canonical, *variations) for word in (pattern, *pattern.split()))
+
+    def resolve(self, skill: str) -> Optional[str]:
+        """Canonical skill for a required skill: the first one in file order that lists it as a
+        variation or whose name it contains, None if there is none"""
+        skill_lower = skill.lower().strip()
+        candidates = self.canonical_for.get(skill_lower, [])[:1] + list(self._name_matcher.found(skill_lower))
+        return min(candidates, key=self.order.__getitem__) if candidates else None
+
+    @classmethod
+    def from_file(cls, path: Path) -> 'SkillTaxonomy':
+        """Compile a taxonomy file; raises ValueError if it is not valid JSON of the expected shape"""
+        data = Path(path).read_bytes()
+        document = json.loads(data)
+        if not isinstance(document, dict) or not isinstance(document.get('skills'), dict):
+            raise ValueError("expected an object with a 'skills' object")
+        for canonical, variations in document['skills'].items():
+            if not isinstance(variations, list) or not all(isinstance(variation, str) for variation in variations):
+                raise ValueError(f"variations of {canonical!r} must be a list of strings")
+        version = document.get('version', 0)
+        if not isinstance(version, int) or isinstance(version, bool):
+            raise ValueError("'version' must be an integer")
+        return cls(document['skills'], version=version, signature=hashlib.sha256(data).hexdigest()[:16])
+
+    @classmethod
+    def load(cls, path: Path, cache_path: Optional[Path] = None) -> 'SkillTaxonomy':
+        """Load the taxonomy from its compiled pickle, recompiling (and re-pickling) when the file changed"""
+        path = Path(path)
+        cache_path = cache_path or path.parent / '.resume_cache' / (path.stem + '.pickle')
+        signature = hashlib.sha256(path.read_bytes()).hexdigest()[:16]
+        try:
+            with open(cache_path, 'rb') as f:
+                stored = pickle.load(f)
+            if stored.get('format') == COMPILED_FORMAT and stored['taxonomy'].signature == signature:
+                return stored['taxonomy']
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError, KeyError):
+            pass
+
+        taxonomy = cls.from_file(path)
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, 'wb') as f:
+                pickle.dump({'format': COMPILED_FORMAT, 'taxonomy': taxonomy}, f)
+            tmp_path.replace(cache_path)
+        except OSError as e:
+            logger.warning(f"Could not cache the compiled skill taxonomy at {cache_path}: {e}")
+        return taxonomy
+
+
+_taxonomy: Optional[SkillTaxonomy] = None
+_taxonomy_stat: Optional[Tuple[int, int]] = None
+_checked_at = 0.0
+_taxonomy_lock = threading.Lock()
+
+
+def taxonomy_path() -> Path:
+    return Path(os.environ.get('RESUME_SKILL_TAXONOMY_PATH') or DEFAULT_TAXONOMY_PATH)
+
+
+def _load_locked(path: Path) -> SkillTaxonomy:
+    global _taxonomy, _taxonomy_stat
+    stat = path.stat()
+    taxonomy = SkillTaxonomy.load(path)
+    if _taxonomy is not None and taxonomy.signature != _taxonomy.signature:
+        logger.info(f"Skill taxonomy reloaded: version {_taxonomy.version} -> {taxonomy.version}")
+    _taxonomy, _taxonomy_stat = taxonomy, (stat.st_mtime_ns, stat.st_size)
+    return taxonomy
+
+
+def get_skill_taxonomy() -> SkillTaxonomy:
+    """The process-wide skill taxonomy, reloaded when its file has changed"""
+    global _checked_at
+    with _taxonomy_lock:
+        now = time.monotonic()
+        interval = float(os.environ.get('RESUME_SKILL_TAXONOMY_CHECK_SECONDS') or DEFAULT_CHECK_SECONDS)
+        if _taxonomy is not None and now - _checked_at < interval:
+            return _taxonomy
+        _checked_at = now
+        path = taxonomy_path()
+        if _taxonomy is None:
+            return _load_locked(path)
+        try:
+            stat = path.stat()
+            if (stat.st_mtime_ns, stat.st_size) != _taxonomy_stat:
+                _load_locked(path)
+        except (OSError, ValueError) as e:
+            # Keep scoring with the version already loaded until the file is fixed
+            logger.error(f"Could not reload the skill taxonomy from {path}: {type(e).__name__}: {e}")
+        return _taxonomy
+
+
+def reload_skill_taxonomy() -> SkillTaxonomy:
+    """Load the taxonomy file now, regardless of the check interval; raises if it is invalid"""
+    global _checked_at
+    with _taxonomy_lock:
+        _checked_at = time.monotonic()
+        return _load_locked(taxonomy_path())
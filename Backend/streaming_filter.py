@@ -0,0 +1,332 @@
+"""
+streaming_filter.py - Memory-bounded stage 1 for tickets with very many resumes
+A standard run keeps every scored resume (with its full professional
+development breakdown) in memory, sorts the lot and serializes it at the end,
+so its peak memory grows with the ticket. A streaming run instead:
+
+  - extracts and scores resumes through a generator that keeps only a few
+    chunks in flight on the worker pool
+  - appends each result to the run's candidates.ndjson.gz as soon as it is scored
+  - keeps the best STAGE1_SHORTLIST candidates in a bounded heap, running the
+    expensive scoring stages only for resumes that can still enter it
+  - groups duplicate submissions by their identity in the persistent
+    CandidateIdentityIndex instead of comparing in-memory lists
+
+Only the shortlisted candidates' records are read back to build the stage 1
+results, so peak memory stays roughly flat as the ticket grows. Streaming runs
+always score every resume, only detect duplicates sharing an identity key
+(email, phone, profile handle or identical text), and compute TF-IDF similarity
+for the shortlist alone. The feature matrix and skill index used for re-ranking
+and what-if previews are only written by standard runs.
+"""
+
+import gzip
+import heapq
+import json
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from results_store import STREAMED_CANDIDATES_FILENAME
+from resume_filter5 import (STAGE1_SHORTLIST, CandidateIdentityIndex, CorpusSimilarityModel, ParsedResume,
+                            ResumeExtractor, UpdatedResumeFilteringSystem, _extract_and_score,
+                            _extract_and_score_chunk, _init_batch_worker, worker_process_context)
+
+# Resumes per pool task, and tasks in flight per worker process
+CHUNK_SIZE = 16
+CHUNKS_PER_WORKER = 2
+# Resumes registered in the identity index per SQLite transaction
+IDENTITY_BATCH = 64
+
+
+class ShortlistHeap:
+    """The best k candidates seen so far, each ranked by its best submission.
+
+    Ties go to the candidate seen first, as the stable sort of a standard run
+    keeps the earlier file ahead.
+    """
+
+    def __init__(self, k: int):
+        self.k = k
+        self.best: Dict[str, float] = {}
+        self._first_seen: Dict[str, int] = {}
+        # (score, -first_seen, key) min-heap; entries outdated by a better submission are skipped lazily
+        self._heap: List[Tuple[float, int, str]] = []
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.best
+
+    def __len__(self) -> int:
+        return len(self.best)
+
+    def _lowest(self) -> Tuple[float, int, str]:
+        while self.best.get(self._heap[0][2]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        return self._heap[0]
+
+    def threshold(self) -> Optional[float]:
+        """Score a new candidate has to reach to enter, None while there is room"""
+        return self._lowest()[0] if len(self.best) >= self.k else None
+
+    def offer(self, key: str, score: float, order: int):
+        """Add or raise candidate key; the weakest candidate drops out once the heap is full"""
+        if key in self.best:
+            if score > self.best[key]:
+                self.best[key] = score
+                heapq.heappush(self._heap, (score, -self._first_seen[key], key))
+            return
+        if len(self.best) >= self.k:
+            lowest_score, lowest_order, lowest_key = self._lowest()
+            if (score, -order) <= (lowest_score, lowest_order):
+                return
+            heapq.heappop(self._heap)
+            del self.best[lowest_key]
+            del self._first_seen[lowest_key]
+        self.best[key] = score
+        self._first_seen[key] = order
+        heapq.heappush(self._heap, (score, -order, key))
+
+
+class StreamingFilter:
+    """Stage 1 of a filtering run, streamed resume by resume"""
+
+    def __init__(self, system: UpdatedResumeFilteringSystem, shortlist_size: int = STAGE1_SHORTLIST):
+        self.system = system
+        self.shortlist_size = shortlist_size
+        self.ticket_id = CandidateIdentityIndex.ticket_id_for_folder(system.ticket_folder)
+
+    def iter_scored(self, resumes: List[Path]) -> Iterator[Tuple[Path, Optional[ParsedResume], Optional[Dict], Dict]]:
+        """Extract and score resumes in order, with at most a few chunks in flight on the pool"""
+        system = self.system
+        if system.executor is None and system.workers <= 1:
+            for resume_path in resumes:
+                yield (resume_path,) + _extract_and_score(resume_path, system.basic_filter, system.job_ticket,
+                                                          system.extraction_cache, system.cascade)
+            return
+
+        with ExitStack() as stack:
+            executor = system.executor or stack.enter_context(
+                ProcessPoolExecutor(max_workers=system.workers, mp_context=worker_process_context(),
+                                    initializer=_init_batch_worker)
+            )
+            in_flight = deque()
+            max_in_flight = system.workers * CHUNKS_PER_WORKER
+            for start in range(0, len(resumes), CHUNK_SIZE):
+                chunk = resumes[start:start + CHUNK_SIZE]
+                in_flight.append((chunk, executor.submit(_extract_and_score_chunk, system.job_ticket,
+                                                         system.extraction_cache, chunk, system.cascade)))
+                if len(in_flight) >= max_in_flight:
+                    chunk, future = in_flight.popleft()
+                    yield from ((path,) + result for path, result in zip(chunk, future.result()))
+            while in_flight:
+                chunk, future = in_flight.popleft()
+                yield from ((path,) + result for path, result in zip(chunk, future.result()))
+
+    def _identified(self, resumes: List[Path]) -> Iterator[List[Tuple[Path, Optional[ParsedResume], Optional[Dict],
+                                                                       Dict, Optional[str]]]]:
+        """Batches of scored resumes with their identity from the index (None without identity keys)"""
+        detector = self.system.basic_filter.duplicate_detector
+        index = self.system.identity_index
+        batch = []
+
+        def flush():
+            submissions = [(path.name, detector.extract_candidate_identifiers(parsed, path.name))
+                           for path, parsed, _, _ in batch if parsed is not None]
+            identity_ids = index.register_ticket(self.ticket_id, submissions, complete=False) \
+                if index is not None else {}
+            return [item + (identity_ids.get(item[0].name),) for item in batch]
+
+        for item in self.iter_scored(resumes):
+            batch.append(item)
+            if len(batch) >= IDENTITY_BATCH:
+                yield flush()
+                batch = []
+        if batch:
+            yield flush()
+
+    def run(self, resumes: List[Path], staging: Path) -> Tuple[Dict, Dict]:
+        """Stream stage 1 into the run folder being staged; returns its results and the leaderboard seed"""
+        system = self.system
+        profile = system.run_profile
+        basic_filter = system.basic_filter
+        if system.identity_index is not None:
+            system.identity_index.forget_missing(self.ticket_id, {path.name for path in resumes})
+        else:
+            print("  ⚠️ No identity index: duplicate submissions will not be merged")
+
+        shortlist = ShortlistHeap(self.shortlist_size)
+        extraction = {'files_extracted': 0, 'files_from_cache': 0, 'total_seconds': 0.0,
+                      'slowest': [], 'truncated': [], 'failed': {}}
+        worker_seconds = {'extract': 0.0, 'score': 0.0}
+        written = completed = pruned = 0
+
+        print(f"\n📊 Streaming {len(resumes)} resumes (results written as they are scored)...")
+        start = time.perf_counter()
+        with gzip.open(staging / STREAMED_CANDIDATES_FILENAME, 'wt', encoding='utf-8') as out:
+            for batch in self._identified(resumes):
+                for resume_path, parsed, score_result, stats, identity_id in batch:
+                    for stage, seconds in stats.pop('spans', {}).items():
+                        worker_seconds[stage] += seconds
+                    self._count_extraction(extraction, resume_path.name, stats)
+                    profile.count('extract', files=1, bytes_read=resume_path.stat().st_size,
+                                  pages_parsed=stats.get('pages', 0), cache_hits=int(bool(stats.get('cached'))),
+                                  failures=int(parsed is None))
+                    if parsed is None:
+                        print(f"    ⚠️ Failed to extract text from {resume_path.name}")
+                        continue
+
+                    key = identity_id or f"file:{resume_path.name}"
+                    if score_result.get('prefiltered'):
+                        threshold = shortlist.threshold()
+                        if key in shortlist or threshold is None or score_result['score_upper_bound'] >= threshold:
+                            score_result = basic_filter.complete_prefiltered(score_result, parsed)
+                            completed += 1
+                        else:
+                            pruned += 1
+                    if not score_result.get('prefiltered'):
+                        shortlist.offer(key, score_result['final_score'], written)
+
+                    score_result['file_path'] = str(resume_path)
+                    score_result['candidate_id'] = key
+                    if identity_id:
+                        score_result['identity_id'] = identity_id
+                    out.write(json.dumps(score_result, separators=(',', ':'), default=str) + '\n')
+                    written += 1
+                    profile.count('score', resumes=1)
+        pool_seconds = time.perf_counter() - start
+
+        total_worker_seconds = sum(worker_seconds.values())
+        for stage, seconds in worker_seconds.items():
+            share = seconds / total_worker_seconds if total_worker_seconds else 0.0
+            profile.add(stage, pool_seconds * share, worker_seconds=seconds)
+        profile.count('score', completed=completed, pruned=pruned)
+        extraction['slowest'] = [name for _, name in sorted(extraction['slowest'], reverse=True)]
+        extraction['total_seconds'] = round(extraction['total_seconds'], 4)
+        print(f"  ✂️ Completed the expensive stages for {completed} resume(s), skipped them for {pruned}")
+
+        with profile.span('merge') as span:
+            candidates, members = self._shortlisted_candidates(staging, set(shortlist.best))
+            candidates.sort(key=lambda x: x["final_score"], reverse=True)
+            span['counters']['candidates_in'] = written
+            span['counters']['candidates_out'] = len(candidates)
+
+        with profile.span('dedupe') as span:
+            dup_groups = system.identity_index.ticket_duplicate_groups(self.ticket_id) \
+                if system.identity_index is not None else []
+            span['counters']['groups'] = len(dup_groups)
+        unique_candidates = written - sum(len(group) - 1 for group in dup_groups)
+
+        print("\n📊 Top Candidates (after duplicate handling):")
+        for i, candidate in enumerate(candidates[:5]):
+            print(f"  {i+1}. {candidate['filename']} - Score: {candidate['final_score']:.2%}")
+            if candidate.get('has_duplicates'):
+                print(f"      ⚠️ Best of {candidate.get('duplicate_count', 1)} submissions")
+
+        initial_results = {
+            "top_10": candidates,
+            "scoring_criteria": {
+                "skills_required": system.job_ticket.tech_stack,
+                "experience_range": system.job_ticket.experience_required,
+                "location": system.job_ticket.location
+            },
+            "duplicate_summary": {
+                "total_resumes_submitted": len(resumes),
+                "unique_candidates": unique_candidates,
+                "duplicate_groups_found": len(dup_groups),
+                "duplicate_groups": [{"group_size": len(group), "filenames": group} for group in dup_groups]
+            },
+            "unique_candidates": unique_candidates,
+            "duplicate_groups_count": len(dup_groups),
+            "incremental": {'mode': 'streaming', 'reason': 'streaming run', 'reused': 0, 'scored': len(resumes)},
+            "cascade": {'enabled': system.cascade, 'shortlist_size': self.shortlist_size,
+                        'completed': completed, 'pruned': pruned},
+            "streaming": {'candidates_file': STREAMED_CANDIDATES_FILENAME, 'resumes_written': written},
+            "extraction": extraction,
+            "requirements_signature": system._requirements_signature()
+        }
+        leaderboard = system._empty_leaderboard(
+            shortlist=[{'candidate': json.loads(json.dumps(candidate, default=str)), 'identifiers': members[key]}
+                       for candidate, key in ((c, c['candidate_id']) for c in candidates)],
+            files={path.name: [path.stat().st_size, path.stat().st_mtime_ns] for path in resumes},
+            total_resumes=len(resumes)
+        )
+        return initial_results, leaderboard
+
+    @staticmethod
+    def _count_extraction(extraction: Dict, name: str, stats: Dict):
+        """Add one file to the extraction summary, keeping only the five slowest and the problem files"""
+        if stats.get('cached'):
+            extraction['files_from_cache'] += 1
+            return
+        extraction['files_extracted'] += 1
+        seconds = stats.get('seconds', 0.0)
+        extraction['total_seconds'] += seconds
+        if len(extraction['slowest']) < 5:
+            heapq.heappush(extraction['slowest'], (seconds, name))
+        else:
+            heapq.heappushpop(extraction['slowest'], (seconds, name))
+        if stats.get('truncated'):
+            extraction['truncated'].append(name)
+        if stats.get('error'):
+            extraction['failed'][name] = stats['error']
+
+    def _shortlisted_candidates(self, staging: Path, keys: set) -> Tuple[List[Dict], Dict[str, List[Dict]]]:
+        """Read back the submissions of the shortlisted candidates and merge each candidate's submissions.
+
+        Returns the merged candidates in file order and the identifiers of each candidate's submissions.
+        """
+        system = self.system
+        basic_filter = system.basic_filter
+        submissions = defaultdict(list)
+        with gzip.open(staging / STREAMED_CANDIDATES_FILENAME, 'rt', encoding='utf-8') as f:
+            for line in f:
+                record = json.loads(line)
+                if record['candidate_id'] in keys:
+                    submissions[record['candidate_id']].append(record)
+
+        # Their texts are needed again for similarity, so re-read them through the extraction cache
+        texts = {}
+        members = defaultdict(list)
+        for key, records in submissions.items():
+            for i, record in enumerate(records):
+                resume_path = Path(record['file_path'])
+                parsed = ResumeExtractor.extract_parsed(resume_path, system.extraction_cache)
+                if parsed is None:
+                    # Left out of the similarity fit; a pruned submission keeps its partial score
+                    print(f"    ⚠️ Failed to re-read {record['filename']}; keeping its streamed score")
+                    continue
+                if record.get('prefiltered'):
+                    # A submission pruned before its candidate entered the shortlist
+                    records[i] = record = basic_filter.complete_prefiltered(record, parsed)
+                texts[record['filename']] = parsed.text
+                members[key].append(basic_filter.duplicate_detector.extract_candidate_identifiers(
+                    parsed, record['filename']))
+
+        description = system.job_ticket.description
+        similarity_model = CorpusSimilarityModel.load(system.output_folder / "similarity_vocabulary.pkl",
+                                                      system._requirements_signature(include_tech_stack=False))
+        if similarity_model is None:
+            # Fitted on the shortlist only and not persisted, so incremental runs never reuse it
+            similarity_model = CorpusSimilarityModel.fit(description, list(texts.values()))
+        similarities = dict(zip(texts, similarity_model.score(description, list(texts.values()))))
+
+        identity_ids = [key for key in submissions if not key.startswith('file:')]
+        applications = system.identity_index.applications(identity_ids) if system.identity_index is not None else {}
+        candidates = []
+        for key, records in submissions.items():
+            for record in records:
+                if record['filename'] in similarities:
+                    record['similarity_score'] = float(similarities[record['filename']])
+            if len(records) > 1:
+                candidate = basic_filter.duplicate_handler.merge_scores(records)
+            else:
+                candidate = records[0]
+                candidate['has_duplicates'] = False
+            if key in applications:
+                candidate['other_applications'] = [app for app in applications[key]
+                                                   if app['ticket_id'] != self.ticket_id]
+            candidates.append(candidate)
+        return candidates, members
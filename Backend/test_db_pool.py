@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+test_db_pool.py - MySQLPool against fake connections, no MySQL server needed
+mysql.connector.connect is replaced by a factory of FakeConnection objects, and
+the pool is checked for:
+
+  - blocking checkout: a waiter gets the connection released by another
+    thread, and a checkout that finds no free connection times out
+  - dead idle connections replaced on checkout after the health check interval
+  - uncommitted transactions rolled back on release, lost connections discarded
+  - connections dropped without close() returning their slot to the pool
+
+Usage: python test_db_pool.py
+(also collected by pytest)
+"""
+
+import gc
+import sys
+import threading
+import time
+from unittest import mock
+
+import pytest
+from mysql.connector import Error
+
+import db_pool
+from db_pool import MySQLPool, PoolTimeoutError
+
+
+class FakeConnection:
+    """Just enough of a MySQLConnection for the pool"""
+
+    def __init__(self, number: int):
+        self.number = number
+        self.alive = True
+        self.in_transaction = False
+        self.rollbacks = 0
+        self.closed = False
+
+    def ping(self, reconnect: bool = False):
+        if not self.alive:
+            raise Error(msg="Lost connection to MySQL server")
+
+    def is_connected(self) -> bool:
+        return self.alive and not self.closed
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.in_transaction = False
+
+    def close(self):
+        self.closed = True
+
+
+class FakeServer:
+    """Stands in for mysql.connector.connect and remembers every connection it opened"""
+
+    def __init__(self):
+        self.opened = []
+
+    def connect(self, **config):
+        connection = FakeConnection(len(self.opened))
+        self.opened.append(connection)
+        return connection
+
+
+def fake_pool(**kwargs):
+    server = FakeServer()
+    patcher = mock.patch.object(db_pool.mysql.connector, 'connect', server.connect)
+    patcher.start()
+    return MySQLPool({'host': 'fake', 'database': 'test'}, **kwargs), server, patcher
+
+
+def check_wait_and_timeout():
+    pool, server, patcher = fake_pool(size=1, checkout_timeout=5.0)
+    try:
+        held = pool.connection()
+        with pytest.raises(PoolTimeoutError):
+            pool.connection(timeout=0.05)
+        assert pool.metrics()['timeouts'] == 1
+
+        # A waiter is handed the connection as soon as another thread returns it
+        threading.Timer(0.1, held.close).start()
+        conn = pool.connection()
+        assert conn.number == 0 and len(server.opened) == 1
+        assert pool.metrics()['wait_seconds_max'] >= 0.05
+        conn.close()
+        assert pool.metrics()['in_use'] == 0
+    finally:
+        patcher.stop()
+
+
+def check_reconnect():
+    pool, server, patcher = fake_pool(size=2, health_check_seconds=0.0)
+    try:
+        conn = pool.connection()
+        conn.close()
+        server.opened[0].alive = False
+
+        conn = pool.connection()
+        assert conn.number == 1, "a dead idle connection must be replaced on checkout"
+        assert server.opened[0].closed
+        metrics = pool.metrics()
+        assert metrics['reconnects'] == 1 and metrics['open'] == 1
+        conn.close()
+    finally:
+        patcher.stop()
+
+
+def check_rollback_on_release():
+    pool, server, patcher = fake_pool(size=2)
+    try:
+        conn = pool.connection()
+        server.opened[0].in_transaction = True
+        conn.close()
+        assert server.opened[0].rollbacks == 1
+        assert pool.metrics()['idle'] == 1
+        with pytest.raises(Error):
+            conn.cursor()
+
+        # A connection lost while checked out is closed and its slot freed
+        conn = pool.connection()
+        server.opened[0].alive = False
+        conn.close()
+        assert server.opened[0].closed
+        assert pool.metrics()['open'] == 0
+
+        # get_connection() rolls back when the block raises a database error
+        with pytest.raises(Error):
+            with pool.get_connection() as conn:
+                raise Error(msg="deadlock")
+        assert server.opened[1].rollbacks == 1
+    finally:
+        patcher.stop()
+
+
+def check_leak_recovery():
+    pool, server, patcher = fake_pool(size=1)
+    try:
+        conn = pool.connection()
+        del conn
+        gc.collect()
+        metrics = pool.metrics()
+        assert metrics['leaked'] == 1 and metrics['in_use'] == 0
+        pool.connection(timeout=0.05).close()
+        assert len(server.opened) == 1
+    finally:
+        patcher.stop()
+
+
+def test_wait_and_timeout():
+    check_wait_and_timeout()
+
+
+def test_reconnect():
+    check_reconnect()
+
+
+def test_rollback_on_release():
+    check_rollback_on_release()
+
+
+def test_leak_recovery():
+    check_leak_recovery()
+
+
+def main():
+    checks = [check_wait_and_timeout, check_reconnect, check_rollback_on_release, check_leak_recovery]
+    for check in checks:
+        try:
+            check()
+        except AssertionError as e:
+            print(f"❌ {check.__name__}: {e}")
+            sys.exit(1)
+    print(f"✅ MySQLPool passed {len(checks)} checks against fake connections")
+
+
+if __name__ == '__main__':
+    main()
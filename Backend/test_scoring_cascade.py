@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+test_scoring_cascade.py - The scoring cascade must rank exactly like full scoring
+Generates a synthetic ticket (the benchmark_filtering.py generator, fixed seed),
+filters one copy with full_scoring=True and another with the cascade, and checks:
+
+  - the same stage 1 top 10 and final top 5
+  - the same rerank and skills what-if top 10 for several weightings, with
+    pruned candidates completed on request
+  - an incremental run after one new upload only scores that resume, and a
+    changed skill list still gives the full run's top 10
+
+Usage: python test_scoring_cascade.py [--size 200] [--seed 42]
+(also collected by pytest as test_cascade_matches_full_scoring)
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmark_filtering import generate_ticket
+from feature_matrix import FEATURE_MATRIX_FILENAME, FeatureMatrix
+from resume_filter5 import PrunedCandidateScorer, SkillBitmapIndex, UpdatedResumeFilteringSystem
+
+WEIGHTINGS = [
+    None,
+    {'professional_dev': 1.0},
+    {'skills': 0.2, 'professional_dev': 0.5, 'similarity': 0.3},
+    {'experience': 0.5, 'professional_dev': 0.3, 'leadership': 0.2},
+]
+WHAT_IF_SKILLS = ['Python', 'Kubernetes', 'Kafka', 'Redis']
+
+
+def run_filter(ticket_folder: Path, full_scoring: bool, incremental: bool = False) -> dict:
+    with contextlib.redirect_stdout(io.StringIO()):
+        system = UpdatedResumeFilteringSystem(str(ticket_folder), use_identity_index=False, full_scoring=full_scoring)
+        return system.filter_resumes(incremental=incremental)
+
+
+def shortlists(results: dict) -> tuple:
+    return ([candidate['filename'] for candidate in results['stage1_results']['top_10']],
+            [candidate['filename'] for candidate in results['final_top_5']])
+
+
+def leaderboard(candidates: list) -> list:
+    return [(item['filename'], round(item['score'], 5)) for item in candidates]
+
+
+def set_required_skills(ticket_folder: Path, skills: str):
+    job_file = ticket_folder / 'job_details.json'
+    job = json.loads(job_file.read_text())
+    job['job_details']['required_skills'] = skills
+    job_file.write_text(json.dumps(job, indent=2))
+
+
+def check_cascade(workdir: Path, size: int = 200, seed: int = 42):
+    full_folder = workdir / 'full_synthetic'
+    cascade_folder = workdir / 'cascade_synthetic'
+    generate_ticket(full_folder, size, {'txt': 0.5, 'docx': 0.5}, 0.1, 0.5, 6.0, seed)
+    shutil.copytree(full_folder, cascade_folder)
+
+    full = run_filter(full_folder, full_scoring=True)
+    cascade = run_filter(cascade_folder, full_scoring=False)
+    assert cascade['stage1_results']['cascade']['pruned'] > 0, "corpus too small to prune anything"
+    assert shortlists(cascade) == shortlists(full), "cascade shortlist differs from full scoring"
+
+    full_matrix = FeatureMatrix.load(full_folder / 'filtering_results' / FEATURE_MATRIX_FILENAME)
+    full_index = SkillBitmapIndex.load(full_folder / 'filtering_results' / SkillBitmapIndex.FILENAME)
+    for weights in WEIGHTINGS:
+        matrix = FeatureMatrix.load(cascade_folder / 'filtering_results' / FEATURE_MATRIX_FILENAME)
+        skill_index = SkillBitmapIndex.load(cascade_folder / 'filtering_results' / SkillBitmapIndex.FILENAME)
+        completer = PrunedCandidateScorer(cascade_folder, matrix, skill_index)
+        assert leaderboard(matrix.rerank(weights, 10, completer)) == leaderboard(full_matrix.rerank(weights, 10)), \
+            f"rerank differs from full scoring for weights {weights}"
+
+        matrix = FeatureMatrix.load(cascade_folder / 'filtering_results' / FEATURE_MATRIX_FILENAME)
+        completer = PrunedCandidateScorer(cascade_folder, matrix, skill_index)
+        preview = skill_index.what_if(matrix, WHAT_IF_SKILLS, weights, 10, completer)
+        expected = full_index.what_if(full_matrix, WHAT_IF_SKILLS, weights, 10)
+        assert leaderboard(preview['candidates']) == leaderboard(expected['candidates']), \
+            f"what-if differs from full scoring for weights {weights}"
+
+    # One new upload: only that resume is scored, pruned scores are reused as they are
+    for folder in (full_folder, cascade_folder):
+        shutil.copy(sorted(folder.glob('resume_*.txt'))[0], folder / 'resume_new.txt')
+    full = run_filter(full_folder, full_scoring=True)
+    cascade = run_filter(cascade_folder, full_scoring=False, incremental=True)
+    assert cascade['stage1_results']['incremental']['scored'] == 1, cascade['stage1_results']['incremental']
+    assert shortlists(cascade) == shortlists(full), "incremental cascade shortlist differs from full scoring"
+
+    # Other required skills: stored scores are re-scored from the skill index, and pruned
+    # candidates that can now reach the shortlist are completed
+    for folder in (full_folder, cascade_folder):
+        set_required_skills(folder, ', '.join(WHAT_IF_SKILLS))
+    full = run_filter(full_folder, full_scoring=True)
+    cascade = run_filter(cascade_folder, full_scoring=False, incremental=True)
+    assert cascade['stage1_results']['incremental']['scored'] == 0, cascade['stage1_results']['incremental']
+    assert shortlists(cascade) == shortlists(full), "cascade shortlist differs after a skill change"
+
+
+def test_cascade_matches_full_scoring(tmp_path):
+    check_cascade(tmp_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check that the scoring cascade ranks exactly like full scoring')
+    parser.add_argument('--size', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix='cascade_check_'))
+    try:
+        check_cascade(workdir, args.size, args.seed)
+    except AssertionError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    print(f"✅ Scoring cascade matches full scoring on {args.size} synthetic resumes")
+
+
+if __name__ == '__main__':
+    main()